@@ -42,6 +42,8 @@ class MMR_BAC_State(bpy.types.PropertyGroup):
     def update_target(self, context):
         self.owner = bpy.context.scene.mmr_kumopult_bac_owner
         self.target = self.selected_target
+        if mapping_updates_suppressed():
+            return
 
         for m in self.mappings:
             m.apply()
@@ -60,12 +62,12 @@ class MMR_BAC_State(bpy.types.PropertyGroup):
     
     def update_select(self, context):
         if self.sync_select:
-            owner_selection = []
-            target_selection = []
+            owner_selection = set()
+            target_selection = set()
             for m in self.mappings:
                 if m.selected:
-                    owner_selection.append(m.owner)
-                    target_selection.append(m.target)
+                    owner_selection.add(m.owner)
+                    target_selection.add(m.target)
             for bone in self.owner.data.bones:
                 bone.select = bone.name in owner_selection
             for bone in self.target.data.bones:
@@ -112,18 +114,28 @@ class MMR_BAC_State(bpy.types.PropertyGroup):
         return self.mappings[self.active_mapping]
     
     def get_mapping_by_target(self, name):
-        if name != "":
-            for i, m in enumerate(self.mappings):
-                if m.target == name:
-                    return m, i
-        return None, -1
+        return self.find_mapping('target', name)
 
     def get_mapping_by_owner(self, name):
-        if name != "":
-            for i, m in enumerate(self.mappings):
-                if m.owner == name:
-                    return m, i
-        return None, -1
+        return self.find_mapping('owner', name)
+
+    def find_mapping(self, key, name):
+        # 通过名称索引查找映射，未命中即不存在
+        if name == "":
+            return None, -1
+        i = get_mapping_index(self)[key].get(name, -1)
+        if i < 0:
+            return None, -1
+        if getattr(self.mappings[i], key) != name:
+            # 命中的项名称不一致说明索引已过期，重建后再查找
+            i = build_mapping_index(self)[key].get(name, -1)
+            if i < 0:
+                return None, -1
+        return self.mappings[i], i
+
+    def move_mapping(self, from_index, to_index):
+        self.mappings.move(from_index, to_index)
+        move_mapping_index(self, from_index, to_index)
 
     def get_selection(self):
         indices = []
@@ -153,14 +165,67 @@ class MMR_BAC_State(bpy.types.PropertyGroup):
             m.selected_owner = owner
             m.target = target
             # return m, len(self.mappings) - 1
-            self.mappings.move(len(self.mappings) - 1, index)
+            self.move_mapping(len(self.mappings) - 1, index)
             self.active_mapping = index
             return self.mappings[index], index
     
+    def apply_mapping_table(self, rows, clear=True):
+        """批量应用映射表：屏蔽属性回调填写映射列表，再一次性生成所有约束
+
+        Args:
+            rows: 映射行列表，每行为 {'owner', 'target', 'has_rotoffs', 'offset', 'has_loccopy', 'loc_axis', 'has_ik', 'ik_influence'}
+            clear: 是否清空原有映射
+
+        Returns:
+            生成的约束数量
+        """
+        owner_pose = self.get_owner_pose()
+        with suppress_mapping_updates():
+            if clear:
+                owners = {m.owner for m in self.mappings}
+                self.mappings.clear()
+            else:
+                owners = set()
+            owners.update(row['owner'] for row in rows)
+
+            # 删除受影响骨骼上的旧约束
+            for name in owners:
+                pb = owner_pose.bones.get(name)
+                if pb is None:
+                    continue
+                for con in list(pb.constraints):
+                    if con.name in BAC_CONSTRAINTS:
+                        pb.constraints.remove(con)
+
+            for row in rows:
+                m = self.mappings.add()
+                m.selected_owner = row['owner']
+                m.target = row.get('target', '')
+                m.has_rotoffs = row.get('has_rotoffs', False)
+                m.has_loccopy = row.get('has_loccopy', False)
+                m.has_ik = row.get('has_ik', False)
+                m.loc_axis = row.get('loc_axis', (True, True, True))
+                m.ik_influence = row.get('ik_influence', 1.0)
+                if row.get('offset') is not None:
+                    m.offset = row['offset']
+                elif self.calc_offset and m.is_valid():
+                    m.calc_rotoffs()
+
+        build_mapping_index(self)
+        self.active_mapping = min(self.active_mapping, len(self.mappings) - 1)
+        self.selected_count = 0
+
+        # 同一骨骼出现多次时以最后一项为准
+        last = {m.owner: m for m in self.mappings}
+        count = sum(m.build() for m in last.values())
+        print(f"映射表已应用: {len(self.mappings)} 个映射, {count} 个约束")
+        return count
+
     def remove_mapping(self):
         for i in self.get_selection():
             self.mappings[i].clear()
             self.mappings.remove(i)
+        invalidate_mapping_index(self)
         # 选中状态更新
         self.active_mapping = min(self.active_mapping, len(self.mappings) - 1)
         self.selected_count = 0
@@ -168,9 +233,15 @@ class MMR_BAC_State(bpy.types.PropertyGroup):
 def register():
     bpy.types.Scene.mmr_kumopult_bac_owner = bpy.props.PointerProperty(type=bpy.types.Object, poll=lambda self, obj: obj.type == 'ARMATURE')
     bpy.types.Armature.mmr_kumopult_bac = bpy.props.PointerProperty(type=MMR_BAC_State, override={'LIBRARY_OVERRIDABLE'})
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        handlers.append(clear_mapping_index)
     print("hello kumopult!")
 
 def unregister():
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        if clear_mapping_index in handlers:
+            handlers.remove(clear_mapping_index)
+    clear_mapping_index()
     del bpy.types.Scene.mmr_kumopult_bac_owner
     del bpy.types.Armature.mmr_kumopult_bac
     print("goodbye kumopult!")
@@ -1,9 +1,8 @@
 import bpy
-from bpy.app.handlers import persistent
 
 from .config import __addon_name__
 from .i18n.dictionary import dictionary
-from .operators import has_keyframes_for_property
+from .key_sync import register_key_sync, unregister_key_sync
 from .panels import MMR_property, MMR_bone_property, MMR_Scene_Property, MMR_key_property, MMR_Physics_property, \
     MMR_Weight_bone_parent_fix, MMR_Automatic_IK_bone_chain
 from ...common.class_loader import auto_load
@@ -25,93 +24,6 @@ bl_info = {
 
 _addon_properties = {}
 
-@ persistent
-def sync_mmr_key_values(scene,depsgraph):
-
-    # 获取目标对象
-    obj = bpy.context.active_object
-
-    if not obj:
-        return
-
-    # 获取key对象
-    key_obj = obj.mmr.key_obj
-
-    if not key_obj:
-        return
-
-    # 如果值改变, 则进行处理
-    if key_obj is not obj.mmr.Import_object_data:
-
-        # 更新存储的值
-        obj.mmr.Import_object_data = key_obj
-
-        print("key_obj", key_obj)
-
-        if not key_obj.type == 'MESH':
-            return
-
-        # 获取模型形态
-        shape_key = key_obj.data.shape_keys.key_blocks
-
-        items = obj.mmr_key
-        items.clear()
-
-        # 遍历模型形态
-        for idx, key in enumerate(shape_key):
-            item = items.add()
-            if idx == 0:
-                item.bool_value = False
-
-            item.name = key.name
-            item.value = key.value
-            item.meshkey_index = idx
-            item.meshkey = key_obj.data.shape_keys
-
-    # 获取批量调整值
-    current_value1 = obj.mmr.Batch_adjust_shape_key
-
-    # 如果值没有改变, 则不进行处理
-    if current_value1 == obj.mmr.last_batch_adjust_value:
-        return
-
-    # 更新存储的值
-    obj.mmr.last_batch_adjust_value = current_value1
-
-    for idx, key in enumerate(obj.mmr_key):
-        if key.select:
-
-            meshkey = key.meshkey
-
-            if not obj.mmr.register_handler:
-                if not obj.mmr.direct_operation_shape_key:
-                    # 同步到值
-                    key.value = current_value1
-                else:
-                    if meshkey:
-                        meshkey.key_blocks[key.meshkey_index].value = current_value1
-
-                # 是否插入关键帧
-                if bpy.context.scene.tool_settings.use_keyframe_insert_auto:
-
-                    if not obj.mmr.direct_operation_shape_key:
-
-                        if obj.mmr.insert_keyframe: # 选中的有关键帧的才会插入关键帧
-                            if has_keyframes_for_property(obj, "mmr_key[%d].value" % idx):
-                                obj.keyframe_insert(data_path="mmr_key[%d].value" % idx,frame=bpy.context.scene.frame_current)
-
-                        if obj.mmr.use_keyframe_insert_auto: # 自动插入关键帧
-                            obj.keyframe_insert(data_path="mmr_key[%d].value" % idx, frame=bpy.context.scene.frame_current)
-                    else:
-                        if meshkey:
-
-                            if obj.mmr.insert_keyframe:  # 选中的有关键帧的才会插入关键帧
-                                if has_keyframes_for_property(meshkey, f"key_blocks['{str(key.name)}'].value"):
-                                    meshkey.key_blocks[key.meshkey_index].keyframe_insert(data_path="value", frame=bpy.context.scene.frame_current)
-
-                            if obj.mmr.use_keyframe_insert_auto:  # 自动插入关键帧
-                                meshkey.key_blocks[key.meshkey_index].keyframe_insert(data_path="value", frame=bpy.context.scene.frame_current)
-
 def register():
     print("正在注册")  # 打印正在注册的提示信息
     # 注册类
@@ -142,8 +54,8 @@ def register():
     bpy.types.Object.mmr_automatic_ik_bone_chain = bpy.props.CollectionProperty(type=MMR_Automatic_IK_bone_chain)
     bpy.types.Object.mmr_automatic_ik_bone_chain_index = bpy.props.IntProperty(name="Index", default=0)
 
-    # 注册事件处理函数, 当场景的属性更新时调用 sync_mmr_key_values 函数
-    bpy.app.handlers.depsgraph_update_pre.append(sync_mmr_key_values)
+    # 订阅形态键面板相关属性的修改
+    register_key_sync()
 
     # 国际化（多语言支持相关操作）
     load_dictionary(dictionary)
@@ -179,7 +91,7 @@ def unregister():
     del bpy.types.Object.mmr_automatic_ik_bone_chain
     del bpy.types.Object.mmr_automatic_ik_bone_chain_index
 
-    # 注销事件处理函数
-    bpy.app.handlers.depsgraph_update_pre.remove(sync_mmr_key_values)
+    # 取消形态键面板的订阅
+    unregister_key_sync()
 
     print("{}插件已卸载。".format(bl_info["name"]))
\ No newline at end of file
@@ -0,0 +1,308 @@
+"""骨骼名称自动匹配
+
+将骨骼名称规范化（左右后缀、命名空间前缀、全角字符、MMD/Rigify/Mixamo同义名），
+通过词元索引筛选候选骨骼，再按连通分量求最优一对一分配，层级深度作为同分时的依据。
+"""
+import difflib
+import glob
+import json
+import os
+import re
+import unicodedata
+
+import numpy as np
+
+# 同义名来源：控制器预设 {MMD骨骼: metarig骨骼} 与映射表预设 (自身骨骼, 目标骨骼)
+SYNONYM_SOURCES = [
+    os.path.join('operators', 'presets', '*.json'),
+    os.path.join('operators', 'MMR_Presets.json'),
+    os.path.join('operators', 'presets', '*.mmrmap'),
+    os.path.join('operators', 'MMR_OP_Presets', '*.mmrmap'),
+]
+
+# 左右标记（按顺序匹配，匹配到一个即停止）
+SIDE_PATTERNS = [
+    (re.compile(r'[._\- ](l|left)(?=([._\- ]\d+)?$)', re.I), 'L'),
+    (re.compile(r'[._\- ](r|right)(?=([._\- ]\d+)?$)', re.I), 'R'),
+    (re.compile(r'^(l|left)[._\- ]', re.I), 'L'),
+    (re.compile(r'^(r|right)[._\- ]', re.I), 'R'),
+    (re.compile(r'^left', re.I), 'L'),
+    (re.compile(r'^right', re.I), 'R'),
+    (re.compile(r'left$', re.I), 'L'),
+    (re.compile(r'right$', re.I), 'R'),
+    (re.compile(r'^左|左$'), 'L'),
+    (re.compile(r'^右|右$'), 'R'),
+]
+
+# 词元：大写缩写、驼峰单词、数字、非ASCII片段
+TOKEN_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[^\x00-\x7f]+')
+
+# 不参与比较的词元（Rigify骨骼前缀等）
+IGNORED_TOKENS = {'org', 'def', 'mch'}
+
+# 每根自身骨骼保留的候选数量
+MAX_CANDIDATES = 24
+
+# 低于该分数的匹配会被丢弃
+MIN_SCORE = 0.35
+
+# 层级深度的权重，仅在分数接近时起作用
+DEPTH_WEIGHT = 0.01
+
+# 同义名缓存 (来源文件及修改时间, 同义名表)
+_synonym_cache = [None, {}]
+
+
+def normalize_bone_name(name):
+    """规范化骨骼名称
+
+    Returns:
+        (基础名称, 左右标记'L'/'R'/'', 词元列表)
+    """
+    name = unicodedata.normalize('NFKC', name)
+    # 去掉 mixamorig: 之类的命名空间
+    name = name.rsplit(':', 1)[-1]
+    side = ''
+    for pattern, pattern_side in SIDE_PATTERNS:
+        match = pattern.search(name)
+        if match:
+            side = pattern_side
+            name = name[:match.start()] + name[match.end():]
+            break
+    tokens = [t.lower() for t in TOKEN_PATTERN.findall(name)]
+    tokens = [t for t in tokens if t not in IGNORED_TOKENS] or tokens
+    return '_'.join(tokens), side, tokens
+
+
+def iter_synonym_pairs(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and 'rows' in data:
+        columns = data['columns']
+        owner, target = columns.index('owner'), columns.index('target')
+        for row in data['rows']:
+            yield row[owner], row[target]
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, str):
+                yield key, value
+
+
+def load_synonyms(root=None):
+    """读取插件预设中的同义名，按文件修改时间缓存
+
+    Returns:
+        {基础名称: {同义的基础名称}}
+    """
+    root = root or os.path.dirname(os.path.abspath(__file__))
+    paths = sorted(p for pattern in SYNONYM_SOURCES for p in glob.glob(os.path.join(root, pattern)))
+    key = tuple((p, os.path.getmtime(p)) for p in paths)
+    if _synonym_cache[0] == key:
+        return _synonym_cache[1]
+
+    synonyms = {}
+    for path in paths:
+        try:
+            pairs = list(iter_synonym_pairs(path))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"同义名读取失败: {path} {e}")
+            continue
+        for a, b in pairs:
+            base_a, base_b = normalize_bone_name(a)[0], normalize_bone_name(b)[0]
+            if base_a and base_b and base_a != base_b:
+                synonyms.setdefault(base_a, set()).add(base_b)
+                synonyms.setdefault(base_b, set()).add(base_a)
+
+    _synonym_cache[0] = key
+    _synonym_cache[1] = synonyms
+    return synonyms
+
+
+def index_tokens(base, tokens, synonyms):
+    # 用于候选筛选的词元：自身及同义名的词元，非ASCII词元再拆成单字，数字按数值比较
+    names = {base} | synonyms.get(base, set())
+    result = set()
+    for name in names:
+        for token in name.split('_'):
+            if token.isdigit():
+                result.add('#' + str(int(token)))
+                continue
+            result.add(token)
+            if not token.isascii():
+                result.update(token)
+    return result
+
+
+def name_similarity(tokens_a, tokens_b):
+    """两组词元的模糊相似度 (0~0.8)"""
+    set_a, set_b = set(tokens_a), set(tokens_b)
+    jaccard = len(set_a & set_b) / len(set_a | set_b) if set_a and set_b else 0.0
+    ratio = difflib.SequenceMatcher(None, '_'.join(tokens_a), '_'.join(tokens_b)).ratio()
+    score = 0.8 * (0.5 * jaccard + 0.5 * ratio)
+    # 编号不同（如手指的第几节）时降低分数
+    digits_a = [int(t) for t in tokens_a if t.isdigit()]
+    digits_b = [int(t) for t in tokens_b if t.isdigit()]
+    if digits_a and digits_b and digits_a != digits_b:
+        score *= 0.5
+    return score
+
+
+def score_pair(owner, target, synonyms):
+    """计算两根骨骼名称的相似度 (0~1)"""
+    base_o, side_o, tokens_o = owner
+    base_t, side_t, tokens_t = target
+    if side_o and side_t and side_o != side_t:
+        return 0.0
+
+    if base_o == base_t:
+        score = 1.0
+    elif base_t in synonyms.get(base_o, ()):
+        score = 0.9
+    else:
+        score = name_similarity(tokens_o, tokens_t)
+        # 与目标骨骼的同义名比较，如 腕 -> upper_arm 与 upper_arm_fk
+        for alias in synonyms.get(base_t, ()):
+            score = max(score, 0.9 * name_similarity(tokens_o, alias.split('_')))
+
+    if bool(side_o) != bool(side_t):
+        score *= 0.8
+    return score
+
+
+def solve_assignment(scores):
+    """最大化总分的一对一分配（匈牙利算法，按行向量化）
+
+    Args:
+        scores: (n, m) 分数矩阵
+
+    Returns:
+        每行分配到的列索引，未分配为-1
+    """
+    n, m = scores.shape
+    if n > m:
+        cols = solve_assignment(scores.T)
+        rows = np.full(n, -1, dtype=int)
+        for j, i in enumerate(cols):
+            if i >= 0:
+                rows[i] = j
+        return rows
+
+    cost = -scores
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=int)  # 列 -> 行（从1开始，0表示未分配）
+    way = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    result = np.full(n, -1, dtype=int)
+    for j in range(1, m + 1):
+        if p[j]:
+            result[p[j] - 1] = j - 1
+    return result
+
+
+def bone_depths(bones):
+    """骨骼的相对层级深度 {骨骼名称: 0~1}"""
+    depths = {}
+    for bone in bones:
+        chain = []
+        while bone is not None and bone.name not in depths:
+            chain.append(bone)
+            bone = bone.parent
+        depth = depths[bone.name] if bone is not None else -1
+        for b in reversed(chain):
+            depth += 1
+            depths[b.name] = depth
+    max_depth = max(depths.values(), default=0) or 1
+    return {name: depth / max_depth for name, depth in depths.items()}
+
+
+def match_bones(owners, targets, synonyms=None, min_score=MIN_SCORE):
+    """为自身骨骼一次性匹配目标骨骼，每根目标骨骼最多被一根自身骨骼使用
+
+    Args:
+        owners: [(骨骼名称, 相对层级深度0~1)]
+        targets: [(骨骼名称, 相对层级深度0~1)]
+        synonyms: 同义名表，默认读取插件预设
+        min_score: 最低分数
+
+    Returns:
+        {自身骨骼名称: (目标骨骼名称, 分数)}
+    """
+    synonyms = load_synonyms() if synonyms is None else synonyms
+    owner_info = [normalize_bone_name(name) for name, _ in owners]
+    target_info = [normalize_bone_name(name) for name, _ in targets]
+
+    # 词元 -> 目标骨骼索引
+    token_index = {}
+    for j, (base, side, tokens) in enumerate(target_info):
+        for token in index_tokens(base, tokens, synonyms):
+            token_index.setdefault(token, []).append(j)
+
+    # 候选边：共享词元最多的若干目标骨骼
+    edges = {}
+    for i, (base, side, tokens) in enumerate(owner_info):
+        shared = {}
+        for token in index_tokens(base, tokens, synonyms):
+            for j in token_index.get(token, ()):
+                shared[j] = shared.get(j, 0) + 1
+        for j in sorted(shared, key=lambda j: -shared[j])[:MAX_CANDIDATES]:
+            score = score_pair(owner_info[i], target_info[j], synonyms)
+            if score >= min_score:
+                score += DEPTH_WEIGHT * (1 - abs(owners[i][1] - targets[j][1]))
+                edges[i, j] = score
+
+    # 按连通分量分别求解
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in edges:
+        parent[find(('o', i))] = find(('t', j))
+
+    components = {}
+    for (i, j), score in edges.items():
+        components.setdefault(find(('o', i)), []).append((i, j, score))
+
+    result = {}
+    for component in components.values():
+        rows = list(dict.fromkeys(i for i, _, _ in component))
+        cols = list(dict.fromkeys(j for _, j, _ in component))
+        row_index = {i: r for r, i in enumerate(rows)}
+        col_index = {j: c for c, j in enumerate(cols)}
+        scores = np.zeros((len(rows), len(cols)))
+        for i, j, score in component:
+            scores[row_index[i], col_index[j]] = score
+        for r, c in enumerate(solve_assignment(scores)):
+            if c >= 0 and scores[r, c] > 0:
+                result[owners[rows[r]][0]] = (targets[cols[c]][0], float(scores[r, c]))
+    return result
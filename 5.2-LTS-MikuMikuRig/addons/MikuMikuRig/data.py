@@ -1,33 +1,40 @@
 import bpy
 from .utilfuncs import *
 from math import pi
-from mathutils import Matrix, Euler
+from mathutils import Matrix
 
 class MMR_BAC_BoneMapping(bpy.types.PropertyGroup):
     def update_owner(self, context):
         # 更改自身骨骼，需要先清空旧的约束再生成新的约束
+        if mapping_updates_suppressed():
+            self.owner = self.selected_owner
+            return
         self.clear()
         self.owner = self.selected_owner
+        update_mapping_index(self, 'owner')
         self.apply()
 
     def update_target(self, context):
         # 更改目标骨骼，需要刷新约束上的目标
+        if mapping_updates_suppressed():
+            return
         s = get_state()
+        update_mapping_index(self, 'target')
         if self.is_valid() and s.calc_offset:
-            # 计算旋转偏移
-            euler_offset = ((s.target.matrix_world @ self.get_target().matrix).inverted() @ (s.owner.matrix_world @ self.get_owner().matrix)).to_euler()
-            if s.ortho_offset:
-                step = pi * 0.5
-                euler_offset[0] = round(euler_offset[0] / step) * step
-                euler_offset[1] = round(euler_offset[1] / step) * step
-                euler_offset[2] = round(euler_offset[2] / step) * step
-            if euler_offset != None and euler_offset != Euler((0,0,0)):
-                self.offset[0] = euler_offset[0]
-                self.offset[1] = euler_offset[1]
-                self.offset[2] = euler_offset[2]
-                self.has_rotoffs = True
+            self.calc_rotoffs()
         self.apply()
 
+    def calc_rotoffs(self):
+        # 计算旋转偏移
+        s = get_state()
+        euler_offset = calc_rotation_offset(s.target.matrix_world @ self.get_target().matrix,
+                                            s.owner.matrix_world @ self.get_owner().matrix, s.ortho_offset)
+        if euler_offset != None:
+            self.offset[0] = euler_offset[0]
+            self.offset[1] = euler_offset[1]
+            self.offset[2] = euler_offset[2]
+            self.has_rotoffs = True
+
     def update_rotcopy(self, context):
         s = get_state()
         cr = self.get_cr()
@@ -36,6 +43,8 @@ class MMR_BAC_BoneMapping(bpy.types.PropertyGroup):
         set_enable(cr, self.is_valid() and s.preview)
 
     def update_rotoffs(self, context):
+        if mapping_updates_suppressed():
+            return
         s = get_state()
         rr = self.get_rr()
         if self.has_rotoffs:
@@ -49,6 +58,8 @@ class MMR_BAC_BoneMapping(bpy.types.PropertyGroup):
             self.remove(rr)
 
     def update_loccopy(self, context):
+        if mapping_updates_suppressed():
+            return
         s = get_state()
         cp = self.get_cp()
         if self.has_loccopy:
@@ -62,6 +73,8 @@ class MMR_BAC_BoneMapping(bpy.types.PropertyGroup):
             self.remove(cp)
 
     def update_ik(self, context):
+        if mapping_updates_suppressed():
+            return
         s = get_state()
         ik = self.get_ik()
         if self.has_ik:
@@ -131,6 +144,8 @@ class MMR_BAC_BoneMapping(bpy.types.PropertyGroup):
     )
 
     def update_selected(self, context):
+        if mapping_updates_suppressed():
+            return
         get_state().selected_count += 1 if self.selected else -1
 
     selected: bpy.props.BoolProperty(override={'LIBRARY_OVERRIDABLE'}, update=update_selected)
@@ -154,6 +169,22 @@ class MMR_BAC_BoneMapping(bpy.types.PropertyGroup):
         self.update_loccopy(bpy.context)
         self.update_ik(bpy.context)
 
+    def build(self):
+        # 只生成需要的约束（apply会先生成再删除未启用的约束），返回生成的约束数量
+        if not self.get_owner():
+            return 0
+        count = 1
+        self.update_rotcopy(bpy.context)
+        if self.has_rotoffs:
+            self.update_rotoffs(bpy.context)
+            count += 1
+        if self.has_loccopy:
+            self.update_loccopy(bpy.context)
+            count += 1
+        if self.has_ik:
+            self.update_ik(bpy.context)
+            count += 1
+        return count
 
     def clear(self):
         self.remove(self.get_cr())
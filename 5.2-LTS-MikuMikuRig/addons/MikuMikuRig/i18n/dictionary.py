@@ -5,6 +5,8 @@ dictionary = {
         ("*", "MMD tool"): "MMD工具",
         ("Operator", "Optimization MMD Armature"): "优化MMD骨骼",
         ("Operator", "Build a controller"): "生成控制器",
+        ("Operator", "Batch build controllers"): "批量生成控制器",
+        ("*", "Assign physics"): "装配物理",
         ("", "Extras"): "额外选项",
         ("*", "Controller options"): "控制器选项",
         ("", "Polar target"): "极向目标",
@@ -30,6 +32,8 @@ dictionary = {
         ("*", "Bone retargeting"): "骨骼重定向",
         ("Operator", "Import FBX actions"): "导入FBX动作",
         ("Operator", "Import VMD actions"): "导入VMD动作",
+        ("Operator", "Batch retarget actions"): "批量重定向动作",
+        ("Operator", "Parallel retarget actions"): "并行重定向动作",
         ("Operator", "Open the presets folder"): "打开预设文件夹",
         ("", "Finger tip bone repair"): "修复手指末端骨骼",
         ("", "Finger options"): "手指选项",
@@ -107,7 +111,15 @@ dictionary = {
         ("", "Enable Finger IK"): "启用手指IK",
         ("", "Enable VMD IK import（Mandatory）"): "VMD动作IK导入（强制）",
         ("", "Bake Frame Step"): "烘培帧步长",
+        ("", "Direct bake"): "直接烘焙",
+        ("", "FBX animation only"): "FBX仅导入动画",
         ("", "Automatic IK bone chain:"): "自动IK骨骼链：",
+        ("*", "Constraint"): "约束",
+        ("*", "Collision Collections"): "碰撞集合",
+        ("Operator", "Benchmark Physics"): "物理模拟测速",
+        ("Operator", "Bake Physics Cache"): "烘焙物理缓存",
+        ("Operator", "Free Physics Cache"): "删除物理缓存",
+        ("Operator", "Update physics"): "增量更新物理",
 
     }
 }
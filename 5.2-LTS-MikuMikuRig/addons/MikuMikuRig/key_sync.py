@@ -0,0 +1,323 @@
+"""形态键面板同步
+
+通过 bpy.msgbus 订阅 key_obj、Batch_adjust_shape_key 与形态键名称的修改，
+修改后合并到下一次计时器回调中统一处理，播放动画或无关的场景更新不会触发任何同步。
+msgbus 不会通知脚本中的修改，key_obj 与 Batch_adjust_shape_key 的属性更新回调同样会调用 schedule_sync。
+"""
+from collections import Counter
+import re
+import time
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+
+from .operators import has_keyframes_for_property
+from .operators.direct_bake import get_action_fcurves
+from .panels import MMR_property
+
+# msgbus 订阅的所有者
+_msgbus_owner = object()
+
+# 等待处理的同步任务
+_pending = set()
+
+# 任务：形态键物体改变 / 批量调整值改变 / 形态键名称改变
+TASK_KEY_OBJ = "key_obj"
+TASK_BATCH_ADJUST = "batch_adjust"
+TASK_KEY_NAMES = "key_names"
+
+# mmr_key 项的数据路径
+KEY_ITEM_PATH = re.compile(r'mmr_key\[(\d+)\](.*)')
+
+# 已删除项的F曲线改用的按名称路径 mmr_key["名称"]
+KEY_NAME_PATH = re.compile(r'mmr_key\["((?:[^"\\]|\\.)*)"\](.*)')
+
+
+def schedule_sync(task):
+    """记录同步任务，同一轮内的多次修改合并为一次处理"""
+    # 计时器不会跨文件保留，按是否已注册判断而不是按 _pending 是否为空
+    if not bpy.app.timers.is_registered(flush_sync):
+        bpy.app.timers.register(flush_sync, first_interval=0.0)
+    _pending.add(task)
+
+
+def flush_sync():
+    tasks = set(_pending)
+    _pending.clear()
+    for obj in bpy.data.objects:
+        mmr = getattr(obj, "mmr", None)
+        if mmr is None or not mmr.key_obj:
+            continue
+        if mmr.key_obj is not mmr.Import_object_data \
+                or (TASK_KEY_NAMES in tasks and key_names_changed(obj)):
+            sync_key_items(obj)
+        if mmr.Batch_adjust_shape_key != mmr.last_batch_adjust_value:
+            apply_batch_adjust(obj)
+    return None  # 只执行一次
+
+
+def key_names_changed(obj):
+    """形态键名称与 mmr_key 是否不一致（形态键被重命名）"""
+    key_obj = obj.mmr.key_obj
+    if key_obj.type != 'MESH' or not key_obj.data.shape_keys:
+        return False
+    names = [key.name for key in key_obj.data.shape_keys.key_blocks]
+    return names != [item.name for item in obj.mmr_key]
+
+
+def rename_key_items(items, names):
+    """同一形态键数据中，按索引将已改名的项重命名为新的形态键名称
+
+    Returns:
+        重命名的项数
+    """
+    wanted = set(names)
+    existing = {item.name for item in items}
+    renamed = 0
+    for item in items:
+        if item.name in wanted:
+            continue
+        idx = item.meshkey_index
+        if 0 <= idx < len(names) and names[idx] not in existing:
+            existing.discard(item.name)
+            item.name = names[idx]
+            existing.add(item.name)
+            renamed += 1
+    return renamed
+
+
+def sync_key_items(obj):
+    """根据 key_obj 的形态键同步 mmr_key 列表"""
+    key_obj = obj.mmr.key_obj
+
+    # 更新存储的值
+    obj.mmr.Import_object_data = key_obj
+
+    if not key_obj.type == 'MESH' or not key_obj.data.shape_keys:
+        return
+
+    reconcile_key_items(obj, key_obj.data.shape_keys)
+
+
+def reconcile_key_items(obj, meshkey):
+    """按名称对比 mmr_key 与形态键，只增删有差异的项
+
+    保留已有项的选择与显示状态，顺序改变时同步修正 mmr_key[索引] 的关键帧与驱动器路径。
+    形态键数据未改变时，先按索引匹配被重命名的形态键。已删除项的关键帧改为按名称的路径保留，
+    之后出现同名的形态键（例如切换回原来的模型）时恢复。
+
+    Args:
+        obj: 带有 mmr_key 的物体
+        meshkey: 形态键数据
+    """
+    start_time = time.time()
+    key_blocks = meshkey.key_blocks
+    items = obj.mmr_key
+
+    # 获取模型形态
+    names = [key.name for key in key_blocks]
+    wanted = set(names)
+
+    # 同一形态键数据的重命名不是删除后新增
+    same_mesh = len(items) > 0 and all(item.meshkey == meshkey for item in items)
+    renamed = rename_key_items(items, names) if same_mesh else 0
+
+    old_names = [item.name for item in items]
+    old_index = {}
+    for idx, item in enumerate(items):
+        old_index.setdefault(item.name, idx)
+
+    # 删除不存在或重复的项（从后往前删除，索引不变）
+    removed = 0
+    for idx in range(len(items) - 1, -1, -1):
+        name = items[idx].name
+        if name not in wanted or old_index[name] != idx:
+            items.remove(idx)
+            removed += 1
+
+    # 添加新的项
+    current = [item.name for item in items]
+    existing = set(current)
+    added = 0
+    for name in names:
+        if name not in existing:
+            item = items.add()
+            item.name = name
+            current.append(name)
+            added += 1
+
+    # 按形态键顺序排列
+    position = {name: idx for idx, name in enumerate(current)}
+    for idx, name in enumerate(names):
+        j = position[name]
+        if j != idx:
+            items.move(j, idx)
+            moved = current.pop(j)
+            current.insert(idx, moved)
+            for k in range(idx, j + 1):
+                position[current[k]] = k
+
+    # 新添加的项与第一个形态键（基型）
+    for idx, name in enumerate(names):
+        if name not in old_index:
+            items[idx].bool_value = idx != 0
+    if items:
+        items[0].bool_value = False
+
+    # 批量同步值与索引
+    count = len(names)
+    values = np.empty(count, dtype=np.float32)
+    key_blocks.foreach_get('value', values)
+    items.foreach_set('value', np.clip(values, 0.0, 1.0))
+    items.foreach_set('meshkey_index', np.arange(count, dtype=np.int32))
+    for item in items:
+        if item.meshkey != meshkey:
+            item.meshkey = meshkey
+
+    # 修正以索引记录的关键帧与驱动器
+    index_map = {old_index[name]: idx for idx, name in enumerate(names) if name in old_index}
+    stale = set(old_index.values()) - index_map.keys()
+    if stale or added or any(old != new for old, new in index_map.items()):
+        remap_key_item_paths(obj, index_map, {idx: old_names[idx] for idx in stale},
+                             {name: idx for idx, name in enumerate(names)})
+
+    print(f"mmr_key 同步: 新增{added}, 删除{removed}, 重命名{renamed}, 共{count}项, 耗时{time.time() - start_time:.3f}s")
+
+
+def remap_key_item_paths(obj, index_map, stale, name_index):
+    """将 mmr_key[旧索引] 的F曲线与驱动器变量改为新索引
+
+    已删除项的F曲线不删除，改为按名称的路径 mmr_key["名称"]，保留关键帧且不会与新索引冲突；
+    按名称保留的F曲线在同名项重新出现时改回索引路径。
+
+    Args:
+        obj: 带有 mmr_key 的物体
+        index_map: {旧索引: 新索引}
+        stale: 已删除项 {旧索引: 名称}
+        name_index: 当前项 {名称: 索引}
+    """
+    def remap(data_path):
+        match = KEY_ITEM_PATH.fullmatch(data_path)
+        if match:
+            old = int(match.group(1))
+            if old in index_map:
+                return f"mmr_key[{index_map[old]}]{match.group(2)}"
+            if old in stale:
+                name = stale[old].replace('\\', '\\\\').replace('"', '\\"')
+                return f'mmr_key["{name}"]{match.group(2)}'
+            return data_path
+        match = KEY_NAME_PATH.fullmatch(data_path)
+        if match:
+            name = re.sub(r'\\(.)', r'\1', match.group(1))
+            if name in name_index:
+                return f"mmr_key[{name_index[name]}]{match.group(2)}"
+        return data_path
+
+    # 关键帧（目标路径已有F曲线时保持原路径，避免重复）
+    fcurves = list(get_action_fcurves(obj))
+    targets = [remap(fcurve.data_path) for fcurve in fcurves]
+    counts = Counter(zip(targets, (fcurve.array_index for fcurve in fcurves)))
+    for fcurve, data_path in zip(fcurves, targets):
+        if data_path != fcurve.data_path and counts[(data_path, fcurve.array_index)] == 1:
+            fcurve.data_path = data_path
+
+    # 驱动器变量（表情面板的驱动器在形态键数据上）
+    for shape_keys in bpy.data.shape_keys:
+        anim_data = shape_keys.animation_data
+        if not anim_data:
+            continue
+        for driver_fcurve in anim_data.drivers:
+            for var in driver_fcurve.driver.variables:
+                for target in var.targets:
+                    if target.id != obj:
+                        continue
+                    data_path = remap(target.data_path)
+                    if data_path != target.data_path:
+                        target.data_path = data_path
+
+
+def apply_batch_adjust(obj):
+    """将批量调整值写入选中的形态键"""
+    # 获取批量调整值
+    current_value1 = obj.mmr.Batch_adjust_shape_key
+
+    # 更新存储的值
+    obj.mmr.last_batch_adjust_value = current_value1
+
+    if obj.mmr.register_handler:
+        return
+
+    scene = bpy.context.scene
+    for idx, key in enumerate(obj.mmr_key):
+        if key.select:
+
+            meshkey = key.meshkey
+
+            if not obj.mmr.direct_operation_shape_key:
+                # 同步到值
+                key.value = current_value1
+            else:
+                if meshkey:
+                    meshkey.key_blocks[key.meshkey_index].value = current_value1
+
+            # 是否插入关键帧
+            if scene.tool_settings.use_keyframe_insert_auto:
+
+                if not obj.mmr.direct_operation_shape_key:
+
+                    if obj.mmr.insert_keyframe: # 选中的有关键帧的才会插入关键帧
+                        if has_keyframes_for_property(obj, "mmr_key[%d].value" % idx):
+                            obj.keyframe_insert(data_path="mmr_key[%d].value" % idx, frame=scene.frame_current)
+
+                    if obj.mmr.use_keyframe_insert_auto: # 自动插入关键帧
+                        obj.keyframe_insert(data_path="mmr_key[%d].value" % idx, frame=scene.frame_current)
+                else:
+                    if meshkey:
+
+                        if obj.mmr.insert_keyframe:  # 选中的有关键帧的才会插入关键帧
+                            if has_keyframes_for_property(meshkey, f"key_blocks['{str(key.name)}'].value"):
+                                meshkey.key_blocks[key.meshkey_index].keyframe_insert(data_path="value", frame=scene.frame_current)
+
+                        if obj.mmr.use_keyframe_insert_auto:  # 自动插入关键帧
+                            meshkey.key_blocks[key.meshkey_index].keyframe_insert(data_path="value", frame=scene.frame_current)
+
+
+def subscribe_key_sync():
+    """订阅相关属性的修改"""
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    subscriptions = (
+        ((MMR_property, "key_obj"), TASK_KEY_OBJ),
+        ((MMR_property, "Batch_adjust_shape_key"), TASK_BATCH_ADJUST),
+        ((bpy.types.ShapeKey, "name"), TASK_KEY_NAMES),
+    )
+    for key, task in subscriptions:
+        bpy.msgbus.subscribe_rna(
+            key=key,
+            owner=_msgbus_owner,
+            args=(task,),
+            notify=schedule_sync,
+        )
+    # 打开的文件中可能已有未同步的数据
+    schedule_sync(TASK_KEY_OBJ)
+
+
+@persistent
+def resubscribe_key_sync(*args):
+    # 加载文件会清空所有 msgbus 订阅与计时器，旧文件中未处理的任务一并丢弃
+    _pending.clear()
+    subscribe_key_sync()
+
+
+def register_key_sync():
+    subscribe_key_sync()
+    bpy.app.handlers.load_post.append(resubscribe_key_sync)
+
+
+def unregister_key_sync():
+    if resubscribe_key_sync in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(resubscribe_key_sync)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    if bpy.app.timers.is_registered(flush_sync):
+        bpy.app.timers.unregister(flush_sync)
+    _pending.clear()
@@ -4,7 +4,8 @@ from numpy import true_divide
 import bpy
 from bl_operators.presets import AddPresetBase
 from .utilfuncs import *
-import difflib
+from .mapping_preset import load_mapping_preset, MAPPING_PRESET_EXT
+from .bone_matcher import match_bones, bone_depths
 import os
 
 
@@ -43,6 +44,7 @@ def draw_panel(layout):
     box.menu(MMR_BAC_MT_presets.__name__, text=MMR_BAC_MT_presets.bl_label, translate=False, icon='PRESET')
     box.operator(MMR_AddPresetBACMapping.bl_idname, text="", icon='ADD')
     box.operator(MMR_AddPresetBACMapping.bl_idname, text="", icon='REMOVE').remove_active = True
+    box.operator('mmr_kumopult_bac.apply_mapping_table', text="", icon='IMPORT')
     box.separator()
     box.operator('mmr_kumopult_bac.open_preset_folder', text="", icon='FILE_FOLDER')
 
@@ -136,7 +138,9 @@ class MMR_BAC_MT_SettingMenu(bpy.types.Menu):
 class MMR_BAC_MT_presets(bpy.types.Menu):
     bl_label = "映射表预设"
     preset_subdir = "mmr_kumopult_bac"
-    preset_operator = "script.execute_preset"
+    # 预设按映射表读取（带缓存），不再执行预设脚本
+    preset_operator = "mmr_kumopult_bac.apply_mapping_table"
+    preset_extensions = {'.py', MAPPING_PRESET_EXT}
     draw = bpy.types.Menu.draw_preset
 
 
@@ -170,6 +174,41 @@ class MMR_BAC_OT_OpenPresetFolder(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class MMR_BAC_OT_ApplyMappingTable(bpy.types.Operator):
+    bl_idname = 'mmr_kumopult_bac.apply_mapping_table'
+    bl_label = '应用映射表'
+    bl_description = '从映射表预设批量生成映射，所有约束只生成一次'
+    bl_options = {'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH', options={'SKIP_SAVE'})
+    filter_glob: bpy.props.StringProperty(default='*' + MAPPING_PRESET_EXT + ';*.json;*.py', options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return get_state() != None
+
+    def execute(self, context):
+        filepath = bpy.path.abspath(self.filepath)
+        try:
+            rows = load_mapping_preset(filepath)
+        except (OSError, ValueError, SyntaxError) as e:
+            self.report({'ERROR'}, f"读取映射表失败: {e}")
+            return {'CANCELLED'}
+
+        # 与script.execute_preset一致，菜单标题显示当前预设名称
+        MMR_BAC_MT_presets.bl_label = bpy.path.display_name(os.path.basename(filepath), title_case=False)
+        count = get_state().apply_mapping_table(rows)
+        self.report({'INFO'}, f"已生成 {len(rows)} 个映射, {count} 个约束")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        # 预设菜单已传入文件路径，直接应用
+        if self.filepath:
+            return self.execute(context)
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
 class MMR_BAC_OT_SelectEditType(bpy.types.Operator):
     bl_idname = 'mmr_kumopult_bac.select_edit_type'
     bl_label = ''
@@ -261,7 +300,7 @@ class MMR_BAC_OT_ListAction(bpy.types.Operator):
         def up():
             if s.selected_count == 0:
                 if len(s.mappings) > s.active_mapping > 0:
-                    s.mappings.move(s.active_mapping, s.active_mapping - 1)
+                    s.move_mapping(s.active_mapping, s.active_mapping - 1)
                     s.active_mapping -= 1
             else:
                 move_indices = []
@@ -271,12 +310,12 @@ class MMR_BAC_OT_ListAction(bpy.types.Operator):
                 for i in move_indices:
                     if not s.mappings[i - 1].selected:
                         # 前一项未选中时才能前移
-                        s.mappings.move(i, i - 1)
+                        s.move_mapping(i, i - 1)
 
         def down():
             if s.selected_count == 0:
                 if len(s.mappings) > s.active_mapping + 1 > 0:
-                    s.mappings.move(s.active_mapping, s.active_mapping + 1)
+                    s.move_mapping(s.active_mapping, s.active_mapping + 1)
                     s.active_mapping += 1
             else:
                 move_indices = []
@@ -286,7 +325,7 @@ class MMR_BAC_OT_ListAction(bpy.types.Operator):
                 for i in move_indices:
                     if not s.mappings[i + 1].selected:
                         # 后一项未选中时才能后移
-                        s.mappings.move(i, i + 1)
+                        s.move_mapping(i, i + 1)
 
         ops = {
             'ADD': add,
@@ -354,7 +393,7 @@ class MMR_BAC_OT_ChildMapping(bpy.types.Operator):
 class MMR_BAC_OT_NameMapping(bpy.types.Operator):
     bl_idname = 'mmr_kumopult_bac.name_mapping'
     bl_label = '名称映射'
-    bl_description = '按照名称的相似程度来给自身骨骼自动寻找最接近的目标骨骼'
+    bl_description = '按照名称的相似程度来给自身骨骼自动寻找最接近的目标骨骼\n会识别左右后缀、mixamorig:前缀、全角数字以及预设中的MMD/Rigify同义名，每根目标骨骼只分配一次'
     bl_options = {'UNDO'}
 
     @classmethod
@@ -368,25 +407,25 @@ class MMR_BAC_OT_NameMapping(bpy.types.Operator):
                 ret = False
         return ret
 
-    def get_similar_bone(self, owner_name, target_bones):
-        similar_name = ''
-        similar_ratio = 0
-
-        for target in target_bones:
-            r = difflib.SequenceMatcher(None, owner_name, target.name).quick_ratio()
-            if r > similar_ratio:
-                similar_ratio = r
-                similar_name = target.name
-
-        return similar_name
-
     def execute(self, context):
         s = get_state()
-
-        for i in s.get_selection():
+        indices = s.get_selection()
+        selection = set(indices)
+
+        # 未选中的映射已使用的目标骨骼不参与分配
+        used = {m.target for i, m in enumerate(s.mappings) if i not in selection and m.target}
+        owner_depths = bone_depths(s.get_owner_armature().bones)
+        target_depths = bone_depths(s.get_target_armature().bones)
+        owners = [(s.mappings[i].owner, owner_depths[s.mappings[i].owner]) for i in indices]
+        targets = [(name, depth) for name, depth in target_depths.items() if name not in used]
+
+        result = match_bones(owners, targets)
+        for i in indices:
             m = s.mappings[i]
-            m.target = self.get_similar_bone(m.owner, s.get_target_armature().bones)
+            if m.owner in result:
+                m.target = result[m.owner][0]
 
+        self.report({'INFO'}, f"已匹配 {len(result)}/{len(indices)} 个映射")
         return {'FINISHED'}
 
 
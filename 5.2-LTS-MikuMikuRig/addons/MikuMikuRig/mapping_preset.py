@@ -0,0 +1,222 @@
+"""骨骼映射表预设
+
+声明式的映射表预设格式（.mmrmap，JSON文本），每个映射一行，便于校验与比较差异:
+
+    {
+        "version": 1,
+        "columns": ["owner", "target", "has_rotoffs", ...],
+        "rows": [
+            ["hips", "mixamorig:Hips", true, ...],
+            ...
+        ]
+    }
+
+旧的.py预设（包括添加预设按钮保存的预设）通过语法分析转换，不会执行其中的代码。
+
+命令行转换:
+
+    python mapping_preset.py Mixamo.py [Mixamo.mmrmap]
+"""
+import ast
+import json
+import os
+import sys
+
+# 映射表预设扩展名
+MAPPING_PRESET_EXT = '.mmrmap'
+
+MAPPING_PRESET_VERSION = 1
+
+# 映射表列及默认值
+MAPPING_COLUMNS = ['owner', 'target', 'has_rotoffs', 'has_loccopy', 'has_ik', 'offset', 'loc_axis', 'ik_influence']
+MAPPING_DEFAULTS = {
+    'target': '',
+    'has_rotoffs': False,
+    'has_loccopy': False,
+    'has_ik': False,
+    'offset': None,  # 未指定时按骨骼方向自动计算
+    'loc_axis': [True, True, True],
+    'ik_influence': 1.0,
+}
+
+# 已解析预设的缓存 {文件路径: (修改时间, 映射行)}
+_preset_cache = {}
+
+
+def validate_mapping_rows(rows):
+    """校验并补全映射行
+
+    Args:
+        rows: 映射行列表 [{'owner': ..., 'target': ..., ...}]
+
+    Returns:
+        补全默认值后的映射行列表
+    """
+    result = []
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"第{i + 1}行不是映射")
+        unknown = set(row) - set(MAPPING_COLUMNS)
+        if unknown:
+            raise ValueError(f"第{i + 1}行包含未知的列: {', '.join(sorted(unknown))}")
+        if not isinstance(row.get('owner'), str):
+            raise ValueError(f"第{i + 1}行缺少自身骨骼")
+
+        item = dict(MAPPING_DEFAULTS)
+        item.update(row)
+        if not isinstance(item['target'], str):
+            raise ValueError(f"第{i + 1}行约束目标不是字符串")
+        for key in ('has_rotoffs', 'has_loccopy', 'has_ik'):
+            if not isinstance(item[key], bool):
+                raise ValueError(f"第{i + 1}行 {key} 不是布尔值")
+        if item['offset'] is not None and (
+                len(item['offset']) != 3 or not all(isinstance(v, (int, float)) for v in item['offset'])):
+            raise ValueError(f"第{i + 1}行旋转偏移量应为3个数值")
+        if len(item['loc_axis']) != 3 or not all(isinstance(v, bool) for v in item['loc_axis']):
+            raise ValueError(f"第{i + 1}行位置映射轴向应为3个布尔值")
+        if not 0 <= item['ik_influence'] <= 1:
+            raise ValueError(f"第{i + 1}行IK影响权重超出范围")
+        if item['offset'] is not None:
+            item['offset'] = [float(v) for v in item['offset']]
+        item['loc_axis'] = list(item['loc_axis'])
+        item['ik_influence'] = float(item['ik_influence'])
+        result.append(item)
+    return result
+
+
+def parse_mapping_table(data):
+    """解析映射表数据，支持紧凑表格 {"columns", "rows"}、{"mappings": [...]} 与行列表 [{...}]"""
+    if isinstance(data, dict):
+        if 'columns' in data:
+            columns = data['columns']
+            rows = []
+            for i, values in enumerate(data['rows']):
+                if len(values) != len(columns):
+                    raise ValueError(f"第{i + 1}行的列数与表头不一致")
+                rows.append(dict(zip(columns, values)))
+            return validate_mapping_rows(rows)
+        data = data.get('mappings', [])
+    return validate_mapping_rows(data)
+
+
+def parse_preset_script(source):
+    """通过语法分析将.py映射预设转换为映射行（不执行脚本）
+
+    支持预设文件和添加预设按钮保存的格式:
+        item_sub_1 = s.mappings.add()
+        item_sub_1.selected_owner = 'hips'
+        ...
+    """
+    rows = []
+    items = {}
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        target = node.targets[0]
+
+        # item = s.mappings.add()
+        if isinstance(target, ast.Name) and isinstance(node.value, ast.Call):
+            func = node.value.func
+            if isinstance(func, ast.Attribute) and func.attr == 'add' \
+                    and isinstance(func.value, ast.Attribute) and func.value.attr == 'mappings':
+                row = {}
+                rows.append(row)
+                items[target.id] = row
+            continue
+
+        # item.属性 = 值
+        if not (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)):
+            continue
+        row = items.get(target.value.id)
+        if row is None:
+            continue
+        try:
+            value = ast.literal_eval(node.value)
+        except ValueError:
+            raise ValueError(f"第{node.lineno}行不是常量: {target.value.id}.{target.attr}")
+        if target.attr == 'selected_owner':
+            row['owner'] = value
+        elif target.attr == 'owner':
+            row.setdefault('owner', value)
+        elif target.attr in MAPPING_COLUMNS:
+            row[target.attr] = value
+
+    if not rows:
+        raise ValueError("预设中没有映射")
+    return validate_mapping_rows(rows)
+
+
+def read_mapping_preset(filepath):
+    """读取映射表预设（.mmrmap/.json/.py），不使用缓存"""
+    with open(filepath, encoding='utf-8') as f:
+        source = f.read()
+    if filepath.lower().endswith('.py'):
+        return parse_preset_script(source)
+    return parse_mapping_table(json.loads(source))
+
+
+def load_mapping_preset(filepath):
+    """读取映射表预设，按文件修改时间缓存解析结果
+
+    Returns:
+        映射行列表（缓存对象，调用方不应修改）
+    """
+    filepath = os.path.abspath(filepath)
+    mtime = os.path.getmtime(filepath)
+    cached = _preset_cache.get(filepath)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    rows = read_mapping_preset(filepath)
+    _preset_cache[filepath] = (mtime, rows)
+    return rows
+
+
+def dump_mapping_table(rows):
+    """将映射行写为紧凑表格文本，每个映射一行"""
+    rows = validate_mapping_rows(rows)
+    lines = [json.dumps([row[key] for key in MAPPING_COLUMNS], ensure_ascii=False) for row in rows]
+    return (
+        '{\n'
+        f'    "version": {MAPPING_PRESET_VERSION},\n'
+        f'    "columns": {json.dumps(MAPPING_COLUMNS)},\n'
+        '    "rows": [\n'
+        + ',\n'.join('        ' + line for line in lines)
+        + '\n    ]\n}\n'
+    )
+
+
+def save_mapping_preset(filepath, rows):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(dump_mapping_table(rows))
+
+
+def convert_preset_file(src, dst=None):
+    """将.py映射预设转换为.mmrmap文件
+
+    Returns:
+        输出文件路径
+    """
+    dst = dst or os.path.splitext(src)[0] + MAPPING_PRESET_EXT
+    save_mapping_preset(dst, read_mapping_preset(src))
+    return dst
+
+
+def find_mapping_preset(directory, name):
+    """按名称查找映射表预设，优先使用.mmrmap，其次为.py"""
+    for ext in (MAPPING_PRESET_EXT, '.py'):
+        path = os.path.join(directory, name + ext)
+        if os.path.isfile(path):
+            return path
+    return os.path.join(directory, name + MAPPING_PRESET_EXT)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("用法: python mapping_preset.py 预设.py [输出.mmrmap]")
+        sys.exit(1)
+    dst = convert_preset_file(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"已转换: {dst}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,8 @@ import bpy
 import json
 import os
 
+from .template_library import append_template_object
+
 class mmrmakepresetsOperator(bpy.types.Operator):
     '''make presets'''
     bl_idname = "object.mmr_make_presets"
@@ -45,17 +47,8 @@ class mmrmakepresetsOperator(bpy.types.Operator):
         new_path = os.path.dirname(current_file_path)
 
         if mmr.Reference_bones:
-            blend_file_path = os.path.join(new_path, 'MMR_Rig.blend')
-            # 设置追加参数
-            filepath = os.path.join(blend_file_path, "Object", "MMR_Rig_relative")
-            directory = os.path.join(blend_file_path, "Object")
-            filename = "MMR_Rig_relative"
-            # 执行追加操作
-            bpy.ops.wm.append(
-                filepath=filepath,
-                directory=directory,
-                filename=filename,
-            )
+            # 从模板库复制元骨骼
+            append_template_object(context, 'MMR_Rig.blend', 'MMR_Rig_relative')
             mmr.Reference_bones = False
             return {'FINISHED'}
 
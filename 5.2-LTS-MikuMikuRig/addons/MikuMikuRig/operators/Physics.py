@@ -2,6 +2,53 @@ from math import radians
 
 import bpy
 
+from .physics_common import get_rigid_range, find_non_collision_pairs, create_constraint_template, \
+    allocate_constraint_empties, solve_collision_collections, pairs_sharing_collections, \
+    apply_collision_collections, restore_collision_collections, find_unmanaged_colliders, benchmark_simulation
+from .bone_topology import get_bone_chain, sort_bone_chain_by_hierarchy
+from .physics_common import diff_constraint_empties, find_constraint_template
+from .physics_snapshot import rigid_body_entry, joint_entry, save_physics_snapshot, load_physics_snapshot, \
+    clear_physics_snapshot, diff_physics_snapshot, needs_full_rebuild, goto_cache_start
+
+
+def mmr_rigid_bodies(collection, armature):
+    """MMR刚体（骨骼刚体装配后父级为骨架）"""
+    objects = [obj for obj in collection.children if obj.type == 'MESH']
+    objects += [obj for obj in armature.children
+                if obj.type == 'MESH' and obj.mmr_bone.mmr_type == 'RIGIDBODY' and obj not in objects]
+    return objects
+
+
+def report_unmanaged_colliders(operator, context, rigidbodies):
+    """碰撞集合模式下，提示将不再与MMR刚体碰撞的其他刚体"""
+    unmanaged = find_unmanaged_colliders(context.scene, rigidbodies)
+    if unmanaged:
+        names = ', '.join(obj.name for obj in unmanaged[:5])
+        operator.report({'WARNING'}, f"使用碰撞集合后，{len(unmanaged)}个其他刚体不再与模型碰撞: {names}")
+
+
+def mmr_physics_snapshot(rigidbodies, joints, locations):
+    """MMR物理的快照项
+
+    Args:
+        rigidbodies: 刚体对象列表
+        joints: 关节对象列表
+        locations: {刚体名称: 装配前的位置}
+
+    Returns:
+        (刚体快照项, 关节快照项)
+    """
+    rigid_entries = {}
+    for obj in rigidbodies:
+        if obj.rigid_body is None:
+            continue
+        mmr_bone = obj.mmr_bone
+        rigid_entries[obj.name] = rigid_body_entry(
+            obj, mmr_bone.collision_group_index, mmr_bone.collision_group_mask, mmr_bone.bone,
+            f"{mmr_bone.rigidbody_type}:{mmr_bone.panel_bool}", locations.get(obj.name, obj.location))
+    joint_entries = {obj.name: joint_entry(obj) for obj in joints if obj.rigid_body_constraint}
+    return rigid_entries, joint_entries
+
 class Add_Damping_Tracking(bpy.types.Operator):
     '''Add_Damping_Tracking'''
     bl_idname = "mmr.add_damping_tracking"
@@ -19,66 +66,24 @@ class Add_Damping_Tracking(bpy.types.Operator):
         # 获取当前活动对象和骨骼
         obj = bpy.context.active_object
 
-        # 获取选中骨骼列表
-        selected_bones = [bone for bone in obj.pose.bones if bone.select]
+        # 获取选中骨骼列表（父骨骼在前，已包含在之前骨骼链中的骨骼不再重复处理）
+        selected_bones = sort_bone_chain_by_hierarchy(obj, [bone.name for bone in obj.pose.bones if bone.select])
+        processed_bones = set()
 
-        for bone in selected_bones:
+        for bone_name in selected_bones:
+            if bone_name in processed_bones:
+                continue
 
             # 获取活动骨骼
-            active_bone = obj.data.bones.get(bone.name)
+            active_bone = obj.data.bones.get(bone_name)
 
-            # 切换到编辑模式获取骨骼位置数据
             current_mode = bpy.context.object.mode
 
             # 获取MMR属性
             mmr = obj.mmr
 
-            def get_bone_chain():
-
-                if not obj or obj.type != 'ARMATURE':
-                    return []
-
-                if not active_bone:
-                    return []
-
-                bpy.ops.object.mode_set(mode='EDIT')
-
-                try:
-                    edit_bones = obj.data.edit_bones
-                    bone_chain = []
-                    current_bone = active_bone
-
-                    while current_bone:  # 继续遍历直到没有下一个骨骼
-                        # 添加当前骨骼到链
-                        bone_chain.append(current_bone.name)
-
-                        # 在编辑模式中获取当前骨骼对象
-                        edit_bone = edit_bones[current_bone.name]
-                        tail_pos = (round(edit_bone.tail[0], 4),
-                                    round(edit_bone.tail[1], 4),
-                                    round(edit_bone.tail[2], 4))
-
-                        # 查找直接连接的下一个骨骼
-                        next_bone = None
-                        for child in current_bone.children:
-                            child_edit = edit_bones[child.name]
-                            head_pos = (round(child_edit.head[0], 4),
-                                        round(child_edit.head[1], 4),
-                                        round(child_edit.head[2], 4))
-
-                            if head_pos == tail_pos:
-                                next_bone = child
-                                break  # 找到第一个连接的子骨骼
-
-                        current_bone = next_bone  # 移动到下一个骨骼或结束循环
-
-                    return bone_chain
-
-                finally:
-                    # 恢复原始模式
-                    bpy.ops.object.mode_set(mode=current_mode)
-
-            bone_chain = get_bone_chain()
+            # 从静止姿态拓扑索引获取骨骼链，不切换编辑模式
+            bone_chain = get_bone_chain(obj, active_bone.name) if active_bone else []
 
             if bone_chain:
                 # 检查是否有MMR-Target骨骼
@@ -103,6 +108,8 @@ class Add_Damping_Tracking(bpy.types.Operator):
                         new_bone = obj.data.bones.get(new_name)
                         new_bone.hide = True
 
+            processed_bones.update(bone_chain)
+
             # 列表长度
             list_len = len(bone_chain)
 
@@ -165,57 +172,8 @@ class Remove_Damping_Tracking(bpy.types.Operator):
             # 获取活动骨骼
             active_bone = obj.data.bones.get(bone.name)
 
-            current_mode = bpy.context.object.mode
-
-            # 获取MMR属性
-            mmr = obj.mmr
-
-            def get_bone_chain():
-
-                if not obj or obj.type != 'ARMATURE':
-                    return []
-
-                if not active_bone:
-                    return []
-
-                bpy.ops.object.mode_set(mode='EDIT')
-
-                try:
-                    edit_bones = obj.data.edit_bones
-                    bone_chain = []
-                    current_bone = active_bone
-
-                    while current_bone:  # 继续遍历直到没有下一个骨骼
-                        # 添加当前骨骼到链
-                        bone_chain.append(current_bone.name)
-
-                        # 在编辑模式中获取当前骨骼对象
-                        edit_bone = edit_bones[current_bone.name]
-                        tail_pos = (round(edit_bone.tail[0], 4),
-                                    round(edit_bone.tail[1], 4),
-                                    round(edit_bone.tail[2], 4))
-
-                        # 查找直接连接的下一个骨骼
-                        next_bone = None
-                        for child in current_bone.children:
-                            child_edit = edit_bones[child.name]
-                            head_pos = (round(child_edit.head[0], 4),
-                                        round(child_edit.head[1], 4),
-                                        round(child_edit.head[2], 4))
-
-                            if head_pos == tail_pos:
-                                next_bone = child
-                                break  # 找到第一个连接的子骨骼
-
-                        current_bone = next_bone  # 移动到下一个骨骼或结束循环
-
-                    return bone_chain
-
-                finally:
-                    # 恢复原始模式
-                    bpy.ops.object.mode_set(mode=current_mode)
-
-            bone_chain = get_bone_chain()
+            # 从静止姿态拓扑索引获取骨骼链，不切换编辑模式
+            bone_chain = get_bone_chain(obj, active_bone.name) if active_bone else []
 
             # 删除阻尼追踪约束
             for bone_name in bone_chain:
@@ -401,7 +359,7 @@ class Assign_Rigidbody(bpy.types.Operator):
         armature = None
 
         # 处理过的刚体对
-        Processed_Rigidbody = []
+        Processed_Rigidbody = set()
 
         rigidbody_bone_names = []
 
@@ -444,7 +402,7 @@ class Assign_Rigidbody(bpy.types.Operator):
                     constraint.disable_collisions = True
                     obj1 = constraint.object1
                     obj2 = constraint.object2
-                    Processed_Rigidbody.append([obj1,obj2])
+                    Processed_Rigidbody.add(frozenset((obj1, obj2)))
                     joints_objects.append(joint)
 
         # 预处理"rigidbodies"
@@ -461,73 +419,15 @@ class Assign_Rigidbody(bpy.types.Operator):
                     if constraint:
                         obj.constraints.remove(constraint)
 
-        # 新建空物体
-        empty = bpy.data.objects.new(f"empty", None)
-        # 将空物体链接到场景
-        temp_object.objects.link(empty)
+        # 新建带刚体约束的空物体模板
+        empty = create_constraint_template(context, temp_object, "empty")
         # 空物体父物体设置为"temporary"
         empty.parent = temp_collection
 
         empty.hide_set(True) # 隐藏空物体
 
-        # 创建空物体的刚体约束
-        bpy.context.view_layer.objects.active = empty
-        bpy.ops.rigidbody.constraint_add()
-
         idxs = 0
 
-        # 按骨骼层级关系排序
-        def sort_bone_chain_by_hierarchy(armature, bone_names):
-            bones = armature.data.bones
-
-            # 找到根骨骼（没有父骨骼或父骨骼不在列表中的）
-            root_bones = []
-            for bone_name in bone_names:
-                bone = bones.get(bone_name)
-                if bone and (not bone.parent or bone.parent.name not in bone_names):
-                    root_bones.append(bone_name)
-
-            # 从根骨骼开始递归收集子骨骼
-            sorted_bones = []
-
-            def collect_children(bone_name):
-                if bone_name in bone_names and bone_name not in sorted_bones:
-                    sorted_bones.append(bone_name)
-                    bone = bones[bone_name]
-                    for child in bone.children:
-                        if child.name in bone_names:
-                            collect_children(child.name)
-
-            for root in root_bones:
-                collect_children(root)
-
-            return sorted_bones
-
-        def __getRigidRange(obj: bpy.types.Object) -> float:
-            """计算刚体对象的最大尺寸范围
-            Args:obj: 刚体对象
-            Returns:刚体在X、Y、Z三个轴向上的最大尺寸
-            """
-            x0, y0, z0 = obj.bound_box[0]  # 获取边界框的最小点
-            x1, y1, z1 = obj.bound_box[6]  # 获取边界框的最大点
-            return max(x1 - x0, y1 - y0, z1 - z0)  # 返回三个轴向的最大尺寸
-
-        def add__rigidbody_constraint(rigidbody,other_rigidbody):
-            # 复制空物体
-            empty_copy = empty.copy()
-            empty_copy.name = f"empty_{rigidbody.name}_{other_rigidbody.name}"
-            # 将复制的空物体链接到场景
-            temp_object.objects.link(empty_copy)
-            # 空物体父物体设置为"temporary"
-            empty_copy.parent = temp_collection
-            empty_copy.hide_set(True) # 隐藏空物体
-            # 设置空物体的刚体约束
-            constraint = empty_copy.rigid_body_constraint
-            constraint.disable_collisions = True
-            constraint.object1 = rigidbody
-            constraint.object2 = other_rigidbody
-            constraint.type = 'GENERIC'
-
         def Assemble_skeletal_rigidbody(rigidbody):
 
             print("刚体：",rigidbody.name)
@@ -643,40 +543,50 @@ class Assign_Rigidbody(bpy.types.Operator):
             # 应用相对变换到关节
             joint.matrix_world = pose_bone_global_matrix @ relative_transform
 
-        for rigidbody in rigidbody_objects:
-            if rigidbody.type == 'MESH': # 只处理网格对象
-                # 遍历其他刚体
-                for other_rigidbody in rigidbody_objects:
-                    if other_rigidbody.type == 'MESH': # 只处理网格对象
-                        if other_rigidbody != rigidbody: # 排除自身
-                            # 存储碰撞组遮罩
-                            u = []
-                            for i, bit in enumerate(rigidbody.mmr_bone.collision_group_mask):
-                                if bit:
-                                    u.append([i, bit])
-                            for i in u:
-                                if i[0] == other_rigidbody.mmr_bone.collision_group_index:
-
-                                    # 检查是否已处理过
-                                    if [rigidbody, other_rigidbody] not in Processed_Rigidbody and [other_rigidbody, rigidbody] not in Processed_Rigidbody:
-                                        # 计算两个刚体之间的距离
-                                        distance = (rigidbody.location - other_rigidbody.location).length
-                                        # 如果距离小于阈值，创建非碰撞约束
-                                        if distance < self.non_collision_distance_scale * ((__getRigidRange(rigidbody) + __getRigidRange(other_rigidbody)) * 0.5):
-
-                                            print(rigidbody.name, "与", other_rigidbody.name, "禁用碰撞")
-                                            # 添加刚体约束
-                                            add__rigidbody_constraint(rigidbody,other_rigidbody)
-                                            idxs += 1
-                                            # 处理过的刚体添加到列表
-                                            Processed_Rigidbody.append([rigidbody, other_rigidbody])
+        # 宽相位：按碰撞组与空间网格筛选需要禁用碰撞的刚体对
+        mesh_rigidbodies = [rigidbody for rigidbody in rigidbody_objects if rigidbody.type == 'MESH']
+        rigidbody_index = {rigidbody: i for i, rigidbody in enumerate(mesh_rigidbodies)}
+        excluded = {frozenset(rigidbody_index[obj] for obj in pair)
+                    for pair in Processed_Rigidbody if len(pair) == 2 and all(obj in rigidbody_index for obj in pair)}
+        groups = [rigidbody.mmr_bone.collision_group_index for rigidbody in mesh_rigidbodies]
+        masks = [rigidbody.mmr_bone.collision_group_mask for rigidbody in mesh_rigidbodies]
+        # 装配前的位置，增量更新时用于计算非碰撞刚体对
+        locations = {obj.name: obj.location.copy() for obj in collection.children if obj.type == 'MESH'}
+        pairs = find_non_collision_pairs(
+            [rigidbody.location for rigidbody in mesh_rigidbodies],
+            [get_rigid_range(rigidbody) for rigidbody in mesh_rigidbodies],
+            groups,
+            masks,
+            self.non_collision_distance_scale,
+            excluded,
+        )
+        print(f"{len(mesh_rigidbodies)}个刚体, {len(pairs)}对刚体禁用碰撞")
+
+        # 碰撞集合模式：用碰撞集合表示碰撞组遮罩，只为剩余冲突的刚体对添加约束
+        avoided = None
+        if context.scene.mmr.non_collision_mode == 'COLLECTION':
+            layers = solve_collision_collections(groups, masks)
+            if layers is None:
+                print("碰撞集合数量不足，使用逐对约束")
+            else:
+                report_unmanaged_colliders(self, context, mesh_rigidbodies)
+                apply_collision_collections(mesh_rigidbodies, layers)
+                constraint_pairs = pairs_sharing_collections(pairs, layers)
+                avoided = len(pairs) - len(constraint_pairs)
+                pairs = constraint_pairs
+                print(f"使用{int(layers.any(axis=0).sum())}个碰撞集合, 省去{avoided}个空物体")
+
+        # 批量添加刚体约束
+        idxs += len(allocate_constraint_empties(
+            empty, [(mesh_rigidbodies[a], mesh_rigidbodies[b]) for a, b in pairs],
+            temp_object, parent=temp_collection, name_format="empty_{0}_{1}"))
 
         for rigidbody in rigidbody_objects:
             if rigidbody.mmr_bone.rigidbody_type == '0':
                 # 装配骨骼刚体
                 Assemble_skeletal_rigidbody(rigidbody)
 
-        Processed_Rigidbody = [] # 已处理过的刚体列表
+        Processed_Rigidbody = set() # 已处理过的刚体
 
         for rigidbody in rigidbody_objects:
             if rigidbody.mmr_bone.rigidbody_type == '1':
@@ -687,7 +597,7 @@ class Assign_Rigidbody(bpy.types.Operator):
                         continue
                     Assemble_Physical_Rigidbody(bone, rigidbody, mode = '1')
                     # 处理过的刚体添加到列表
-                    Processed_Rigidbody.append(rigidbody)
+                    Processed_Rigidbody.add(rigidbody)
 
         for rigidbody in rigidbody_objects:
             if rigidbody.mmr_bone.rigidbody_type == '2':
@@ -698,9 +608,9 @@ class Assign_Rigidbody(bpy.types.Operator):
                         continue
                     Assemble_Physical_Rigidbody(bone, rigidbody, mode = '2')
                     # 处理过的刚体添加到列表
-                    Processed_Rigidbody.append(rigidbody)
+                    Processed_Rigidbody.add(rigidbody)
 
-        Processed_Joints = [] # 已处理过的关节列表
+        Processed_Joints = set() # 已处理过的关节
 
         for joint in joints_objects:
             # 检查是否已处理过
@@ -710,7 +620,7 @@ class Assign_Rigidbody(bpy.types.Operator):
                 # 装配物理关节
                 Assemble_Physical_Joint(joint, rigidbody)
                 # 处理过的关节添加到列表
-                Processed_Joints.append(joint)
+                Processed_Joints.add(joint)
 
         bpy.context.scene.frame_set(frame_start)  # 更新场景变化
         bpy.context.view_layer.update()  # 更新视图层
@@ -719,8 +629,17 @@ class Assign_Rigidbody(bpy.types.Operator):
 
         bpy.context.scene.rigidbody_world.enabled = True  # 启用物理模拟
 
+        # 记录快照，供增量更新对比
+        rigid_entries, joint_entries = mmr_physics_snapshot(
+            mmr_rigid_bodies(collection, armature), joints_objects, locations)
+        save_physics_snapshot(root, rigid_entries, joint_entries,
+                              [self.non_collision_distance_scale, context.scene.mmr.non_collision_mode])
+
         print('-' * 20)
-        self.report({'INFO'}, f"共创建{idxs}个空物体刚体约束")
+        if avoided is None:
+            self.report({'INFO'}, f"共创建{idxs}个空物体刚体约束")
+        else:
+            self.report({'INFO'}, f"共创建{idxs}个空物体刚体约束, 碰撞集合省去{avoided}个")
         return {'FINISHED'}
 
 # 解除物理
@@ -941,6 +860,9 @@ class Remove_physics(bpy.types.Operator):
                         # 处理过的刚体添加到列表
                         Processed_Rigidbody.append(joint)
 
+        # 恢复碰撞集合模式修改的碰撞集合
+        restore_collision_collections([child for child in collection.children if child.type == 'MESH'])
+
         # 名称包含'mmr_physics'的骨骼约束
         for bone in armature.pose.bones:
             constraints = bone.constraints
@@ -956,6 +878,183 @@ class Remove_physics(bpy.types.Operator):
         # 恢复刚体世界的原始启用状态
         setRigidBodyWorldEnabled(rigidbody_world_enabled)
 
+        clear_physics_snapshot(root)
+
+        return {'FINISHED'}
+
+# 增量更新物理
+class Update_physics(bpy.types.Operator):
+    '''Update_physics'''
+    bl_idname = "mmr.update_physics"
+    bl_label = "Update physics"
+    bl_description = "Only update what changed since the last build, rebuild when bones, types or transforms changed"
+    bl_options = {'REGISTER', 'UNDO'}  # 启用撤销功能
+
+    # 非碰撞距离缩放系数属性
+    non_collision_distance_scale: bpy.props.FloatProperty(
+        name="Non-Collision Distance Scale",  # 属性显示名称
+        description="The distance scale for creating extra non-collision constraints while building physics",  # 属性描述
+        min=0,  # 最小值
+        soft_max=10,  # 软最大值
+        default=1.5,  # 默认值
+    )
+
+    # 碰撞边距属性
+    collision_margin: bpy.props.FloatProperty(
+        name="Collision Margin",  # 属性显示名称
+        description="The collision margin between rigid bodies. If 0, the default value for each shape is adopted.",  # 属性描述
+        unit="LENGTH",  # 单位类型
+        min=0,  # 最小值
+        soft_max=10,  # 软最大值
+        default=1e-06,  # 默认值
+    )
+
+    # 是否在播放动画
+    @classmethod
+    def poll(cls, context):
+        # 如果正在播放动画，则禁止操作
+        if context.screen and context.screen.is_animation_playing:
+            return False
+        return True
+
+    def execute(self, context):
+
+        active_obj = bpy.context.active_object
+
+        # 只能循环50次, 防止无限循环
+        i = 50
+
+        # 循环, 直到找到MMD根对象
+        while active_obj and active_obj.mmr_bone.mmr_type != 'ROOT':
+            # 循环次数减一
+            i -= 1
+            if i <= 0:
+                self.report({'ERROR'}, "未找到MMD根对象")
+                return {'CANCELLED'}
+            active_obj = active_obj.parent
+
+        if active_obj is None:
+            self.report({'ERROR'}, "未找到MMD根对象")
+            return {'CANCELLED'}
+
+        # 获取MMD根对象
+        root = active_obj
+
+        if not root.mmr.physics_bool:
+            self.report({'INFO'}, "未开启物理")
+            return {'CANCELLED'}
+
+        collection_name = F"{root.name}_mmr_temp_object"
+        if collection_name not in bpy.data.collections:
+            self.report({'ERROR'}, f"未找到{collection_name}集合")
+            return {'CANCELLED'}
+        temp_object = bpy.data.collections[collection_name]
+
+        collection = None
+        temp_collection = None
+        joints_collection = None
+        armature = None
+        for child in root.children:
+            if "rigidbodies" in child.name:
+                collection = child
+            if "temporary" in child.name:
+                temp_collection = child
+            if "joints" in child.name:
+                joints_collection = child
+            if child.type == 'ARMATURE':
+                armature = child
+
+        if not collection or not joints_collection or not armature:
+            self.report({'WARNING'}, "未找到'rigidbodies'或'joints'或'MMD Model_arm'对象")
+            return {'CANCELLED'}
+
+        mode = context.scene.mmr.non_collision_mode
+        settings = [self.non_collision_distance_scale, mode]
+        rigidbodies = mmr_rigid_bodies(collection, armature)
+        joints = [joint for joint in joints_collection.children
+                  if joint.type == 'EMPTY' and joint.rigid_body_constraint]
+
+        # 在缓存开始帧对比刚体变换
+        context_frame = goto_cache_start(context.scene)
+
+        snapshot = load_physics_snapshot(root)
+        locations = {}
+        if snapshot:
+            locations = {name: entry['location'] for name, entry in snapshot['rigid_bodies'].items()
+                         if 'location' in entry}
+        rigid_entries, joint_entries = mmr_physics_snapshot(rigidbodies, joints, locations)
+        diff = diff_physics_snapshot(snapshot, rigid_entries, joint_entries, settings)
+
+        if needs_full_rebuild(diff):
+            # 刚体或关节增删、骨骼/类型/变换改变时完整重建
+            if diff is None:
+                print("没有物理快照，完整重建")
+            else:
+                print(f"完整重建: 新增{sorted(diff['added'])}, 删除{sorted(diff['removed'])}, 结构改变{sorted(diff['structure'])}")
+            bpy.ops.mmr.remove_physics()
+            bpy.ops.mmr.assign_rigidbody(non_collision_distance_scale=self.non_collision_distance_scale,
+                                         collision_margin=self.collision_margin)
+            context.scene.frame_set(context_frame)
+            self.report({'INFO'}, "刚体结构已改变，已完整重建物理")
+            return {'FINISHED'}
+
+        # 碰撞边距直接生效
+        for obj in rigidbodies:
+            if obj.rigid_body:
+                obj.rigid_body.use_margin = True
+                obj.rigid_body.collision_margin = self.collision_margin
+
+        created = removed = 0
+        if diff['collision'] or diff['settings']:
+            # 只重新计算非碰撞刚体对，删除失效的约束空物体并补充新增的
+            mesh_rigidbodies = [obj for obj in rigidbodies if obj.mmr_bone.panel_bool and obj.rigid_body]
+            rigidbody_index = {rigidbody: n for n, rigidbody in enumerate(mesh_rigidbodies)}
+            excluded = set()
+            for joint in joints:
+                constraint = joint.rigid_body_constraint
+                if constraint.object1 in rigidbody_index and constraint.object2 in rigidbody_index:
+                    excluded.add(frozenset((rigidbody_index[constraint.object1], rigidbody_index[constraint.object2])))
+            groups = [rigidbody.mmr_bone.collision_group_index for rigidbody in mesh_rigidbodies]
+            masks = [rigidbody.mmr_bone.collision_group_mask for rigidbody in mesh_rigidbodies]
+            pairs = find_non_collision_pairs(
+                [locations.get(rigidbody.name, rigidbody.location) for rigidbody in mesh_rigidbodies],
+                [get_rigid_range(rigidbody) for rigidbody in mesh_rigidbodies],
+                groups,
+                masks,
+                self.non_collision_distance_scale,
+                excluded,
+            )
+
+            layers = solve_collision_collections(groups, masks) if mode == 'COLLECTION' else None
+            if layers is None:
+                restore_collision_collections(mesh_rigidbodies)
+            else:
+                report_unmanaged_colliders(self, context, mesh_rigidbodies)
+                apply_collision_collections(mesh_rigidbodies, layers)
+                pairs = pairs_sharing_collections(pairs, layers)
+
+            existing = [obj for obj in temp_object.objects if obj.rigid_body_constraint]
+            stale, new_pairs = diff_constraint_empties(
+                existing, [(mesh_rigidbodies[a], mesh_rigidbodies[b]) for a, b in pairs])
+            for obj in stale:
+                bpy.data.objects.remove(obj, do_unlink=True)
+            removed = len(stale)
+
+            if new_pairs:
+                empty = find_constraint_template(existing)
+                if empty is None:
+                    empty = create_constraint_template(context, temp_object, "empty")
+                    empty.parent = temp_collection
+                    empty.hide_set(True)
+                created = len(allocate_constraint_empties(
+                    empty, new_pairs, temp_object, parent=temp_collection, name_format="empty_{0}_{1}"))
+
+        rigid_entries, joint_entries = mmr_physics_snapshot(rigidbodies, joints, locations)
+        save_physics_snapshot(root, rigid_entries, joint_entries, settings)
+        context.scene.frame_set(context_frame)
+
+        self.report({'INFO'}, f"增量更新: {len(diff['params'])}个参数改变已直接生效, "
+                              f"碰撞改变{len(diff['collision'])}个, 新增{created}个/删除{removed}个空物体刚体约束")
         return {'FINISHED'}
 
 # 显示刚体
@@ -1071,6 +1170,37 @@ class Update_World(bpy.types.Operator):
         point_cache.frame_end = scene.frame_end
         return {'FINISHED'}
 
+# 物理模拟速度测试
+class Benchmark_Physics(bpy.types.Operator):
+    bl_idname = "mmr.benchmark_physics"
+    bl_label = "Benchmark Physics"
+    bl_options = {'REGISTER'}
+
+    # 测试帧数
+    frame_count: bpy.props.IntProperty(
+        name="Frames",
+        default=120,
+        min=1,
+    )
+
+    def execute(self, context):
+        rigidbody_world = context.scene.rigidbody_world
+        if rigidbody_world is None or not rigidbody_world.enabled:
+            self.report({'ERROR'}, "未启用刚体世界")
+            return {'CANCELLED'}
+        if rigidbody_world.point_cache.is_baked:
+            self.report({'ERROR'}, "请先删除物理烘焙")
+            return {'CANCELLED'}
+
+        frames, cost = benchmark_simulation(context.scene, self.frame_count)
+        if frames <= 0:
+            self.report({'ERROR'}, "缓存帧范围为空")
+            return {'CANCELLED'}
+        fps = frames / max(cost, 1e-6)
+        print(f"物理模拟: {frames}帧, 耗时{cost:.3f}s, {fps:.1f}帧/秒")
+        self.report({'INFO'}, f"物理模拟: {frames}帧, {fps:.1f}帧/秒")
+        return {'FINISHED'}
+
 # 按类型选择
 class Select_By_Type(bpy.types.Operator):
     bl_idname = "mmr.select_by_type"
@@ -8,6 +8,41 @@ import bpy
 import numpy as np
 
 from addons.MikuMikuRig import has_keyframes_for_property
+from .bone_align import plan_bone_alignment, apply_bone_alignment, align_edit_bone
+from .constraint_binding import plan_constraint_bindings, apply_constraint_plan
+from .rigify_cache import generate_rigify_rig
+from .template_library import append_template_object
+
+# 已解析的控制器预设 {文件路径: (修改时间, 预设)}
+_rig_preset_cache = {}
+
+
+def load_rig_preset(path):
+    """读取控制器预设JSON，文件未修改时复用已解析的结果
+
+    Args:
+        path: 预设文件路径
+
+    Returns:
+        {MMD骨骼名称: 元骨骼名称}
+    """
+    mtime = os.path.getmtime(path)
+    cached = _rig_preset_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path) as f:
+        config = json.load(f)
+    _rig_preset_cache[path] = (mtime, config)
+    return config
+
+
+def get_rig_preset_path(mmr):
+    """当前选择的控制器预设文件路径，使用预设编辑器时返回None"""
+    if mmr.presets == 'mmr_preset_editor':
+        return None
+    if mmr.Import_presets:
+        return mmr.json_filepath
+    return os.path.join(os.path.dirname(__file__), 'presets', mmr.presets + '.json')
 
 
 class polartargetOperator(bpy.types.Operator):
@@ -205,36 +240,14 @@ class mmrrigOperator(bpy.types.Operator):
 
         mmr = context.object.mmr
 
-        # 获取当前运行的Py文件的路径
-        current_file_path = __file__
-        # 获取当前Py文件所在的文件夹路径
-        new_path = os.path.dirname(current_file_path)
-        # 将当前文件夹路径和文件名组合成完整的文件路径
-        blend_file_path = os.path.join(new_path, 'MMR_Rig.blend')
-
-        # 设置追加参数
-        filepath = os.path.join(blend_file_path, "Object", "MMR_Rig_relative")
-        directory = os.path.join(blend_file_path, "Object")
-        filename = "MMR_Rig_relative"
-
-        # 执行追加操作
+        # 从模板库复制元骨骼
         if bpy.data.objects.get('MMR_Rig_relative') is None:
-            bpy.ops.wm.append(
-                filepath=filepath,
-                directory=directory,
-                filename=filename,
-            )
-
-        if mmr.presets != 'mmr_preset_editor':
-            file = mmr.presets + '.json'
-            new_file_path = os.path.join(new_path, 'presets', file)
-
-            if mmr.Import_presets:
-                new_file_path = mmr.json_filepath
+            append_template_object(context, 'MMR_Rig.blend', 'MMR_Rig_relative')
 
-            # 读取json文件
-            with open(new_file_path) as f:
-                config = json.load(f)
+        preset_path = get_rig_preset_path(mmr)
+        if preset_path:
+            # 读取json文件（批量生成时复用已解析的预设）
+            config = load_rig_preset(preset_path)
         else:
             config = {}
             for item in context.scene.mmr_json:
@@ -313,113 +326,6 @@ class mmrrigOperator(bpy.types.Operator):
 
             return euler_rotation
 
-        # 对齐骨骼roll
-        def align_bones_roll(A, D, B, C):
-            # A骨骼(D骨架),B骨骼(C骨架)
-            # 获取 D 骨架和 C 骨架对象
-            D_armature_obj = bpy.data.objects.get(D)
-            C_armature_obj = bpy.data.objects.get(C)
-
-            if not D_armature_obj or not C_armature_obj:
-                print("未找到 D 骨架或 C 骨架对象，请检查名称。")
-                return
-
-            if D_armature_obj.type != 'ARMATURE' or C_armature_obj.type != 'ARMATURE':
-                print("D 或 C 对象不是骨架类型，请检查。")
-                return
-
-            # 进入 D 骨架的编辑模式
-            bpy.context.view_layer.objects.active = D_armature_obj
-            bpy.ops.object.mode_set(mode='EDIT')
-            D_edit_bones = D_armature_obj.data.edit_bones
-
-            # 进入 C 骨架的编辑模式
-            bpy.context.view_layer.objects.active = C_armature_obj
-            bpy.ops.object.mode_set(mode='EDIT')
-            C_edit_bones = C_armature_obj.data.edit_bones
-
-            # 获取 A 骨骼和 B 骨骼
-            A_bone = D_edit_bones.get(A)
-            B_bone = C_edit_bones.get(B)
-
-            if not A_bone or not B_bone:
-                print(f"未找到 {A} 骨骼或 {B} 骨骼，请检查名称。")
-                bpy.ops.object.mode_set(mode='OBJECT')
-                return
-
-            B_bone.roll = A_bone.roll
-
-        # 对齐骨骼
-        def align_bones(A, D_armature_obj, B, C_armature_obj, Compare_Boolean=False, count = False, length = 0.0):
-            # A骨骼(D骨架),B骨骼(C骨架)
-
-            if not D_armature_obj or not C_armature_obj:
-                print("未找到 D 骨架或 C 骨架对象，请检查名称。")
-                return
-
-            if D_armature_obj.type != 'ARMATURE' or C_armature_obj.type != 'ARMATURE':
-                print("D 或 C 对象不是骨架类型，请检查。")
-                return
-
-            # 进入 D 骨架的编辑模式
-            bpy.context.view_layer.objects.active = D_armature_obj
-            bpy.ops.object.mode_set(mode='EDIT')
-            D_edit_bones = D_armature_obj.data.edit_bones
-
-            # 进入 C 骨架的编辑模式
-            bpy.context.view_layer.objects.active = C_armature_obj
-            bpy.ops.object.mode_set(mode='EDIT')
-            C_edit_bones = C_armature_obj.data.edit_bones
-
-            # 获取 A 骨骼和 B 骨骼
-            A_bone = D_edit_bones.get(A)
-            B_bone = C_edit_bones.get(B)
-
-            if not A_bone or not B_bone:
-                print(f"未找到 {A} 骨骼或 {B} 骨骼，请检查名称。")
-                bpy.ops.object.mode_set(mode='OBJECT')
-                return False
-            else:
-                if count:
-                    return True
-
-            # 转换 B 骨骼的头和尾坐标到世界空间
-            world_matrix_C = C_armature_obj.matrix_world
-            world_head_B = world_matrix_C @ B_bone.head
-            world_tail_B = world_matrix_C @ B_bone.tail
-
-            # 转换世界空间坐标到 D 骨架的局部空间
-            world_matrix_D = D_armature_obj.matrix_world
-            local_matrix_D = world_matrix_D.inverted()
-            local_head_B = local_matrix_D @ world_head_B
-            local_tail_B = local_matrix_D @ world_tail_B
-
-            if Compare_Boolean:
-                if local_head_B[2] < local_tail_B[2]:
-                    return False
-                else:
-                    return True
-
-            # 设置 A 骨骼的头和尾
-            if A == 'spine':
-                if local_head_B[2] < local_tail_B[2]:
-                    A_bone.head = local_head_B
-                    A_bone.tail = local_tail_B
-                else:
-                    A_bone.head = local_tail_B
-                    A_bone.tail = local_head_B
-            else:
-                A_bone.head = local_head_B
-                A_bone.tail = local_tail_B
-
-            if length != 0.0:
-                A_bone.length = A_bone.length * length
-
-            # 退出编辑模式
-            bpy.ops.object.mode_set(mode='POSE')
-
-            return True
-
         def move_bone_a_to_b(d_armature_name, c_armature_name, bone_a_name, bone_b_name, A_bone_Z_location = False):
 
             # 获取 D 骨架和 C 骨架对象
@@ -429,8 +335,9 @@ class mmrrigOperator(bpy.types.Operator):
             if d_armature_obj and c_armature_obj:
                 # 确保 D 骨架和 C 骨架处于姿态模式
                 for obj in [d_armature_obj, c_armature_obj]:
-                    bpy.context.view_layer.objects.active = obj
-                    bpy.ops.object.mode_set(mode='POSE')
+                    if obj.mode != 'POSE':
+                        bpy.context.view_layer.objects.active = obj
+                        bpy.ops.object.mode_set(mode='POSE')
 
                 # 获取 A 骨骼和 B 骨骼
                 bone_A = d_armature_obj.pose.bones.get(bone_a_name)
@@ -525,7 +432,8 @@ class mmrrigOperator(bpy.types.Operator):
 
         def rotate_bone_x(armature_object, bone_name, angle_deg=10, armature_apply=True):
 
-            bpy.ops.object.mode_set(mode='POSE')
+            if armature_object.mode != 'POSE':
+                bpy.ops.object.mode_set(mode='POSE')
 
             # 获取姿态骨骼
             pose_bone = armature_object.pose.bones.get(bone_name)
@@ -571,8 +479,9 @@ class mmrrigOperator(bpy.types.Operator):
 
             arm = bpy.data.objects.get(arm_obj_name)
 
-            bpy.context.view_layer.objects.active = arm
-            bpy.ops.object.mode_set(mode='EDIT')  # 切到编辑模式
+            if arm.mode != 'EDIT':
+                bpy.context.view_layer.objects.active = arm
+                bpy.ops.object.mode_set(mode='EDIT')  # 切到编辑模式
 
             # 确保骨骼存在
             if bone_name not in arm.data.edit_bones or bone_name2 not in arm.data.edit_bones:
@@ -626,7 +535,8 @@ class mmrrigOperator(bpy.types.Operator):
 
         def Calculate_intersection_angle(Arm, a_bone, b_bone):
 
-            bpy.ops.object.mode_set(mode='EDIT')
+            if Arm.mode != 'EDIT':
+                bpy.ops.object.mode_set(mode='EDIT')
 
             A_bone = Arm.data.edit_bones.get(a_bone)
             B_bone = Arm.data.edit_bones.get(b_bone)
@@ -673,8 +583,9 @@ class mmrrigOperator(bpy.types.Operator):
         # 获取某个骨骼的世界空间z轴坐标
         def get_bone_world_z(bone_name, armature_obj):
             # 切换到姿势模式
-            bpy.context.view_layer.objects.active = armature_obj
-            bpy.ops.object.mode_set(mode='POSE')
+            if armature_obj.mode != 'POSE':
+                bpy.context.view_layer.objects.active = armature_obj
+                bpy.ops.object.mode_set(mode='POSE')
 
             # 获取骨骼
             pose_bone = armature_obj.pose.bones.get(bone_name)
@@ -687,10 +598,11 @@ class mmrrigOperator(bpy.types.Operator):
             return z_coordinate
 
         # 设置骨骼的世界空间z轴坐标(在姿势模式)
-        def set_bone_world_z(bone_name, armature_obj, z_value):
+        def set_bone_world_z(bone_name, armature_obj, z_value, armature_apply=True):
             # 切换到姿势模式
-            bpy.context.view_layer.objects.active = armature_obj
-            bpy.ops.object.mode_set(mode='POSE')
+            if armature_obj.mode != 'POSE':
+                bpy.context.view_layer.objects.active = armature_obj
+                bpy.ops.object.mode_set(mode='POSE')
 
             # 获取骨骼
             pose_bone = armature_obj.pose.bones.get(bone_name)
@@ -702,7 +614,8 @@ class mmrrigOperator(bpy.types.Operator):
             pose_bone.matrix.translation.z = z_value
 
             # 应用变换
-            bpy.ops.pose.armature_apply(selected=False)
+            if armature_apply:
+                bpy.ops.pose.armature_apply(selected=False)
 
         # 版本比较
         def compare_version(version1, version2):
@@ -771,28 +684,25 @@ class mmrrigOperator(bpy.types.Operator):
 
             rig_apply(RIG)
 
+            # 一次读取MMD骨架的静止姿态，批量计算元骨骼对齐后的头尾坐标
+            alignment_plan, arm_number = plan_bone_alignment(
+                [(key, value) for key, value in config.items()], mmd_arm, RIG)
+
             # 遍历字典的键值对并打印
             for key, value in config.items():
                 print(f"键名: {key}, 值: {value}")
-                # 调用函数
-                return_value = align_bones(value, RIG, key, mmd_arm)
-                if return_value:
-                    arm_number += 1
                 # 手指
                 if check_keywords(value, ["thumb", "index", "middle", "ring", "pinky"]):
                     finger_bone.append(value)
 
-            # 更新场景
-            bpy.context.view_layer.update()
-            rig_apply(RIG)
+            # 以下对齐在一次编辑会话中完成
+            bpy.context.view_layer.objects.active = RIG
+            bpy.ops.object.mode_set(mode='EDIT')  # 切到编辑模式
+            apply_bone_alignment(RIG.data.edit_bones, alignment_plan)
 
             # 对齐尾坐标
             calculate_tail_coordinates('spine.004', 'spine.003', RIG.name, scale=False)
 
-            # 对齐脚XY平面
-            move_bone_a_to_b(RIG.name, RIG.name, "heel.02.L", 'foot.L', A_bone_Z_location=True)
-            move_bone_a_to_b(RIG.name, RIG.name, "heel.02.R", 'foot.R', A_bone_Z_location=True)
-
             # 手掌修正
             if not mmd_arm.mmr.Disable_hand_fix:
                 for key, value in config.items():
@@ -814,11 +724,16 @@ class mmrrigOperator(bpy.types.Operator):
             }
 
             for key, value in palm_aligs.items():
-                align_bones(key, RIG, value, RIG, length=2)
+                align_edit_bone(RIG.data.edit_bones, key, value, length=2)
                 finger_bone.append(key)
 
-                bpy.ops.object.mode_set(mode='POSE')  # 切到pose模式
-                bpy.ops.pose.armature_apply(selected=False)  # 应用
+            bpy.ops.object.mode_set(mode='POSE')  # 切到pose模式
+
+            # 对齐脚XY平面
+            move_bone_a_to_b(RIG.name, RIG.name, "heel.02.L", 'foot.L', A_bone_Z_location=True)
+            move_bone_a_to_b(RIG.name, RIG.name, "heel.02.R", 'foot.R', A_bone_Z_location=True)
+
+            bpy.ops.pose.armature_apply(selected=False)  # 应用
 
             finger_bone_L = []
             finger_bone_R = []
@@ -1038,6 +953,17 @@ class mmrrigOperator(bpy.types.Operator):
         bpy.context.view_layer.objects.active = RIG
         RIG.select_set(True)
 
+        # 弯曲前的夹角, 仍在编辑模式中一次计算
+        bend_angles = {}
+        if mmr.Bend_the_bones:
+            for a_bone, b_bone in (('upper_arm.L', 'forearm.L'), ('upper_arm.R', 'forearm.R')):
+                bend_angles[a_bone] = Calculate_intersection_angle(RIG, a_bone, b_bone)
+        if mmr.Bend_the_leg_bones:
+            for a_bone, b_bone in (('thigh.L', 'shin.L'), ('thigh.R', 'shin.R')):
+                bend_angles[a_bone] = Calculate_intersection_angle(RIG, a_bone, b_bone)
+
+        bpy.ops.object.mode_set(mode='POSE')
+
         foot_L_world_z = get_bone_world_z('foot.L',RIG)
         foot_R_world_z = get_bone_world_z('foot.R',RIG)
 
@@ -1052,30 +978,38 @@ class mmrrigOperator(bpy.types.Operator):
         v = mmr.Bend_angle_leg
         v1 = mmr.Bend_angle_arm
 
+        # 姿态的修改最后一次性应用, 子骨骼的旋转与逐个应用的结果相同
+        pose_changed = False
+
         # 弯曲骨骼
         if mmr.Bend_the_bones:
-            if Calculate_intersection_angle(RIG, 'upper_arm.L', 'forearm.L') > 165:
-                rotate_bone_x(RIG,'upper_arm.L',angle_deg=-v1)
-                rotate_bone_x(RIG,'forearm.L',angle_deg=v1*2)
+            if bend_angles['upper_arm.L'] > 165:
+                rotate_bone_x(RIG,'upper_arm.L',angle_deg=-v1, armature_apply=False)
+                rotate_bone_x(RIG,'forearm.L',angle_deg=v1*2, armature_apply=False)
+                pose_changed = True
 
-            if Calculate_intersection_angle(RIG, 'upper_arm.R', 'forearm.R') > 165:
-                rotate_bone_x(RIG,'upper_arm.R',angle_deg=-v1)
-                rotate_bone_x(RIG,'forearm.R',angle_deg=v1*2)
+            if bend_angles['upper_arm.R'] > 165:
+                rotate_bone_x(RIG,'upper_arm.R',angle_deg=-v1, armature_apply=False)
+                rotate_bone_x(RIG,'forearm.R',angle_deg=v1*2, armature_apply=False)
+                pose_changed = True
 
         # 弯曲腿部骨骼
         if mmr.Bend_the_leg_bones:
 
             print('heel_world_z: ', heel_world_z)
 
-            if Calculate_intersection_angle(RIG, 'thigh.L', 'shin.L') > 165:
-                rotate_bone_x(RIG, 'thigh.L',angle_deg=-v)
-                rotate_bone_x(RIG, 'shin.L',angle_deg=v*2)
-                rotate_bone_x(RIG, 'foot.L',angle_deg=-v)
+            if bend_angles['thigh.L'] > 165:
+                rotate_bone_x(RIG, 'thigh.L',angle_deg=-v, armature_apply=False)
+                rotate_bone_x(RIG, 'shin.L',angle_deg=v*2, armature_apply=False)
+                rotate_bone_x(RIG, 'foot.L',angle_deg=-v, armature_apply=False)
+
+            if bend_angles['thigh.R'] > 165:
+                rotate_bone_x(RIG, 'thigh.R',angle_deg=-v, armature_apply=False)
+                rotate_bone_x(RIG, 'shin.R',angle_deg=v*2, armature_apply=False)
+                rotate_bone_x(RIG, 'foot.R',angle_deg=-v, armature_apply=False)
 
-            if Calculate_intersection_angle(RIG, 'thigh.R', 'shin.R') > 165:
-                rotate_bone_x(RIG, 'thigh.R',angle_deg=-v)
-                rotate_bone_x(RIG, 'shin.R',angle_deg=v*2)
-                rotate_bone_x(RIG, 'foot.R',angle_deg=-v)
+            # 更新姿态矩阵
+            bpy.context.view_layer.update()
 
             foot_L_world_z_1 = get_bone_world_z('foot.L', RIG)
             foot_R_world_z_1 = get_bone_world_z('foot.R', RIG)
@@ -1093,10 +1027,15 @@ class mmrrigOperator(bpy.types.Operator):
             spine_world_z_1 = spine_world_z - foot_world_z_difference
             print('spine_world_z 坐标: ', spine_world_z_1)
 
-            set_bone_world_z('spine',RIG,spine_world_z_1)
+            set_bone_world_z('spine',RIG,spine_world_z_1, armature_apply=False)
 
             for bone in heel_bones:
-                set_bone_world_z(bone,RIG,heel_world_z)
+                bpy.context.view_layer.update()
+                set_bone_world_z(bone,RIG,heel_world_z, armature_apply=False)
+            pose_changed = True
+
+        if pose_changed:
+            bpy.ops.pose.armature_apply(selected=False)
 
         u = "WGTS_" + RIG.name
         if u in bpy.data.collections:
@@ -1104,10 +1043,8 @@ class mmrrigOperator(bpy.types.Operator):
 
         RIG.name = 'MMR-' + mmd_arm.name
 
-        # 生成
-        bpy.ops.pose.rigify_generate()
-
-        rigify = bpy.context.active_object
+        # 生成（静止姿态与Rigify参数未改变时复用之前生成的骨架）
+        rigify = generate_rigify_rig(context, RIG)
         rigify.name = 'RIG-' + mmd_arm.name
 
         rigify.matrix_world = RIG.matrix_world # 吸附位置
@@ -1313,116 +1250,22 @@ class mmrrigOperator(bpy.types.Operator):
                 t_bone = data_bones.get('ORG-' + k + '_parent')
                 rigify.data.collections_all['ORG'].assign(t_bone)
 
-        # 捩骨约束
+        # 捩骨父级
+        bpy.ops.object.mode_set(mode='EDIT')
+        edit_bones = rigify.data.edit_bones
         for key, value in Twist_bones[1].items():
-            value1 = 'ORG-' + value + '_parent'
-            # 进入编辑模式
-            bpy.ops.object.mode_set(mode='EDIT')
-            edit_bones = rigify.data.edit_bones
-
             bone1 = edit_bones.get(key)
-            bone2 = edit_bones.get(value1)
-
-            if key in edit_bones and value1 in edit_bones:
+            bone2 = edit_bones.get('ORG-' + value + '_parent')
+            if bone1 and bone2:
                 bone2.parent = bone1
 
-            bpy.context.view_layer.objects.active = mmd_arm
-            mmd_arm.select_set(True)
-            bpy.ops.object.mode_set(mode='POSE')
-
-            bone = mmd_arm.pose.bones.get(value)  # 获取骨骼
-
-            # 检查骨骼是否存在
-            if bone is None:
-                print(f"警告: 未找到名为 {value} 的骨骼，跳过约束操作")
-                continue  # 跳过后续约束
-
-            # 删除所有约束
-            for constraint in list(bone.constraints):
-                if constraint.name == 'MMR_复制旋转':
-                    bone.constraints.remove(constraint)
-
-            # 添加复制旋转约束
-            constraint = bone.constraints.new(type='COPY_ROTATION')  # 复制旋转
-            constraint.name = 'MMR_复制旋转'
-            constraint.target = rigify
-            constraint.subtarget = value1
-
-        constraint_names = ['MMR_复制旋转', 'MMR_复制位置', 'MMR_复制缩放']
-
-        # 添加约束
-        for key, value in config.items():
-
-            value1 = 'ORG-' + value + '_parent'
-
-            print(f"键名: {key}, 值: {value1}")
-
-            bpy.context.view_layer.objects.active = mmd_arm
-            mmd_arm.select_set(True)
-            bpy.ops.object.mode_set(mode='POSE')
+        bpy.context.view_layer.objects.active = mmd_arm
+        mmd_arm.select_set(True)
+        bpy.ops.object.mode_set(mode='POSE')
 
-            bone = mmd_arm.pose.bones.get(key)  # 获取骨骼
-
-            # 检查骨骼是否存在
-            if bone is None:
-                print(f"警告: 未找到名为 {key} 的骨骼，跳过约束操作")
-                continue  # 跳过后续约束
-
-            # 删除所有约束
-            for constraint in list(bone.constraints):
-                if constraint.name in constraint_names:
-                    bone.constraints.remove(constraint)
-
-            # 添加复制旋转约束
-            constraint = bone.constraints.new(type='COPY_ROTATION')  # 复制旋转
-            constraint.name = constraint_names[0]
-            constraint.target = rigify
-            constraint.subtarget = value1
-            if not (ct_op.get(value))[0]:
-                constraint.influence = 0
-
-            # 添加复制位置约束
-            constraint = bone.constraints.new(type='COPY_TRANSFORMS')  # 复制位置
-            constraint.name = constraint_names[1]
-            constraint.target = rigify
-            constraint.subtarget = value1
-            if not (ct_op.get(value))[1]:
-                constraint.influence = 0
-
-            # 添加复制缩放约束
-            constraint = bone.constraints.new(type='COPY_SCALE')  # 复制缩放
-            constraint.name = constraint_names[2]
-            constraint.target = rigify
-            constraint.subtarget = value1
-            if not (ct_op.get(value))[2]:
-                constraint.influence = 0
-
-        subtarget = ['つま先ＩＫ.L', 'つま先ＩＫ.R', '足ＩＫ.R', '足ＩＫ.L']
-
-        mmd_arms = True # 是否是mmd的armature
-
-        # 遍历骨骼
-        for bone in mmd_arm.pose.bones:
-            # 遍历骨骼约束
-            for constraint in bone.constraints:
-                # 类型是否为IK
-                if constraint.type == 'IK':
-                    for s in subtarget:
-                        if constraint.subtarget == s:
-                            # 设置影响值为0
-                            constraint.influence = 0.0
-                            print(f"已将骨骼 '{bone.name}' 的IK约束影响值设置为0")
-                            mmd_arms = False
-        if mmd_arms:
-            # 遍历骨骼
-            for bone in mmd_arm.pose.bones:
-                # 遍历骨骼约束
-                for constraint in bone.constraints:
-                    # 类型是否为IK
-                    if constraint.type == 'IK':
-                        # 设置影响值为0
-                        constraint.influence = 0.0
-                        print(f"已将骨骼 '{bone.name}' 的IK约束影响值设置为0")
+        # 添加约束（先生成绑定计划，再一次性写入有差异的约束）
+        binding_plan = plan_constraint_bindings(mmd_arm, rigify, config, Twist_bones[1], ct_op)
+        apply_constraint_plan(mmd_arm, binding_plan)
 
         bpy.context.view_layer.objects.active = rigify
         rigify.select_set(True)
@@ -1468,7 +1311,7 @@ class mmrrigOperator(bpy.types.Operator):
         t_bone.color.custom.normal = (pose_bones.get('torso')).color.custom.normal
         t_bone.color.custom.select = (pose_bones.get('torso')).color.custom.select
 
-        t_bone.custom_shape = bpy.data.objects["WGT-RIG-" + RIG.name + "_root"]
+        t_bone.custom_shape = pose_bones.get('root').custom_shape  # 复用的骨架中控件名称来自之前的模型
         # 加入集合
         t_bone = data_bones.get('torso_root')
         rigify.data.collections_all['Torso (Redirect)'].assign(t_bone)
@@ -1821,26 +1664,8 @@ class MahyPdtOperator(bpy.types.Operator):
                 else:
                     print("集合未找到")
         else:
-            # 获取目录路径
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            print(f"当前目录路径：{current_dir}")
-            # 路径拼接
-            file_path = os.path.join(current_dir, "Emoji_Rig.blend")
-            # 标准化路径（处理双斜杠等问题）
-            normalized_path = os.path.normpath(file_path)
-            print(f"blend文件路径：{normalized_path}")
-
-            # 设置追加参数
-            filepath = os.path.join(normalized_path, "Object", "mmr_Mouth_Rig.01")
-            directory = os.path.join(normalized_path, "Object")
-            filename = "mmr_Mouth_Rig.01"
-
-            # 执行追加操作
-            bpy.ops.wm.append(
-                filepath=filepath,
-                directory=directory,
-                filename=filename,
-            )
+            # 从模板库复制表情骨架
+            append_template_object(context, 'Emoji_Rig.blend', 'mmr_Mouth_Rig.01')
 
         def add_a_lip_panel_driver(shape_key_name, armature_obj, transform_type, driver_expression, bone_name, keyframe_values):
             # 获取当前选中的物体
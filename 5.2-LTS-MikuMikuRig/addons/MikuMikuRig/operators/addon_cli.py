@@ -0,0 +1,65 @@
+"""命令行脚本使用的插件包查找
+
+命令行脚本通过 --python 运行，不属于插件包，需要先启用插件再按包名导入插件中的模块。
+插件包名称与安装方式有关: 开发目录中为 addons.<插件>，发布包中为 <插件>.addons.<插件>，
+扩展中为 bl_ext.<仓库>.<插件>.addons.<插件>，因此启用插件后按文件路径在 sys.modules 中查找。
+"""
+import importlib
+import os
+import sys
+
+# 插件包目录与名称（本文件位于 <插件>/operators/ 下）
+ADDON_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_DIR = os.path.normcase(ADDON_PATH)
+ADDON_NAME = os.path.basename(ADDON_PATH)
+
+
+def find_loaded_package():
+    """在已导入的模块中查找本插件包，未导入时返回None"""
+    init_file = os.path.join(ADDON_DIR, '__init__.py')
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if path and os.path.normcase(os.path.abspath(path)) == init_file:
+            return name
+    return None
+
+
+def find_addon_name(addon_utils):
+    """包含本插件包的已安装插件名称，未找到时返回None"""
+    for module in addon_utils.modules():
+        path = getattr(module, '__file__', None)
+        # 单文件插件的目录是插件目录本身，跳过
+        if not path or os.path.basename(path) != '__init__.py':
+            continue
+        folder = os.path.normcase(os.path.dirname(os.path.abspath(path)))
+        if ADDON_DIR == folder or ADDON_DIR.startswith(folder + os.sep):
+            return module.__name__
+    return None
+
+
+def get_addon_package():
+    """启用插件并返回插件包名称
+
+    Returns:
+        插件包名称，例如 MikuMikuRig.addons.MikuMikuRig
+    """
+    import addon_utils
+    addon_name = find_addon_name(addon_utils) or ADDON_NAME
+    if not addon_utils.check(addon_name)[1]:
+        addon_utils.enable(addon_name, default_set=True)
+
+    package = find_loaded_package()
+    if package is None:
+        # 按发布包的结构
+        package = f"{ADDON_NAME}.addons.{ADDON_NAME}"
+        print(f"未找到已导入的插件包, 使用 {package}")
+    return package
+
+
+def import_addon_module(name):
+    """导入插件中的模块
+
+    Args:
+        name: 相对于插件包的模块名称，例如 operators.redirect
+    """
+    return importlib.import_module(f"{get_addon_package()}.{name}")
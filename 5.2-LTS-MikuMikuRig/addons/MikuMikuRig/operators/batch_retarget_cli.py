@@ -0,0 +1,96 @@
+"""批量重定向命令行入口
+
+在已生成控制器的.blend文件中无界面运行:
+
+    blender -b rig.blend --python batch_retarget_cli.py -- --source "D:/mocap/*.fbx" --output out.blend
+
+参数:
+    --source    动作文件夹或通配符路径（FBX/VMD）
+    --file-list 动作文件列表（每行一个路径），与--source二选一
+    --armature  映射骨架名称，默认使用活动骨架或第一个"RIG-"骨架
+    --preset    FBX映射预设名称，默认使用骨架上保存的预设
+    --output    保存路径，默认覆盖当前文件
+    --report    将每个动作的耗时与错误写入JSON文件
+    --no-direct-bake  禁用直接烘焙，始终使用可视化烘焙
+"""
+import argparse
+import json
+import os
+import sys
+
+import bpy
+
+
+def parse_args(argv):
+    argv = argv[argv.index('--') + 1:] if '--' in argv else []
+    parser = argparse.ArgumentParser(description='MikuMikuRig 批量重定向')
+    parser.add_argument('--source', default='', help='动作文件夹或通配符路径')
+    parser.add_argument('--file-list', default='', help='动作文件列表（每行一个路径）')
+    parser.add_argument('--armature', default='', help='映射骨架名称')
+    parser.add_argument('--preset', default='', help='FBX映射预设名称')
+    parser.add_argument('--output', default='', help='保存路径，默认覆盖当前文件')
+    parser.add_argument('--report', default='', help='JSON报告路径')
+    parser.add_argument('--no-direct-bake', action='store_true', help='禁用直接烘焙')
+    return parser.parse_args(argv)
+
+
+def find_armature(name):
+    """按名称查找映射骨架，未指定时使用活动骨架或第一个'RIG-'骨架"""
+    if name:
+        return bpy.data.objects.get(name)
+    active = bpy.context.view_layer.objects.active
+    if active and active.type == 'ARMATURE':
+        return active
+    for obj in bpy.context.scene.objects:
+        if obj.type == 'ARMATURE' and obj.name.startswith('RIG-'):
+            return obj
+    return None
+
+
+def main():
+    args = parse_args(sys.argv)
+
+    # 确保插件已启用（本脚本不属于插件包，按文件路径导入辅助模块）
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from addon_cli import import_addon_module
+    redirect = import_addon_module('operators.redirect')
+
+    arm = find_armature(args.armature)
+    if arm is None or arm.type != 'ARMATURE':
+        print(f"未找到映射骨架: {args.armature}")
+        sys.exit(1)
+
+    if args.preset:
+        arm.mmr.py_presets = args.preset
+
+    if args.file_list:
+        with open(args.file_list, encoding='utf-8') as f:
+            files = [line.strip() for line in f if line.strip()]
+    else:
+        files = redirect.collect_motion_files(args.source)
+    if not files:
+        print(f"没有找到FBX/VMD动作文件: {args.source or args.file_list}")
+        sys.exit(1)
+    print(f"批量重定向 {len(files)} 个动作文件")
+
+    results, failures = redirect.batch_retarget(bpy.context, arm, files, direct_bake=not args.no_direct_bake)
+
+    bpy.ops.object.mode_set(mode='OBJECT')
+    output = os.path.abspath(args.output) if args.output else bpy.data.filepath
+    bpy.ops.wm.save_as_mainfile(filepath=output)
+    print(f"已保存: {output}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'blend': output,
+                'armature': arm.name,
+                'results': [{'file': p, 'action': n, 'time': t} for p, n, t in results],
+                'failures': [{'file': p, 'error': e} for p, e in failures],
+            }, f, ensure_ascii=False, indent=4)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+"""批量生成控制器
+
+对多个MMD骨架（场景中的骨架或 .pmx/.pmd/.blend 文件）依次运行完整流程:
+优化MMD骨架（object.mmd_polars_target）→ 生成控制器（object.mmr_rig）→ 分配物理（mmr.assign_rigidbody，可选）。
+所有模型共用已解析的控制器预设与模板库中的元骨骼，完成后输出每个阶段的耗时。
+"""
+import glob
+import os
+import time
+import traceback
+
+import bpy
+
+from addons.MikuMikuRig.operators.RIG import load_rig_preset, get_rig_preset_path
+from addons.MikuMikuRig.operators.redirect import activate_object
+from addons.MikuMikuRig.operators.template_library import get_template_master, template_path
+
+# 支持批量生成的模型文件
+MODEL_EXTENSIONS = ('.pmx', '.pmd', '.blend')
+
+# 复制到每个模型的控制器生成设置
+RIG_SETTINGS = (
+    'presets', 'Import_presets', 'json_filepath',
+    'Disable_hand_fix', 'Disable_toe_position_constraint', 'Generate_controllers', 'Enable_finger_IK',
+    'Weight_bone_parent_fix', 'Polar_target', 'Shoulder_linkage', 'Upper_body_linkage',
+    'Bend_the_bones', 'Bend_angle_arm', 'Bend_the_leg_bones', 'Bend_angle_leg',
+    'Only_meta_bones_are_generated', 'Thumb_twist_aligns_with_the_world_Z_axis', 'Hide_mmd_skeleton',
+    'Use_ITASC_solver', 'ORG_mode', 'Wrist_twist_preset',
+    'Left_upper_arm_twist', 'Right_upper_arm_twist', 'Left_lower_arm_twist', 'Right_lower_arm_twist',
+)
+
+# 报告中的阶段 (键, 名称)
+BATCH_STAGES = (('load', '读取'), ('preset', '预设'), ('optimize', '优化'), ('rig', '控制器'), ('physics', '物理'))
+
+
+def collect_model_files(pattern):
+    """收集文件夹或通配符路径下的模型文件
+
+    Args:
+        pattern: 文件夹路径或通配符路径（例如 D:/models/*.pmx）
+
+    Returns:
+        排序后的PMX/PMD/blend文件路径列表
+    """
+    pattern = bpy.path.abspath(pattern)
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p) and p.lower().endswith(MODEL_EXTENSIONS))
+
+
+def find_mmd_root(obj):
+    """沿父级查找MMD根对象"""
+    while obj is not None:
+        if getattr(obj, 'mmd_type', '') == 'ROOT':
+            return obj
+        obj = obj.parent
+    return None
+
+
+def find_mmd_armatures(objects):
+    """物体列表中属于MMD模型的骨架"""
+    return [obj for obj in objects if obj.type == 'ARMATURE' and find_mmd_root(obj) is not None]
+
+
+def load_model_file(context, path):
+    """导入模型文件，返回其中的MMD骨架
+
+    PMX/PMD通过mmd_tools导入；blend文件追加所有物体到以文件名命名的集合
+    """
+    before = set(bpy.data.objects)
+    if path.lower().endswith('.blend'):
+        with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+            data_to.objects = list(data_from.objects)
+        collection = bpy.data.collections.new(os.path.splitext(os.path.basename(path))[0])
+        context.scene.collection.children.link(collection)
+        for obj in data_to.objects:
+            if obj is not None:
+                collection.objects.link(obj)
+    else:
+        bpy.ops.mmd_tools.import_model(filepath=path)
+    return find_mmd_armatures([obj for obj in bpy.data.objects if obj not in before])
+
+
+def get_rig_settings(obj):
+    """读取物体上的控制器生成设置"""
+    return {name: getattr(obj.mmr, name) for name in RIG_SETTINGS}
+
+
+def apply_rig_settings(obj, settings):
+    for name, value in settings.items():
+        setattr(obj.mmr, name, value)
+
+
+def run_operator(operator, *args, **kwargs):
+    """运行操作符，未完成时抛出异常"""
+    result = operator(*args, **kwargs)
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"{operator.idname_py()} 未完成: {', '.join(result)}")
+
+
+def assign_physics(context, arm):
+    """为MMD骨架所在的模型分配物理，未转换的MMD刚体先转换为MMR刚体"""
+    root = find_mmd_root(arm)
+    if root is None:
+        raise RuntimeError("未找到MMD根对象")
+    if root.mmr.physics_bool:
+        print(f"{root.name} 已开启物理")
+        return
+    context.view_layer.objects.active = root
+    if root.mmr_bone.mmr_type != 'ROOT':
+        run_operator(bpy.ops.mmr.mmd_rigidbody_to_mmr_rigidbody)
+    run_operator(bpy.ops.mmr.assign_rigidbody)
+
+
+def build_rig(context, arm, towards, physics, timings, parsed_presets):
+    """对一个MMD骨架运行完整流程，将各阶段耗时写入timings
+
+    Returns:
+        生成的控制器骨架
+    """
+    # 预设只解析一次，之后的模型复用缓存
+    preset_path = get_rig_preset_path(arm.mmr)
+    if preset_path and preset_path not in parsed_presets:
+        start_time = time.time()
+        load_rig_preset(preset_path)
+        parsed_presets.add(preset_path)
+        timings['preset'] = time.time() - start_time
+
+    activate_object(context, arm)
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    start_time = time.time()
+    run_operator(bpy.ops.object.mmd_polars_target)
+    timings['optimize'] = time.time() - start_time
+
+    start_time = time.time()
+    run_operator(bpy.ops.object.mmr_rig, 'EXEC_DEFAULT', Towards=towards)
+    timings['rig'] = time.time() - start_time
+    rig = context.view_layer.objects.active
+
+    if physics:
+        start_time = time.time()
+        assign_physics(context, arm)
+        timings['physics'] = time.time() - start_time
+        context.view_layer.objects.active = rig
+    return rig
+
+
+def batch_build_rigs(context, armatures=(), files=(), settings=None, towards='-Y', physics=False):
+    """批量生成控制器
+
+    Args:
+        context: 上下文
+        armatures: 场景中的MMD骨架
+        files: 模型文件路径列表（PMX/PMD/blend）
+        settings: 复制到每个模型的控制器生成设置（get_rig_settings），为None时使用各骨架自身的设置
+        towards: 模型的正面朝向
+        physics: 是否分配物理
+
+    Returns:
+        (成功列表[(模型, 控制器, {阶段: 耗时})], 失败列表[(模型, 错误信息)])
+    """
+    results = []
+    failures = []
+    parsed_presets = set()
+
+    # 预先读取元骨骼模板，之后的模型只复制
+    start_time = time.time()
+    get_template_master(template_path('MMR_Rig.blend'), 'objects', 'MMR_Rig_relative')
+    print(f"读取元骨骼模板: {time.time() - start_time:.3f}s")
+
+    # (骨架名称, 文件路径, 读取耗时)
+    jobs = [(arm.name, None, 0.0) for arm in armatures]
+    for path in files:
+        start_time = time.time()
+        try:
+            loaded = load_model_file(context, path)
+        except Exception as e:
+            traceback.print_exc()
+            failures.append((path, str(e)))
+            continue
+        if not loaded:
+            failures.append((path, "文件中没有MMD骨架"))
+            continue
+        load_time = time.time() - start_time
+        for i, arm in enumerate(loaded):
+            jobs.append((arm.name, path, load_time if i == 0 else 0.0))
+
+    for name, path, load_time in jobs:
+        label = f"{os.path.basename(path)}:{name}" if path else name
+        timings = {'load': load_time}
+        try:
+            arm = bpy.data.objects[name]
+            if settings is not None:
+                apply_rig_settings(arm, settings)
+            rig = build_rig(context, arm, towards, physics, timings, parsed_presets)
+            results.append((label, rig.name if rig else '', timings))
+        except Exception as e:
+            traceback.print_exc()
+            failures.append((label, str(e)))
+            if context.object and context.object.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
+
+    print_batch_report(results, failures)
+    return results, failures
+
+
+def print_batch_report(results, failures):
+    """输出每个模型各阶段的耗时"""
+    header = ''.join(f"{title:>8}" for _, title in BATCH_STAGES)
+    print(f"{'模型':<32}{header}{'合计':>8}")
+    totals = dict.fromkeys([key for key, _ in BATCH_STAGES], 0.0)
+    for label, rig_name, timings in results:
+        row = ''
+        for key, _ in BATCH_STAGES:
+            row += f"{timings.get(key, 0.0):>8.2f}"
+            totals[key] += timings.get(key, 0.0)
+        print(f"{label:<32}{row}{sum(timings.values()):>8.2f}")
+    row = ''.join(f"{totals[key]:>8.2f}" for key, _ in BATCH_STAGES)
+    print(f"{'合计':<32}{row}{sum(totals.values()):>8.2f}")
+    for label, error in failures:
+        print(f"失败 {label}: {error}")
+
+
+class MMR_Batch_Rig(bpy.types.Operator):
+    """ Build controllers for every selected MMD armature or model file """
+    bl_idname = 'object.mmr_batch_rig'
+    bl_label = 'Batch build controllers'
+    bl_options = {'REGISTER', 'UNDO'}  # 启用撤销功能
+
+    # 模型文件夹或通配符路径
+    source_path: bpy.props.StringProperty(
+        name="Source",
+        description="模型文件夹或通配符路径（例如 D:/models/*.pmx），为空时处理选中的MMD骨架",
+        subtype='FILE_PATH'
+    )
+    directory: bpy.props.StringProperty(subtype='DIR_PATH', options={'HIDDEN'})
+
+    Towards: bpy.props.EnumProperty(
+        name="",
+        items=[('X', 'X', 'X'), ('Y', 'Y', 'Y'),
+               ('-X', '-X', '-X'), ('-Y', '-Y', '-Y')],
+        default='-Y',
+        description="如果模型的正面朝向-Y，就选择-Y"
+    )
+
+    physics: bpy.props.BoolProperty(
+        name="Assign physics",
+        description="生成控制器后分配物理",
+        default=False
+    )
+
+    def execute(self, context):
+        # 有活动骨架时使用其控制器设置，否则使用各骨架自身的设置
+        active = context.view_layer.objects.active
+        settings = get_rig_settings(active) if active is not None and active.type == 'ARMATURE' else None
+
+        source = self.source_path or self.directory
+        files = collect_model_files(source) if source else []
+        armatures = [] if source else find_mmd_armatures(context.selected_objects)
+        if not files and not armatures:
+            self.report({'ERROR'}, '没有找到MMD骨架或模型文件')
+            return {'CANCELLED'}
+
+        results, failures = batch_build_rigs(context, armatures, files, settings, self.Towards, self.physics)
+
+        if failures:
+            self.report({'WARNING'}, f"批量生成完成: 成功 {len(results)} 个, 失败 {len(failures)} 个")
+        else:
+            self.report({'INFO'}, f"批量生成完成: 成功 {len(results)} 个")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        # 选中了多个MMD骨架时直接处理，否则选择模型文件夹
+        if len(find_mmd_armatures(context.selected_objects)) > 1:
+            return context.window_manager.invoke_props_dialog(self, width=200)
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.label(text='模型默认朝向')
+        layout.prop(self, "Towards")
+        layout.prop(self, "physics")
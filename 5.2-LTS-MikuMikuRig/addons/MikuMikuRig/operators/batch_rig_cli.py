@@ -0,0 +1,104 @@
+"""批量生成控制器命令行入口
+
+无界面运行（未指定模型文件时处理当前文件中的所有MMD骨架）:
+
+    blender -b cast.blend --python batch_rig_cli.py -- --source "D:/models/*.pmx" --physics --output out.blend
+
+参数:
+    --source      模型文件夹或通配符路径（PMX/PMD/blend）
+    --file-list   模型文件列表（每行一个路径），与--source二选一
+    --armatures   要处理的骨架名称（逗号分隔），默认处理当前文件中的所有MMD骨架
+    --preset      控制器预设名称，默认使用各骨架上保存的预设
+    --preset-file 控制器预设JSON文件路径
+    --towards     模型的正面朝向（X/Y/-X/-Y），默认-Y
+    --physics     生成控制器后分配物理
+    --output      保存路径，默认覆盖当前文件（未打开.blend文件时必须指定）
+    --report      将每个模型各阶段的耗时与错误写入JSON文件
+"""
+import argparse
+import json
+import os
+import sys
+
+import bpy
+
+
+def parse_args(argv):
+    argv = argv[argv.index('--') + 1:] if '--' in argv else []
+    parser = argparse.ArgumentParser(description='MikuMikuRig 批量生成控制器')
+    parser.add_argument('--source', default='', help='模型文件夹或通配符路径')
+    parser.add_argument('--file-list', default='', help='模型文件列表（每行一个路径）')
+    parser.add_argument('--armatures', default='', help='骨架名称（逗号分隔）')
+    parser.add_argument('--preset', default='', help='控制器预设名称')
+    parser.add_argument('--preset-file', default='', help='控制器预设JSON文件路径')
+    parser.add_argument('--towards', default='-Y', choices=['X', 'Y', '-X', '-Y'], help='模型的正面朝向')
+    parser.add_argument('--physics', action='store_true', help='生成控制器后分配物理')
+    parser.add_argument('--output', default='', help='保存路径，默认覆盖当前文件')
+    parser.add_argument('--report', default='', help='JSON报告路径')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv)
+
+    # 在生成之前确定保存路径，避免处理完所有模型后才因为没有路径而保存失败
+    output = os.path.abspath(args.output) if args.output else bpy.data.filepath
+    if not output:
+        print("当前没有打开.blend文件，请使用--output指定保存路径")
+        sys.exit(1)
+
+    # 确保插件已启用（本脚本不属于插件包，按文件路径导入辅助模块）
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from addon_cli import import_addon_module
+    batch_rig = import_addon_module('operators.batch_rig')
+
+    if args.file_list:
+        with open(args.file_list, encoding='utf-8') as f:
+            files = [line.strip() for line in f if line.strip()]
+    elif args.source:
+        files = batch_rig.collect_model_files(args.source)
+    else:
+        files = []
+
+    armatures = []
+    if args.armatures:
+        for name in args.armatures.split(','):
+            obj = bpy.data.objects.get(name.strip())
+            if obj is None or obj.type != 'ARMATURE':
+                print(f"未找到骨架: {name}")
+                sys.exit(1)
+            armatures.append(obj)
+    elif not files:
+        armatures = batch_rig.find_mmd_armatures(bpy.context.scene.objects)
+
+    if not files and not armatures:
+        print(f"没有找到MMD骨架或模型文件: {args.source or args.file_list}")
+        sys.exit(1)
+    print(f"批量生成控制器: {len(armatures)} 个骨架, {len(files)} 个模型文件")
+
+    settings = None
+    if args.preset_file:
+        settings = {'Import_presets': True, 'json_filepath': os.path.abspath(args.preset_file)}
+    elif args.preset:
+        settings = {'Import_presets': False, 'presets': args.preset}
+
+    results, failures = batch_rig.batch_build_rigs(bpy.context, armatures, files, settings,
+                                                   args.towards, args.physics)
+
+    # 先写报告，保存失败时仍然保留各模型的结果
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'blend': output,
+                'results': [{'model': m, 'rig': r, 'timings': t} for m, r, t in results],
+                'failures': [{'model': m, 'error': e} for m, e in failures],
+            }, f, ensure_ascii=False, indent=4)
+
+    bpy.ops.wm.save_as_mainfile(filepath=output)
+    print(f"已保存: {output}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""骨骼对齐
+
+生成控制器时将元骨骼对齐到MMD骨骼。源骨架的静止姿态通过拓扑索引一次性读取，
+在物体模式下批量计算所有目标骨骼的头尾坐标，再在一次编辑会话中写入，不再逐个骨骼切换模式。
+"""
+import numpy as np
+
+from .bone_topology import get_bone_topology
+
+
+def plan_bone_alignment(pairs, source_obj, target_obj):
+    """批量计算对齐后的头尾坐标（目标骨架空间）
+
+    Args:
+        pairs: (源骨骼名称, 目标骨骼名称) 列表，按写入顺序排列
+        source_obj: 源骨架（MMD骨架）
+        target_obj: 目标骨架（元骨骼）
+
+    Returns:
+        (plan, count): plan 为 [(目标骨骼名称, 头坐标, 尾坐标)]，count 为匹配成功的数量
+    """
+    source = get_bone_topology(source_obj)
+    target_names = set(target_obj.data.bones.keys())
+
+    matched = []
+    for source_name, target_name in pairs:
+        if source_name not in source.index or target_name not in target_names:
+            print(f"未找到 {target_name} 骨骼或 {source_name} 骨骼，请检查名称。")
+            continue
+        matched.append((source.index[source_name], target_name))
+
+    if not matched:
+        return [], 0
+
+    # 源骨架空间 -> 世界空间 -> 目标骨架空间
+    matrix = np.array(target_obj.matrix_world.inverted() @ source_obj.matrix_world, dtype=np.float64)
+    indices = np.array([i for i, _ in matched], dtype=np.int64)
+    heads = source.heads[indices].astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+    tails = source.tails[indices].astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+
+    plan = []
+    for (_, target_name), head, tail in zip(matched, heads, tails):
+        # spine 的头部必须在尾部下方
+        if target_name == 'spine' and not head[2] < tail[2]:
+            head, tail = tail, head
+        plan.append((target_name, tuple(head), tuple(tail)))
+    return plan, len(matched)
+
+
+def apply_bone_alignment(edit_bones, plan):
+    """在编辑模式下按顺序写入头尾坐标
+
+    相连的骨骼修改头部时会同时移动父骨骼的尾部，因此保持计划中的顺序。
+    """
+    for target_name, head, tail in plan:
+        bone = edit_bones.get(target_name)
+        if bone is None:
+            continue
+        bone.head = head
+        bone.tail = tail
+
+
+def align_edit_bone(edit_bones, target_name, source_name, length=0.0):
+    """在同一骨架的编辑模式下将骨骼对齐到另一个骨骼
+
+    Args:
+        edit_bones: 编辑骨骼集合
+        target_name: 需要对齐的骨骼
+        source_name: 对齐的目标骨骼
+        length: 不为0时将长度乘以该值
+
+    Returns:
+        两个骨骼都存在时返回True
+    """
+    target = edit_bones.get(target_name)
+    source = edit_bones.get(source_name)
+    if not target or not source:
+        print(f"未找到 {target_name} 骨骼或 {source_name} 骨骼，请检查名称。")
+        return False
+    target.head = source.head.copy()
+    target.tail = source.tail.copy()
+    if length != 0.0:
+        target.length = target.length * length
+    return True
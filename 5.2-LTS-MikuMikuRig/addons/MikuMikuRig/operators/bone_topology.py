@@ -0,0 +1,142 @@
+"""骨架静止姿态的拓扑索引
+
+在物体模式下通过 head_local / tail_local 一次性建立骨骼的父子关系与首尾连接关系，
+查找骨骼链时不再切换到编辑模式。索引按骨架数据缓存，骨骼数量或静止姿态改变时才重建。
+"""
+import itertools
+
+import numpy as np
+
+# 骨骼尾部与子骨骼头部视为相连的容差
+CHAIN_TOLERANCE = 1e-4
+
+# 3x3x3 相邻网格偏移
+NEIGHBOR_OFFSETS = list(itertools.product((-1, 0, 1), repeat=3))
+
+# 拓扑索引缓存 {骨架数据指针: BoneTopology}
+_topology_cache = {}
+
+
+class BoneTopology:
+    """骨架静止姿态的拓扑索引
+
+    Attributes:
+        names: 骨骼名称列表（与 armature.bones 顺序一致）
+        index: {骨骼名称: 索引}
+        parents: 父骨骼索引，没有父骨骼为-1
+        children: 子骨骼索引列表（与 bone.children 顺序一致）
+        next_bone: 头部与自身尾部相连的第一个子骨骼索引，没有为-1
+    """
+
+    def __init__(self, bones, tolerance=CHAIN_TOLERANCE):
+        count = len(bones)
+        self.tolerance = tolerance
+        self.names = [bone.name for bone in bones]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.heads = np.empty(count * 3, dtype=np.float32)
+        self.tails = np.empty(count * 3, dtype=np.float32)
+        bones.foreach_get('head_local', self.heads)
+        bones.foreach_get('tail_local', self.tails)
+        self.heads = self.heads.reshape(-1, 3)
+        self.tails = self.tails.reshape(-1, 3)
+        self.signature = topology_signature(bones, self.heads, self.tails)
+
+        self.parents = [self.index[bone.parent.name] if bone.parent else -1 for bone in bones]
+        self.children = [[] for _ in range(count)]
+        for i, parent in enumerate(self.parents):
+            if parent >= 0:
+                self.children[parent].append(i)
+
+        # 骨骼头部的空间哈希
+        cells = {}
+        for i, cell in enumerate(self.cell_of(self.heads)):
+            cells.setdefault(cell, []).append(i)
+
+        self.next_bone = [-1] * count
+        for i, cell in enumerate(self.cell_of(self.tails)):
+            candidates = set()
+            for dx, dy, dz in NEIGHBOR_OFFSETS:
+                candidates.update(cells.get((cell[0] + dx, cell[1] + dy, cell[2] + dz), ()))
+            for child in self.children[i]:
+                if child in candidates and np.abs(self.heads[child] - self.tails[i]).max() <= tolerance:
+                    self.next_bone[i] = child
+                    break  # 找到第一个连接的子骨骼
+
+    def cell_of(self, points):
+        return [tuple(cell) for cell in np.floor(points / self.tolerance).astype(np.int64).tolist()]
+
+    def chain(self, bone_name):
+        """从指定骨骼开始，沿首尾相连的子骨骼获取骨骼链
+
+        Returns:
+            骨骼名称列表，骨骼不存在时为空列表
+        """
+        i = self.index.get(bone_name, -1)
+        chain = []
+        visited = set()
+        while i >= 0 and i not in visited:
+            visited.add(i)
+            chain.append(self.names[i])
+            i = self.next_bone[i]
+        return chain
+
+    def sort_by_hierarchy(self, bone_names):
+        """按骨骼层级关系排序（从列表中的根骨骼开始，父骨骼在前，兄弟骨骼保持 bone.children 的顺序）"""
+        order = list(dict.fromkeys(self.index[name] for name in bone_names if name in self.index))
+        selected = set(order)
+        sorted_bones = []
+        stack = [i for i in reversed(order) if self.parents[i] not in selected]
+        while stack:
+            i = stack.pop()
+            sorted_bones.append(self.names[i])
+            stack.extend(child for child in reversed(self.children[i]) if child in selected)
+        return sorted_bones
+
+
+def topology_signature(bones, heads=None, tails=None):
+    """骨骼名称、父子关系与静止姿态的签名，用于判断缓存是否失效"""
+    if heads is None:
+        heads = np.empty(len(bones) * 3, dtype=np.float32)
+        tails = np.empty(len(bones) * 3, dtype=np.float32)
+        bones.foreach_get('head_local', heads)
+        bones.foreach_get('tail_local', tails)
+    return hash((
+        tuple(bone.name for bone in bones),
+        tuple(bone.parent.name if bone.parent else '' for bone in bones),
+        np.asarray(heads, dtype=np.float32).tobytes(),
+        np.asarray(tails, dtype=np.float32).tobytes(),
+    ))
+
+
+def get_bone_topology(armature_obj, tolerance=CHAIN_TOLERANCE):
+    """获取骨架的拓扑索引，骨架未改变时复用缓存
+
+    Args:
+        armature_obj: 骨架物体
+        tolerance: 首尾相连的容差
+
+    Returns:
+        BoneTopology
+    """
+    if armature_obj.mode == 'EDIT':
+        # 编辑模式下的修改需要先同步到骨骼数据
+        armature_obj.update_from_editmode()
+    bones = armature_obj.data.bones
+    key = armature_obj.data.as_pointer()
+    topology = _topology_cache.get(key)
+    if topology is not None and topology.tolerance == tolerance \
+            and len(topology.names) == len(bones) and topology.signature == topology_signature(bones):
+        return topology
+    topology = BoneTopology(bones, tolerance)
+    _topology_cache[key] = topology
+    return topology
+
+
+def get_bone_chain(armature_obj, bone_name):
+    """从指定骨骼开始获取首尾相连的骨骼链"""
+    return get_bone_topology(armature_obj).chain(bone_name)
+
+
+def sort_bone_chain_by_hierarchy(armature_obj, bone_names):
+    """按骨骼层级关系排序"""
+    return get_bone_topology(armature_obj).sort_by_hierarchy(bone_names)
@@ -0,0 +1,161 @@
+"""控制器与MMD骨架之间的约束绑定
+
+先将所有约束整理为绑定计划（所属骨骼、目标、类型、空间、影响权重），
+再按骨骼名称索引一次性写入，只修改与计划不同的约束，并报告修改内容。
+dry_run 时只返回差异，不修改骨架。
+"""
+
+# 绑定约束 (名称, 类型)，顺序与控制器骨骼的 Set_constraints 开关一致
+BINDING_CONSTRAINTS = (
+    ('MMR_复制旋转', 'COPY_ROTATION'),
+    ('MMR_复制位置', 'COPY_TRANSFORMS'),
+    ('MMR_复制缩放', 'COPY_SCALE'),
+)
+
+# 捩骨只复制旋转
+TWIST_CONSTRAINT = BINDING_CONSTRAINTS[0]
+
+# MMD骨架中需要关闭的IK约束目标，一个都没有时关闭所有IK约束
+IK_SUBTARGETS = ('つま先ＩＫ.L', 'つま先ＩＫ.R', '足ＩＫ.R', '足ＩＫ.L')
+
+# 比较与写入的约束属性
+BINDING_FIELDS = ('target', 'subtarget', 'owner_space', 'target_space', 'influence')
+
+
+def make_binding(owner, constraint, rig, subtarget, influence):
+    name, constraint_type = constraint
+    return {
+        'owner': owner,
+        'name': name,
+        'type': constraint_type,
+        'target': rig,
+        'subtarget': subtarget,
+        'owner_space': 'WORLD',
+        'target_space': 'WORLD',
+        'influence': influence,
+    }
+
+
+def plan_constraint_bindings(mmd_arm, rig, config, twist_bones, ct_op):
+    """生成约束绑定计划
+
+    Args:
+        mmd_arm: MMD骨架
+        rig: 生成的控制器骨架
+        config: 控制器预设 {MMD骨骼名称: 元骨骼名称}
+        twist_bones: 捩骨 {控制器DEF骨骼名称: MMD骨骼名称}
+        ct_op: 元骨骼的约束开关 {元骨骼名称: [旋转, 位置, 缩放]}
+
+    Returns:
+        {'bindings': [约束], 'ik': [(骨骼名称, 约束名称)]}
+    """
+    pose_bones = mmd_arm.pose.bones
+    bindings = {}
+
+    # 捩骨
+    for value in twist_bones.values():
+        if pose_bones.get(value) is None:
+            print(f"警告: 未找到名为 {value} 的骨骼，跳过约束操作")
+            continue
+        bindings[value] = [make_binding(value, TWIST_CONSTRAINT, rig, 'ORG-' + value + '_parent', 1.0)]
+
+    # 预设中的骨骼（同一骨骼以预设为准）
+    for key, value in config.items():
+        if pose_bones.get(key) is None:
+            print(f"警告: 未找到名为 {key} 的骨骼，跳过约束操作")
+            continue
+        switches = ct_op.get(value) or [True] * len(BINDING_CONSTRAINTS)
+        bindings[key] = [make_binding(key, constraint, rig, 'ORG-' + value + '_parent', 1.0 if enabled else 0.0)
+                         for constraint, enabled in zip(BINDING_CONSTRAINTS, switches)]
+
+    # IK约束只遍历一次
+    ik_constraints = [(bone.name, constraint.name, constraint.subtarget)
+                      for bone in pose_bones for constraint in bone.constraints if constraint.type == 'IK']
+    ik = [(owner, name) for owner, name, subtarget in ik_constraints if subtarget in IK_SUBTARGETS]
+    if not ik:
+        ik = [(owner, name) for owner, name, _ in ik_constraints]
+
+    return {'bindings': [b for items in bindings.values() for b in items], 'ik': ik}
+
+
+def diff_constraint_plan(mmd_arm, plan):
+    """对比骨架上的约束与计划
+
+    Returns:
+        [(操作, 骨骼名称, 约束名称, 说明)]，操作为 add / replace / update / keep / ik
+    """
+    pose_bones = mmd_arm.pose.bones
+    changes = []
+    for binding in plan['bindings']:
+        constraint = pose_bones[binding['owner']].constraints.get(binding['name'])
+        if constraint is None:
+            changes.append(('add', binding['owner'], binding['name'], binding['subtarget']))
+        elif constraint.type != binding['type']:
+            changes.append(('replace', binding['owner'], binding['name'], f"{constraint.type} -> {binding['type']}"))
+        else:
+            fields = [f for f in BINDING_FIELDS if getattr(constraint, f) != binding[f]]
+            if fields:
+                detail = ', '.join(f"{f}: {getattr(constraint, f)} -> {binding[f]}" for f in fields)
+                changes.append(('update', binding['owner'], binding['name'], detail))
+            else:
+                changes.append(('keep', binding['owner'], binding['name'], ''))
+
+    for owner, name in plan['ik']:
+        constraint = pose_bones[owner].constraints[name]
+        if constraint.influence != 0.0:
+            changes.append(('ik', owner, name, f"influence: {constraint.influence} -> 0.0"))
+    return changes
+
+
+def write_binding(constraint, binding):
+    for field in BINDING_FIELDS:
+        if getattr(constraint, field) != binding[field]:
+            setattr(constraint, field, binding[field])
+
+
+def apply_constraint_plan(mmd_arm, plan, dry_run=False):
+    """按计划写入约束，只修改有差异的约束
+
+    Args:
+        mmd_arm: MMD骨架
+        plan: plan_constraint_bindings 生成的计划
+        dry_run: 为True时只返回差异
+
+    Returns:
+        diff_constraint_plan 的差异列表
+    """
+    changes = diff_constraint_plan(mmd_arm, plan)
+    if not dry_run:
+        pose_bones = mmd_arm.pose.bones
+        actions = {(owner, name): action for action, owner, name, _ in changes}
+        for binding in plan['bindings']:
+            action = actions[(binding['owner'], binding['name'])]
+            if action == 'keep':
+                continue
+            constraints = pose_bones[binding['owner']].constraints
+            if action == 'replace':
+                constraints.remove(constraints[binding['name']])
+            if action in ('add', 'replace'):
+                constraint = constraints.new(type=binding['type'])
+                constraint.name = binding['name']
+            else:
+                constraint = constraints[binding['name']]
+            write_binding(constraint, binding)
+
+        for action, owner, name, _ in changes:
+            if action == 'ik':
+                pose_bones[owner].constraints[name].influence = 0.0
+
+    print_constraint_changes(changes, dry_run)
+    return changes
+
+
+def print_constraint_changes(changes, dry_run=False):
+    """输出约束修改的统计与明细（不包括未改变的约束）"""
+    counts = {}
+    for action, owner, name, detail in changes:
+        counts[action] = counts.get(action, 0) + 1
+        if action != 'keep':
+            print(f"{action:<8}{owner} / {name} {detail}")
+    summary = ', '.join(f"{action}: {count}" for action, count in sorted(counts.items()))
+    print(f"约束绑定{'（仅对比）' if dry_run else ''}: {summary or '无'}")
@@ -0,0 +1,697 @@
+import time
+
+import bpy
+import numpy as np
+from mathutils import Euler, Matrix
+
+from addons.MikuMikuRig.utilfuncs import BAC_CONSTRAINTS
+
+# 欧拉旋转模式
+EULER_MODES = {'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX'}
+
+# 校验烘焙结果时允许的最大误差
+VERIFY_TOLERANCE = 1e-3
+
+# 抽样校验的帧数（包含首尾帧）
+VERIFY_SAMPLES = 5
+
+# 会改变骨骼姿态的属性路径（相对 pose.bones["名称"].）
+POSE_PROPS = ('location', 'rotation_', 'scale', 'constraints[')
+
+
+def get_action_fcurves(obj):
+    """获取物体当前动作的F曲线集合（兼容分层动作）
+
+    Args:
+        obj: 带有动画数据的物体
+
+    Returns:
+        F曲线集合，没有动作时返回空列表
+    """
+    anim_data = obj.animation_data
+    if not anim_data or not anim_data.action:
+        return []
+    return get_slot_fcurves(anim_data.action, getattr(anim_data, 'action_slot', None))
+
+
+def get_slot_fcurves(action, slot):
+    """获取动作中指定槽的F曲线集合（没有槽时返回动作的F曲线）
+
+    Args:
+        action: 动作
+        slot: 动作槽（当前动作或NLA片段的 action_slot），旧版本为None
+
+    Returns:
+        F曲线集合
+    """
+    if slot is not None:
+        try:
+            from bpy_extras import anim_utils
+            channelbag = anim_utils.action_get_channelbag_for_slot(action, slot)
+            return channelbag.fcurves if channelbag else []
+        except (ImportError, AttributeError):
+            pass
+    return action.fcurves
+
+
+def ensure_fcurve(obj, action, data_path, index, group_name):
+    """获取或新建F曲线（兼容分层动作）"""
+    if hasattr(action, 'fcurve_ensure_for_datablock'):
+        return action.fcurve_ensure_for_datablock(obj, data_path, index=index, group_name=group_name)
+    fcurve = action.fcurves.find(data_path, index=index)
+    return fcurve or action.fcurves.new(data_path, index=index, action_group=group_name)
+
+
+def make_frames(frame_start, frame_end, step):
+    """生成烘焙帧序列，确保包含结束帧"""
+    step = max(1, int(step))
+    frames = list(range(int(frame_start), int(frame_end) + 1, step))
+    if not frames or frames[-1] != int(frame_end):
+        frames.append(int(frame_end))
+    return np.array(frames, dtype=np.float64)
+
+
+def sample_fcurve(fcurve, frames):
+    """对F曲线采样
+
+    关键帧刚好落在采样帧上时（FBX逐帧动画）直接读取关键帧数值，否则逐帧求值
+
+    Args:
+        fcurve: F曲线
+        frames: 采样帧数组
+
+    Returns:
+        与frames等长的数值数组
+    """
+    count = len(fcurve.keyframe_points)
+    if count > 0 and not fcurve.modifiers:
+        co = np.empty(count * 2, dtype=np.float64)
+        fcurve.keyframe_points.foreach_get('co', co)
+        xs = co[0::2]
+        ys = co[1::2]
+        if count == 1:
+            return np.full(len(frames), ys[0])
+        idx = np.clip(np.searchsorted(xs, frames - 1e-4), 0, count - 1)
+        if np.all(np.abs(xs[idx] - frames) < 1e-4):
+            return ys[idx].copy()
+    return np.fromiter((fcurve.evaluate(f) for f in frames), dtype=np.float64, count=len(frames))
+
+
+def quat_to_mat3(q):
+    """四元数数组(F,4)转旋转矩阵数组(F,3,3)"""
+    norm = np.linalg.norm(q, axis=1, keepdims=True)
+    norm[norm == 0] = 1.0
+    w, x, y, z = (q / norm).T
+    m = np.empty((len(q), 3, 3))
+    m[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    m[:, 0, 1] = 2 * (x * y - w * z)
+    m[:, 0, 2] = 2 * (x * z + w * y)
+    m[:, 1, 0] = 2 * (x * y + w * z)
+    m[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    m[:, 1, 2] = 2 * (y * z - w * x)
+    m[:, 2, 0] = 2 * (x * z - w * y)
+    m[:, 2, 1] = 2 * (y * z + w * x)
+    m[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return m
+
+
+def euler_to_mat3(e, order):
+    """欧拉角数组(F,3)转旋转矩阵数组(F,3,3)，order与Blender旋转模式一致"""
+    count = len(e)
+    axes = {}
+    for i, axis in enumerate('XYZ'):
+        c = np.cos(e[:, i])
+        s = np.sin(e[:, i])
+        m = np.zeros((count, 3, 3))
+        if axis == 'X':
+            m[:, 0, 0] = 1
+            m[:, 1, 1] = c
+            m[:, 1, 2] = -s
+            m[:, 2, 1] = s
+            m[:, 2, 2] = c
+        elif axis == 'Y':
+            m[:, 0, 0] = c
+            m[:, 0, 2] = s
+            m[:, 1, 1] = 1
+            m[:, 2, 0] = -s
+            m[:, 2, 2] = c
+        else:
+            m[:, 0, 0] = c
+            m[:, 0, 1] = -s
+            m[:, 1, 0] = s
+            m[:, 1, 1] = c
+            m[:, 2, 2] = 1
+        axes[axis] = m
+    # 'XYZ' 表示先绕X再绕Y最后绕Z
+    return axes[order[2]] @ axes[order[1]] @ axes[order[0]]
+
+
+def mat3_to_quat(m):
+    """旋转矩阵数组(F,3,3)转四元数数组(F,4)，并保证相邻帧符号连续"""
+    count = len(m)
+    q = np.empty((count, 4))
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+
+    # 分情况求解，避免除以接近0的数
+    c0 = trace > 0
+    c1 = ~c0 & (m[:, 0, 0] > m[:, 1, 1]) & (m[:, 0, 0] > m[:, 2, 2])
+    c2 = ~c0 & ~c1 & (m[:, 1, 1] > m[:, 2, 2])
+    c3 = ~c0 & ~c1 & ~c2
+
+    s = np.sqrt(np.maximum(trace[c0] + 1.0, 1e-12)) * 2
+    q[c0, 0] = 0.25 * s
+    q[c0, 1] = (m[c0, 2, 1] - m[c0, 1, 2]) / s
+    q[c0, 2] = (m[c0, 0, 2] - m[c0, 2, 0]) / s
+    q[c0, 3] = (m[c0, 1, 0] - m[c0, 0, 1]) / s
+
+    s = np.sqrt(np.maximum(1.0 + m[c1, 0, 0] - m[c1, 1, 1] - m[c1, 2, 2], 1e-12)) * 2
+    q[c1, 0] = (m[c1, 2, 1] - m[c1, 1, 2]) / s
+    q[c1, 1] = 0.25 * s
+    q[c1, 2] = (m[c1, 0, 1] + m[c1, 1, 0]) / s
+    q[c1, 3] = (m[c1, 0, 2] + m[c1, 2, 0]) / s
+
+    s = np.sqrt(np.maximum(1.0 + m[c2, 1, 1] - m[c2, 0, 0] - m[c2, 2, 2], 1e-12)) * 2
+    q[c2, 0] = (m[c2, 0, 2] - m[c2, 2, 0]) / s
+    q[c2, 1] = (m[c2, 0, 1] + m[c2, 1, 0]) / s
+    q[c2, 2] = 0.25 * s
+    q[c2, 3] = (m[c2, 1, 2] + m[c2, 2, 1]) / s
+
+    s = np.sqrt(np.maximum(1.0 + m[c3, 2, 2] - m[c3, 0, 0] - m[c3, 1, 1], 1e-12)) * 2
+    q[c3, 0] = (m[c3, 1, 0] - m[c3, 0, 1]) / s
+    q[c3, 1] = (m[c3, 0, 2] + m[c3, 2, 0]) / s
+    q[c3, 2] = (m[c3, 1, 2] + m[c3, 2, 1]) / s
+    q[c3, 3] = 0.25 * s
+
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+
+    # 相邻帧点积为负时翻转符号，避免插值绕远路
+    if count > 1:
+        dots = np.einsum('ij,ij->i', q[1:], q[:-1])
+        signs = np.concatenate(([1.0], np.cumprod(np.where(dots < 0, -1.0, 1.0))))
+        q *= signs[:, None]
+    return q
+
+
+def mat3_to_rotation_channel(mode, rot3):
+    """按骨骼的旋转模式将旋转矩阵数组(F,3,3)转为关键帧数值
+
+    Returns:
+        (旋转属性名, 数值数组(F,3)或(F,4))
+    """
+    if mode == 'QUATERNION':
+        return 'rotation_quaternion', mat3_to_quat(rot3)
+    if mode in EULER_MODES:
+        eulers = []
+        prev = None
+        for r in rot3:
+            e = Matrix(r.tolist()).to_euler(mode, prev) if prev else Matrix(r.tolist()).to_euler(mode)
+            eulers.append(e[:])
+            prev = e
+        return 'rotation_euler', np.array(eulers)
+    axis_angle = []
+    for r in rot3:
+        axis, angle = Matrix(r.tolist()).to_quaternion().to_axis_angle()
+        axis_angle.append((angle, axis[0], axis[1], axis[2]))
+    return 'rotation_axis_angle', np.array(axis_angle)
+
+
+def rotation_channel_to_mat3(mode, values):
+    """mat3_to_rotation_channel的逆运算"""
+    if mode == 'QUATERNION':
+        return quat_to_mat3(values)
+    if mode in EULER_MODES:
+        return euler_to_mat3(values, mode)
+    return np.array([np.array(Matrix.Rotation(a[0], 3, a[1:4])) for a in values])
+
+
+def compose_matrices(loc, rot3, scale):
+    """由位置(F,3)、旋转矩阵(F,3,3)、缩放(F,3)组成变换矩阵(F,4,4)"""
+    m = np.zeros((len(loc), 4, 4))
+    m[:, :3, :3] = rot3 * scale[:, None, :]
+    m[:, :3, 3] = loc
+    m[:, 3, 3] = 1.0
+    return m
+
+
+def split_matrices(m):
+    """将变换矩阵(F,4,4)拆分为位置、归一化旋转矩阵、缩放"""
+    loc = m[:, :3, 3].copy()
+    scale = np.linalg.norm(m[:, :3, :3], axis=1)
+    safe = np.where(scale == 0, 1.0, scale)
+    rot3 = m[:, :3, :3] / safe[:, None, :]
+    return loc, rot3, scale
+
+
+def is_constraint_active(con):
+    """约束是否启用并产生影响"""
+    enabled = getattr(con, 'enabled', not con.mute)
+    return enabled and con.influence > 0
+
+
+def has_full_inherit(bone):
+    """骨骼是否完全继承父级变换（直接烘焙仅支持此情况）
+
+    没有父级的骨骼不受继承旋转与继承缩放的影响（例如重定向时关闭了继承设置的root）
+    """
+    if not bone.use_local_location:
+        return False
+    return bone.parent is None or (bone.use_inherit_rotation and bone.inherit_scale == 'FULL')
+
+
+def rest_relation(bone):
+    """骨骼相对父级的静置矩阵"""
+    if bone.parent:
+        return bone.parent.matrix_local.inverted() @ bone.matrix_local
+    return bone.matrix_local.copy()
+
+
+def get_animated_paths(obj, include_action=True):
+    """获取物体驱动器（以及当前动作F曲线）的数据路径"""
+    anim_data = obj.animation_data
+    if not anim_data:
+        return []
+    paths = [fc.data_path for fc in anim_data.drivers]
+    if include_action:
+        paths += [fc.data_path for fc in get_action_fcurves(obj)]
+    return paths
+
+
+def is_bone_animated(pb, paths):
+    """骨骼的变换或约束是否被驱动器/F曲线控制（自定义属性不计）"""
+    prefix = f'pose.bones["{bpy.utils.escape_identifier(pb.name)}"].'
+    return any(path.startswith(prefix) and path[len(prefix):].startswith(POSE_PROPS) for path in paths)
+
+
+def get_parent_chain(pb, mapped):
+    """获取骨骼到最近的被映射祖先之间的未映射骨骼
+
+    Returns:
+        (由上到下的未映射骨骼列表, 被映射祖先名称，没有时为None)
+    """
+    chain = []
+    parent = pb.parent
+    while parent and parent.name not in mapped:
+        chain.append(parent)
+        parent = parent.parent
+    chain.reverse()
+    return chain, parent.name if parent else None
+
+
+def chain_matrix(chain, basis):
+    """由静置关系与基础变换求出骨骼链末端相对链首父级的矩阵（链首没有父级时为骨架空间）"""
+    m = np.eye(4)
+    for pb in chain:
+        m = m @ np.array(rest_relation(pb.bone)) @ basis[pb.name]
+    return m
+
+
+def get_depth(bone):
+    depth = 0
+    while bone.parent:
+        bone = bone.parent
+        depth += 1
+    return depth
+
+
+def read_basis_channels(pb, fcurves_by_path, frames):
+    """读取骨骼基础变换的F曲线，生成基础矩阵数组(F,4,4)"""
+    count = len(frames)
+    base_path = f'pose.bones["{bpy.utils.escape_identifier(pb.name)}"].'
+
+    def channel(prop, size, default):
+        values = np.empty((count, size))
+        for i in range(size):
+            fc = fcurves_by_path.get((base_path + prop, i))
+            values[:, i] = sample_fcurve(fc, frames) if fc else default[i]
+        return values
+
+    loc = channel('location', 3, pb.location)
+    scale = channel('scale', 3, pb.scale)
+    mode = pb.rotation_mode
+    if mode == 'QUATERNION':
+        rot3 = quat_to_mat3(channel('rotation_quaternion', 4, pb.rotation_quaternion))
+    elif mode in EULER_MODES:
+        rot3 = euler_to_mat3(channel('rotation_euler', 3, pb.rotation_euler), mode)
+    else:
+        axis_angle = channel('rotation_axis_angle', 4, pb.rotation_axis_angle)
+        rot3 = np.array([np.array(Matrix.Rotation(a[0], 3, a[1:4])) for a in axis_angle])
+    return compose_matrices(loc, rot3, scale)
+
+
+def sample_source_by_fcurves(source, bone_names, frames):
+    """不经过依赖图，直接由F曲线正向求解源骨架骨骼的姿态矩阵
+
+    Args:
+        source: 源骨架物体
+        bone_names: 需要求解的骨骼名称
+        frames: 采样帧数组
+
+    Returns:
+        {骨骼名称: 姿态矩阵数组(F,4,4)}，骨骼链中存在约束或非完全继承时返回None
+    """
+    # 收集骨骼及其所有父级
+    needed = {}
+    for name in bone_names:
+        pb = source.pose.bones.get(name)
+        while pb and pb.name not in needed:
+            needed[pb.name] = pb
+            pb = pb.parent
+
+    for pb in needed.values():
+        if not has_full_inherit(pb.bone):
+            return None
+        if any(is_constraint_active(con) for con in pb.constraints):
+            return None
+
+    fcurves_by_path = {(fc.data_path, fc.array_index): fc for fc in get_action_fcurves(source)}
+
+    poses = {}
+    for pb in sorted(needed.values(), key=lambda b: get_depth(b.bone)):
+        basis = read_basis_channels(pb, fcurves_by_path, frames)
+        rel = np.array(rest_relation(pb.bone))
+        if pb.parent:
+            poses[pb.name] = poses[pb.parent.name] @ rel @ basis
+        else:
+            poses[pb.name] = rel @ basis
+    return poses
+
+
+def sample_pose_by_depsgraph(scene, targets, frames):
+    """逐帧刷新场景，在同一遍中读取多个物体的骨骼姿态矩阵（约束求值后）与世界矩阵
+
+    Args:
+        scene: 场景
+        targets: [(物体, 骨骼名称列表)]
+        frames: 采样帧数组
+
+    Returns:
+        与targets顺序一致的列表: [({骨骼名称: 姿态矩阵数组(F,4,4)}, 世界矩阵数组(F,4,4))]
+    """
+    samples = []
+    for obj, bone_names in targets:
+        index = {pb.name: i for i, pb in enumerate(obj.pose.bones)}
+        buffer = np.empty(len(obj.pose.bones) * 16, dtype=np.float32)
+        poses = {name: np.empty((len(frames), 4, 4)) for name in bone_names}
+        samples.append((obj, index, buffer, poses, np.empty((len(frames), 4, 4))))
+
+    for fi, frame in enumerate(frames):
+        scene.frame_set(int(frame))
+        for obj, index, buffer, poses, worlds in samples:
+            obj.pose.bones.foreach_get('matrix', buffer)
+            # Blender矩阵按列存储，需要转置
+            matrices = buffer.reshape(-1, 4, 4).transpose(0, 2, 1)
+            for name, pose in poses.items():
+                pose[fi] = matrices[index[name]]
+            worlds[fi] = np.array(obj.matrix_world)
+    return [(poses, worlds) for _, _, _, poses, worlds in samples]
+
+
+def has_object_animation(obj):
+    """物体的世界矩阵是否随帧变化（物体级F曲线、驱动器、约束，或父级带有动画）"""
+    while obj is not None:
+        if any(is_constraint_active(con) for con in obj.constraints):
+            return True
+        anim_data = obj.animation_data
+        if anim_data:
+            paths = [fc.data_path for fc in get_action_fcurves(obj)] + [fc.data_path for fc in anim_data.drivers]
+            if any(not path.startswith('pose.') for path in paths):
+                return True
+        obj = obj.parent
+    return False
+
+
+def set_bac_constraints_enabled(arm, state):
+    """启用或禁用骨架上所有映射约束"""
+    for pb in arm.pose.bones:
+        for con in pb.constraints:
+            if con.name in BAC_CONSTRAINTS:
+                if bpy.app.version >= (3, 0, 0):
+                    con.enabled = state
+                else:
+                    con.mute = not state
+
+
+def write_channel(arm, action, data_path, group_name, frames, values):
+    """使用foreach_set批量写入一组F曲线关键帧"""
+    count = len(frames)
+    co = np.empty(count * 2, dtype=np.float64)
+    co[0::2] = frames
+    for i in range(values.shape[1]):
+        fcurve = ensure_fcurve(arm, action, data_path, i, group_name)
+        fcurve.keyframe_points.clear()
+        fcurve.keyframe_points.add(count)
+        co[1::2] = values[:, i]
+        fcurve.keyframe_points.foreach_set('co', co)
+        fcurve.update()
+
+
+def solve_owner_poses(arm, mappings, chains, basis, poses, source_world, frames):
+    """按映射表的约束计算方式求出自身骨骼的姿态与基础变换
+
+    Args:
+        arm: 映射骨架
+        mappings: {自身骨骼名称: 映射}
+        chains: {自身骨骼名称: (未映射父级链, 被映射祖先名称)}
+        basis: {未映射父级名称: 基础矩阵}
+        poses: {源骨骼名称: 姿态矩阵数组(F,4,4)}
+        source_world: 源骨架世界矩阵(4,4)或(F,4,4)
+        frames: 烘焙帧数组
+
+    Returns:
+        ({自身骨骼名称: 姿态矩阵数组(F,4,4)}, {自身骨骼名称: 父级空间矩阵数组(F,4,4)},
+        {自身骨骼名称: (位置, 旋转属性名, 旋转数值, 缩放)})
+    """
+    arm_world = np.array(arm.matrix_world)
+    arm_world_inv = np.linalg.inv(arm_world)
+
+    owner_pose = {}
+    owner_space = {}
+    owner_channels = {}
+    for name in sorted(mappings, key=lambda n: get_depth(arm.pose.bones[n].bone)):
+        m = mappings[name]
+        pb = arm.pose.bones[name]
+
+        # 父级姿态: 被映射祖先的姿态乘以中间未映射骨骼的静态关系
+        chain, ancestor = chains[name]
+        parent_pose = chain_matrix(chain, basis)[None]
+        if ancestor:
+            parent_pose = owner_pose[ancestor] @ parent_pose
+
+        space = parent_pose @ np.array(rest_relation(pb.bone))
+        free_world = arm_world @ space @ np.array(pb.matrix_basis)
+        free_loc, _, free_scale = split_matrices(free_world)
+        if len(free_loc) != len(frames):
+            free_loc = np.repeat(free_loc, len(frames), axis=0)
+            free_scale = np.repeat(free_scale, len(frames), axis=0)
+
+        # 复制旋转（世界空间）
+        target_world = source_world @ poses[m.target]
+        target_loc, target_rot, _ = split_matrices(target_world)
+        rot = target_rot
+
+        # 旋转偏移（目标骨骼空间内的额外旋转）
+        if m.has_rotoffs:
+            order = pb.rotation_mode if pb.rotation_mode in EULER_MODES else 'XYZ'
+            offset = np.array(Euler(m.offset, order).to_matrix())
+            rot = rot @ offset
+
+        # 复制位置（世界空间）
+        loc = free_loc
+        if m.has_loccopy:
+            for axis in range(3):
+                if m.loc_axis[axis]:
+                    loc[:, axis] = target_loc[:, axis]
+
+        pose = arm_world_inv @ compose_matrices(loc, rot, free_scale)
+        owner_pose[name] = pose
+
+        b_loc, b_rot, b_scale = split_matrices(np.linalg.inv(space) @ pose)
+        rot_prop, rot_values = mat3_to_rotation_channel(pb.rotation_mode, b_rot)
+        owner_space[name] = np.broadcast_to(space, (len(frames), 4, 4))
+        owner_channels[name] = (b_loc, rot_prop, rot_values, b_scale)
+    return owner_pose, owner_space, owner_channels
+
+
+def sample_indices(count, samples=VERIFY_SAMPLES):
+    """在帧数组中均匀选取抽样帧的索引（包含首尾帧）"""
+    return np.unique(np.linspace(0, count - 1, min(samples, count)).round().astype(int))
+
+
+def carry_reference_bones(owner_pose, reference, indices, bone_names):
+    """由求解结果推算未映射骨骼的姿态
+
+    未映射的骨骼（例如跟随FK控制器的ORG骨骼）在抽样帧上与某根映射骨骼保持固定的相对关系时，
+    用该映射骨骼的求解姿态乘以这一关系得到所有帧的姿态，不需要逐帧刷新场景
+
+    Args:
+        owner_pose: {映射骨骼名称: 求解的姿态矩阵数组(F,4,4)}
+        reference: {骨骼名称: 抽样帧上约束求值的姿态矩阵数组(S,4,4)}
+        indices: 抽样帧在帧数组中的索引
+        bone_names: 需要推算的骨骼名称
+
+    Returns:
+        {骨骼名称: 姿态矩阵数组(F,4,4)}，找不到保持固定关系的映射骨骼时不包含该骨骼
+    """
+    result = {}
+    for name in bone_names:
+        if name in owner_pose:
+            result[name] = owner_pose[name]
+            continue
+        best = None
+        for owner, pose in owner_pose.items():
+            rel = np.linalg.inv(pose[indices]) @ reference[name]
+            deviation = np.abs(rel - rel[0]).max()
+            if best is None or deviation < best[0]:
+                best = (deviation, owner, rel[0])
+        if best is not None and best[0] <= VERIFY_TOLERANCE:
+            result[name] = owner_pose[best[1]] @ best[2]
+    return result
+
+
+def direct_bake_mappings(context, arm, frame_start, frame_end, step=1, verify=True, reference_bones=(),
+                         on_reference=None):
+    """不使用约束求值，直接根据骨骼映射表烘焙动画
+
+    根据映射表中的复制旋转、旋转偏移、复制位置设置，按约束的计算方式直接求出自身骨骼的基础变换，
+    并通过foreach_set批量写入关键帧。遇到无法直接计算的情况（IK映射、自身骨骼或其与被映射祖先之间的骨骼
+    带有其他约束、驱动器或非完全继承，骨架物体变换带有动画等）或校验不通过时返回0，由调用者回退到可视化烘焙
+
+    Args:
+        context: 上下文
+        arm: 映射骨架（自身骨架）
+        frame_start: 起始帧
+        frame_end: 结束帧
+        step: 帧步长
+        verify: 是否在几个抽样帧上与约束求值的结果对比
+        reference_bones: 回调中需要的其他骨骼，未映射的骨骼由 carry_reference_bones 推算
+        on_reference: 求解并校验后调用 on_reference(frames, poses)，poses为映射骨骼与能够推算的reference_bones
+            在所有烘焙帧上的姿态。回调可以修改未映射父级（如root）的基础变换，关键帧按修改后的状态求解
+
+    Returns:
+        烘焙的骨骼数量，回退时返回0
+    """
+    time_start = time.time()
+    scene = context.scene
+    s = arm.data.mmr_kumopult_bac
+    source = s.target
+    if source is None:
+        return 0
+
+    # 有效映射（同一自身骨骼只取第一条）
+    mappings = {}
+    for m in s.mappings:
+        if m.owner in mappings:
+            continue
+        if arm.pose.bones.get(m.owner) and source.pose.bones.get(m.target):
+            if m.has_ik:
+                print(f"直接烘焙: 骨骼 {m.owner} 使用了IK映射，回退到可视化烘焙")
+                return 0
+            mappings[m.owner] = m
+    if not mappings:
+        return 0
+
+    # 自身骨骼只支持完全继承且没有其他约束、驱动器
+    driver_paths = get_animated_paths(arm, include_action=False)
+    for name in mappings:
+        pb = arm.pose.bones[name]
+        if not has_full_inherit(pb.bone):
+            print(f"直接烘焙: 骨骼 {name} 未完全继承父级变换，回退到可视化烘焙")
+            return 0
+        if any(is_constraint_active(con) for con in pb.constraints if con.name not in BAC_CONSTRAINTS):
+            print(f"直接烘焙: 骨骼 {name} 带有其他约束，回退到可视化烘焙")
+            return 0
+        if is_bone_animated(pb, driver_paths):
+            print(f"直接烘焙: 骨骼 {name} 带有驱动器，回退到可视化烘焙")
+            return 0
+
+    # 自身骨骼与被映射祖先之间的骨骼必须保持静态关系（没有约束、驱动器、动画且完全继承）
+    animated_paths = get_animated_paths(arm)
+    chains = {}
+    basis = {}
+    for name in mappings:
+        chain, ancestor = get_parent_chain(arm.pose.bones[name], mappings)
+        for pb in chain:
+            if pb.name in basis:
+                continue
+            if not has_full_inherit(pb.bone) or any(is_constraint_active(con) for con in pb.constraints) \
+                    or is_bone_animated(pb, animated_paths):
+                print(f"直接烘焙: 骨骼 {name} 的父级 {pb.name} 带有约束、驱动器、动画或未完全继承，回退到可视化烘焙")
+                return 0
+            basis[pb.name] = np.array(pb.matrix_basis)
+        chains[name] = (chain, ancestor)
+
+    if has_object_animation(arm):
+        print(f"直接烘焙: 骨架 {arm.name} 的物体变换带有动画，回退到可视化烘焙")
+        return 0
+
+    frames = make_frames(frame_start, frame_end, step)
+    frame_current = scene.frame_current
+
+    # 源骨架物体带有动画或约束时需要逐帧读取其姿态
+    target_names = list({m.target for m in mappings.values()})
+    source_world = np.array(source.matrix_world)
+    poses = None
+    if has_object_animation(source):
+        print("直接烘焙: 源骨架的物体变换带有动画，逐帧读取源骨架姿态")
+    else:
+        poses = sample_source_by_fcurves(source, target_names, frames)
+        if poses is None:
+            print("直接烘焙: 源骨架带有约束，逐帧读取源骨架姿态")
+    if poses is None:
+        [(poses, source_world)] = sample_pose_by_depsgraph(scene, [(source, target_names)], frames)
+        scene.frame_set(frame_current)
+
+    # 关闭映射约束前只在几个抽样帧上读取约束求值的参考姿态
+    extra_bones = [name for name in reference_bones if name not in mappings]
+    indices = sample_indices(len(frames))
+    reference = None
+    if verify or extra_bones:
+        [(reference, _)] = sample_pose_by_depsgraph(scene, [(arm, list(mappings) + extra_bones)], frames[indices])
+        scene.frame_set(frame_current)
+    time_sample = time.time()
+
+    owner_pose, owner_space, owner_channels = solve_owner_poses(arm, mappings, chains, basis, poses,
+                                                                source_world, frames)
+    time_solve = time.time()
+
+    # 抽样校验: 由将要写入的关键帧数值重新组成姿态，与抽样帧上约束求值的结果对比
+    if verify:
+        errors = {}
+        for name, (b_loc, rot_prop, rot_values, b_scale) in owner_channels.items():
+            rot3 = rotation_channel_to_mat3(arm.pose.bones[name].rotation_mode, rot_values[indices])
+            pose = owner_space[name][indices] @ compose_matrices(b_loc[indices], rot3, b_scale[indices])
+            errors[name] = np.abs(pose - reference[name]).max(axis=(1, 2))
+        worst = max(errors, key=lambda n: errors[n].max())
+        if errors[worst].max() > VERIFY_TOLERANCE:
+            frame = int(frames[indices[int(np.argmax(errors[worst]))]])
+            print(f"直接烘焙: 骨骼 {worst} 在第 {frame} 帧的误差 {errors[worst].max():.6f} 超出范围，回退到可视化烘焙")
+            return 0
+
+    # 回调修改了父级的基础变换时按修改后的状态重新求解
+    write_channels = owner_channels
+    if on_reference:
+        on_reference(frames, carry_reference_bones(owner_pose, reference or {}, indices, reference_bones))
+        final_basis = {name: np.array(arm.pose.bones[name].matrix_basis) for name in basis}
+        if not all(np.array_equal(final_basis[name], basis[name]) for name in basis):
+            _, _, write_channels = solve_owner_poses(arm, mappings, chains, final_basis, poses,
+                                                     source_world, frames)
+            time_solve = time.time()
+
+    # 关闭映射约束，写入新动作
+    set_bac_constraints_enabled(arm, False)
+    if arm.animation_data is None:
+        arm.animation_data_create()
+    action = bpy.data.actions.new(name="Action")
+    arm.animation_data.action = action
+
+    for name, (b_loc, rot_prop, rot_values, b_scale) in write_channels.items():
+        base_path = f'pose.bones["{bpy.utils.escape_identifier(name)}"].'
+        write_channel(arm, action, base_path + 'location', name, frames, b_loc)
+        write_channel(arm, action, base_path + rot_prop, name, frames, rot_values)
+        write_channel(arm, action, base_path + 'scale', name, frames, b_scale)
+    time_write = time.time()
+
+    print(f"直接烘焙: {len(owner_channels)} 根骨骼, {len(frames)} 帧, "
+          f"采样 {time_sample - time_start:.2f}s, 求解 {time_solve - time_sample:.2f}s, "
+          f"写入 {time_write - time_solve:.2f}s, 总计 {time.time() - time_start:.2f}s")
+    return len(owner_channels)
@@ -6,6 +6,12 @@ from typing import List, Optional, Iterator, Generator
 import bpy
 from mathutils import Vector, Euler
 
+from .physics_common import create_constraint_template, allocate_constraint_empties, solve_collision_collections, \
+    pairs_sharing_collections, apply_collision_collections, restore_collision_collections, diff_constraint_empties, \
+    find_constraint_template, find_unmanaged_colliders
+from .physics_snapshot import rigid_body_entry, joint_entry, save_physics_snapshot, load_physics_snapshot, \
+    clear_physics_snapshot, diff_physics_snapshot, needs_full_rebuild, goto_cache_start
+
 # 设置日志
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
@@ -987,8 +993,8 @@ class Model:
         start_time = time.time()
 
         context = FnContext.ensure_context()
-        # 创建非碰撞约束对象
-        ncc_obj = FnContext.new_and_link_object(context, name="ncc", object_data=None)
+        # 创建非碰撞约束模板（仅调用一次操作符，不改变当前选择）
+        ncc_obj = create_constraint_template(context, context.collection, "ncc")
         ncc_obj.location = [0, 0, 0]
         setattr(ncc_obj, Props.empty_display_type, "ARROWS")
         setattr(ncc_obj, Props.empty_display_size, 0.5 * getattr(self.__root, Props.empty_display_size))
@@ -996,40 +1002,10 @@ class Model:
         ncc_obj.hide_render = True
         ncc_obj.parent = self.temporaryGroupObject()
 
-        # 保存当前选择和活动对象
-        original_active_obj = context.view_layer.objects.active
-        original_selected_objs = context.selected_objects
-        
-        # 设置新对象为活动对象并选择
-        bpy.ops.object.select_all(action='DESELECT')
-        FnContext.set_active_object(context, ncc_obj)
-        ncc_obj.select_set(True)
-        
-        # 添加刚体约束
-        bpy.ops.rigidbody.constraint_add(type="GENERIC")
-        rb = ncc_obj.rigid_body_constraint
-        if rb is not None:
-            rb.disable_collisions = True  # 设置为非碰撞约束
-        
-        # 恢复之前的选择和活动对象
-        bpy.ops.object.select_all(action='DESELECT')
-        if original_active_obj:
-            original_active_obj.select_set(True)
-            FnContext.set_active_object(context, original_active_obj)
-        for original_obj in original_selected_objs:
-            original_obj.select_set(True)
-
-        # 复制约束对象
-        ncc_objs = FnContext.duplicate_object(context, ncc_obj, total_len)
+        # 批量复制约束对象并设置对应的刚体对象对
+        ncc_objs = allocate_constraint_empties(ncc_obj, nonCollisionJointTable, context.collection,
+                                               parent=ncc_obj.parent)
         logging.debug(" created %d ncc.", len(ncc_objs))
-
-        # 为每个约束设置对应的刚体对象对
-        for ncc_obj, pair in zip(ncc_objs, nonCollisionJointTable):
-            rbc = ncc_obj.rigid_body_constraint
-            if rbc is not None:
-                rbc.object1, rbc.object2 = pair  # 设置约束连接的两个刚体
-            ncc_obj.hide_set(True)  # 隐藏约束对象
-            ncc_obj.hide_select = True  # 不可选择
         logging.debug(" finish in %f seconds.", time.time() - start_time)
         logging.debug("-" * 60)
 
@@ -1152,7 +1128,8 @@ class Model:
 
         rb.collision_shape = rigid.shape  # 设置碰撞形状
 
-    def buildRigids(self, non_collision_distance_scale: float, collision_margin: float) -> List[bpy.types.Object]:
+    def buildRigids(self, non_collision_distance_scale: float, collision_margin: float,
+                    non_collision_mode: str = "CONSTRAINT") -> List[bpy.types.Object]:
         """构建刚体系统的主要方法
         
         该方法执行以下操作：
@@ -1165,6 +1142,7 @@ class Model:
         Args:
             non_collision_distance_scale: 非碰撞距离缩放系数
             collision_margin: 碰撞边距值
+            non_collision_mode: 非碰撞的表示方式，"COLLECTION"时优先使用刚体碰撞集合
             
         Returns:
             处理完成的所有刚体对象列表
@@ -1173,7 +1151,40 @@ class Model:
         logging.debug(" Build riggings of rigid bodies")
         logging.debug("--------------------------------")
         rigid_objects = list(self.rigidBodies())
+        rigid_object_cnt = len(rigid_objects)
+
+        logging.info("Creating non collision constraints")
+        nonCollisionJointTable = self.__buildNonCollisionJointTable(
+            rigid_objects, non_collision_distance_scale, non_collision_mode)
+
+        # 更新所有刚体对象
+        for cnt, i in enumerate(rigid_objects):
+            logging.info("%3d/%3d: Updating rigid body %s", cnt + 1, rigid_object_cnt, i.name)
+            self.updateRigid(i, collision_margin)
         
+        # 创建非碰撞约束
+        self.__createNonCollisionConstraint(nonCollisionJointTable)
+        return rigid_objects
+
+    def __rigidLocation(self, obj: bpy.types.Object) -> Vector:
+        """获取刚体构建前的位置（构建后使用备份的位置）"""
+        location = obj.get("__backup_location__", None)
+        return Vector(location) if location is not None else obj.location
+
+    def __buildNonCollisionJointTable(self, rigid_objects: List[bpy.types.Object], non_collision_distance_scale: float,
+                                      non_collision_mode: str) -> List[tuple]:
+        """分析碰撞组掩码，生成需要非碰撞约束的刚体对
+
+        已有关节连接的刚体对直接在关节上禁用碰撞；碰撞集合模式下设置刚体的碰撞集合，只保留仍会碰撞的刚体对。
+
+        Args:
+            rigid_objects: 所有刚体对象
+            non_collision_distance_scale: 非碰撞距离缩放系数
+            non_collision_mode: 非碰撞的表示方式
+
+        Returns:
+            非碰撞约束对列表
+        """
         # 将刚体按碰撞组分组（共16组）
         rigid_object_groups = [[] for _ in range(16)]
         for i in rigid_objects:
@@ -1192,11 +1203,9 @@ class Model:
             # 使用frozenset作为键，确保顺序不影响查找
             jointMap[frozenset((rbc.object1, rbc.object2))] = joint
 
-        logging.info("Creating non collision constraints")
         # 创建非碰撞约束表和已处理的约束对集合
         nonCollisionJointTable = []
         non_collision_pairs = set()
-        rigid_object_cnt = len(rigid_objects)
         
         # 遍历所有刚体，分析碰撞组掩码并创建非碰撞约束
         for obj_a in rigid_objects:
@@ -1222,21 +1231,39 @@ class Model:
                             joint.rigid_body_constraint.disable_collisions = True
                     else:
                         # 计算两个刚体之间的距离
-                        distance = (obj_a.location - obj_b.location).length
+                        distance = (self.__rigidLocation(obj_a) - self.__rigidLocation(obj_b)).length
                         # 如果距离小于阈值，创建非碰撞约束
                         if distance < non_collision_distance_scale * (self.__getRigidRange(obj_a) + self.__getRigidRange(obj_b)) * 0.5:
                             nonCollisionJointTable.append((obj_a, obj_b))
                     
                     non_collision_pairs.add(pair)  # 标记为已处理
         
-        # 更新所有刚体对象
-        for cnt, i in enumerate(rigid_objects):
-            logging.info("%3d/%3d: Updating rigid body %s", cnt + 1, rigid_object_cnt, i.name)
-            self.updateRigid(i, collision_margin)
-        
-        # 创建非碰撞约束
-        self.__createNonCollisionConstraint(nonCollisionJointTable)
-        return rigid_objects
+        # 碰撞集合模式：用碰撞集合表示碰撞组遮罩，只为剩余冲突的刚体对创建非碰撞约束
+        layers = None
+        if non_collision_mode == "COLLECTION":
+            layers = solve_collision_collections(
+                [i.mmd_rigid.collision_group_number for i in rigid_objects],
+                [i.mmd_rigid.collision_group_mask for i in rigid_objects],
+            )
+            if layers is None:
+                logging.info("Not enough collision collections, fall back to non collision constraints")
+        if layers is None:
+            restore_collision_collections(rigid_objects)
+        else:
+            unmanaged = find_unmanaged_colliders(bpy.context.scene, rigid_objects)
+            if unmanaged:
+                logging.warning("%d rigid bodies no longer collide with the model: %s",
+                                len(unmanaged), ', '.join(obj.name for obj in unmanaged[:5]))
+            apply_collision_collections(rigid_objects, layers)
+            rigid_index = {obj: n for n, obj in enumerate(rigid_objects)}
+            remaining = set(pairs_sharing_collections(
+                [(rigid_index[a], rigid_index[b]) for a, b in nonCollisionJointTable], layers))
+            avoided = len(nonCollisionJointTable) - len(remaining)
+            nonCollisionJointTable = [pair for pair in nonCollisionJointTable
+                                      if (rigid_index[pair[0]], rigid_index[pair[1]]) in remaining]
+            logging.info("Using %d collision collections, %d ncc avoided",
+                         int(layers.any(axis=0).sum()), avoided)
+        return nonCollisionJointTable
 
     def buildJoints(self):
         """构建和更新所有关节对象的位置和旋转
@@ -1324,6 +1351,9 @@ class Model:
             # 恢复刚体的原始变换
             self.__restoreTransforms(i)
 
+        # 恢复碰撞集合模式修改的碰撞集合
+        restore_collision_collections(self.rigidBodies())
+
         # 恢复所有关节的原始变换
         for i in self.joints():
             self.__restoreTransforms(i)
@@ -1357,11 +1387,13 @@ class Model:
         
         logging.info(" Finished cleaning in %f seconds.", time.time() - start_time)
         mmd_root.is_built = False  # 标记物理未构建
+        clear_physics_snapshot(self.__root)
         
         # 恢复刚体世界的原始启用状态
         rigid_body.setRigidBodyWorldEnabled(rigidbody_world_enabled)
 
-    def build(self, non_collision_distance_scale: float = 1.5, collision_margin: float = 1e-06):
+    def build(self, non_collision_distance_scale: float = 1.5, collision_margin: float = 1e-06,
+              non_collision_mode: str = "CONSTRAINT"):
         """构建完整的MMD物理系统
         
         该方法是物理构建的主要入口点，协调以下步骤：
@@ -1377,6 +1409,7 @@ class Model:
         Args:
             non_collision_distance_scale: 非碰撞距离缩放系数，用于确定何时创建额外的非碰撞约束
             collision_margin: 碰撞边距值，用于调整刚体碰撞检测的精度
+            non_collision_mode: 非碰撞的表示方式，"CONSTRAINT"逐对创建约束，"COLLECTION"优先使用碰撞集合
         """
         # 临时禁用刚体世界并保存当前启用状态
         rigidbody_world_enabled = rigid_body.setRigidBodyWorldEnabled(False)
@@ -1398,19 +1431,111 @@ class Model:
         self.__preBuild()
         
         # 构建刚体和非碰撞约束
-        self.buildRigids(non_collision_distance_scale, collision_margin)
+        self.buildRigids(non_collision_distance_scale, collision_margin, non_collision_mode)
         
         # 构建和更新关节
         self.buildJoints()
         
         # 执行后构建清理和收尾工作
         self.__postBuild()
+
+        # 记录快照，供增量更新对比（在缓存开始帧读取刚体变换）
+        scene = bpy.context.scene
+        context_frame = goto_cache_start(scene)
+        rigid_entries, joint_entries = self.__physicsSnapshot()
+        save_physics_snapshot(self.__root, rigid_entries, joint_entries, [non_collision_distance_scale, non_collision_mode])
+        scene.frame_set(context_frame)
         
         logging.info(" Finished building in %f seconds.", time.time() - start_time)
         
         # 恢复刚体世界的原始启用状态
         rigid_body.setRigidBodyWorldEnabled(rigidbody_world_enabled)
 
+    def __physicsSnapshot(self):
+        """当前刚体与关节的快照项
+
+        Returns:
+            (刚体快照项, 关节快照项)
+        """
+        rigid_entries = {}
+        for obj in self.rigidBodies():
+            rigid = obj.mmd_rigid
+            rigid_entries[obj.name] = rigid_body_entry(
+                obj, rigid.collision_group_number, rigid.collision_group_mask, rigid.bone, rigid.type)
+        joint_entries = {obj.name: joint_entry(obj) for obj in self.joints() if obj.rigid_body_constraint}
+        return rigid_entries, joint_entries
+
+    def update(self, non_collision_distance_scale: float = 1.5, collision_margin: float = 1e-06,
+               non_collision_mode: str = "CONSTRAINT"):
+        """增量更新已构建的物理系统
+
+        与上次构建的快照对比：质量、摩擦、关节限制等参数直接在刚体上生效；
+        碰撞组或尺寸改变时只更新非碰撞约束；刚体或关节增删、骨骼/类型/变换改变时完整重建。
+
+        Args:
+            non_collision_distance_scale: 非碰撞距离缩放系数
+            collision_margin: 碰撞边距值
+            non_collision_mode: 非碰撞的表示方式
+        """
+        if not self.__root.mmd_root.is_built:
+            self.build(non_collision_distance_scale, collision_margin, non_collision_mode)
+            return
+
+        settings = [non_collision_distance_scale, non_collision_mode]
+
+        # 模拟会改写其他帧的刚体变换，在缓存开始帧对比快照
+        scene = bpy.context.scene
+        context_frame = goto_cache_start(scene)
+
+        rigid_entries, joint_entries = self.__physicsSnapshot()
+        diff = diff_physics_snapshot(load_physics_snapshot(self.__root), rigid_entries, joint_entries, settings)
+        if needs_full_rebuild(diff):
+            logging.info(" Structure changed, rebuild rig")
+            self.clean()
+            self.build(non_collision_distance_scale, collision_margin, non_collision_mode)
+            scene.frame_set(context_frame)
+            return
+
+        rigidbody_world_enabled = rigid_body.setRigidBodyWorldEnabled(False)
+        start_time = time.time()
+        rigid_objects = list(self.rigidBodies())
+
+        # 碰撞边距直接生效
+        for i in rigid_objects:
+            rb = i.rigid_body
+            if rb is None:
+                continue
+            rb.use_margin = collision_margin != 0.0
+            if rb.use_margin:
+                rb.collision_margin = collision_margin
+
+        created = removed = 0
+        if diff["collision"] or diff["settings"]:
+            nonCollisionJointTable = self.__buildNonCollisionJointTable(
+                rigid_objects, non_collision_distance_scale, non_collision_mode)
+            existing = [i for i in self.temporaryObjects() if i.mmd_type == "NON_COLLISION_CONSTRAINT"]
+            stale, new_pairs = diff_constraint_empties(existing, nonCollisionJointTable)
+            for i in stale:
+                bpy.data.objects.remove(i, do_unlink=True)
+            removed = len(stale)
+
+            if new_pairs:
+                template = find_constraint_template(existing)
+                if template is None:
+                    self.__createNonCollisionConstraint(new_pairs)
+                else:
+                    context = FnContext.ensure_context()
+                    allocate_constraint_empties(template, new_pairs, context.collection, parent=template.parent)
+                created = len(new_pairs)
+
+        rigid_entries, joint_entries = self.__physicsSnapshot()
+        save_physics_snapshot(self.__root, rigid_entries, joint_entries, settings)
+        scene.frame_set(context_frame)
+        logging.info(" Updated rig in %f seconds: %d params changed, %d ncc created, %d ncc removed",
+                     time.time() - start_time, len(diff["params"]), created, removed)
+
+        rigid_body.setRigidBodyWorldEnabled(rigidbody_world_enabled)
+
 # Blender操作符类
 # 用于构建MMD刚体物理系统的Blender操作符
 class MMD_RIG_PHYSICS_BUILD(bpy.types.Operator):
@@ -1438,6 +1563,13 @@ class MMD_RIG_PHYSICS_BUILD(bpy.types.Operator):
         default=1e-06,  # 默认值
     )
 
+    # 已构建时增量更新，而不是解除物理
+    incremental: bpy.props.BoolProperty(
+        name="Incremental",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+
     def execute(self, context):
         """执行操作符的主要逻辑
         
@@ -1495,7 +1627,10 @@ class MMD_RIG_PHYSICS_BUILD(bpy.types.Operator):
         try:
             # 创建Model对象并构建物理系统
             rig = Model(root_object)
-            rig.build(self.non_collision_distance_scale, self.collision_margin)
+            if self.incremental:
+                rig.update(self.non_collision_distance_scale, self.collision_margin, context.scene.mmr.non_collision_mode)
+            else:
+                rig.build(self.non_collision_distance_scale, self.collision_margin, context.scene.mmr.non_collision_mode)
             
             # 设置根对象为活动对象
             FnContext.set_active_object(context, root_object)
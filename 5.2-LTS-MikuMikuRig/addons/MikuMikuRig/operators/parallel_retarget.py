@@ -0,0 +1,277 @@
+"""多进程并行重定向
+
+将 (骨架.blend, 动作文件) 任务列表分配给多个无界面Blender进程，每个进程运行 batch_retarget_cli.py，
+完成后从各进程输出的.blend文件中追加动作到当前文件。
+
+命令行运行（在主文件中）:
+
+    blender -b master.blend --python parallel_retarget.py -- --jobs jobs.json --workers 8
+
+jobs.json 格式: [{"rig": "D:/rig.blend", "motion": "D:/mocap/a.fbx", "armature": "RIG-xxx"}, ...]
+"armature" 可省略。未指定 --jobs 时可使用 --rig 与 --source 指定单个骨架文件和动作文件夹。
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+# 工作进程使用的命令行脚本
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'batch_retarget_cli.py')
+
+# 工作进程失败时保留的输出行数
+LOG_TAIL_LINES = 20
+
+
+def split_jobs(files, workers):
+    """按文件大小将动作文件分配给多个工作进程（大文件优先分配给当前负载最小的进程）"""
+    buckets = [[] for _ in range(max(1, workers))]
+    loads = [0] * len(buckets)
+    for path in sorted(files, key=lambda p: os.path.getsize(p) if os.path.exists(p) else 0, reverse=True):
+        i = loads.index(min(loads))
+        buckets[i].append(path)
+        loads[i] += os.path.getsize(path) if os.path.exists(path) else 0
+    return [b for b in buckets if b]
+
+
+def build_tasks(jobs, workers, temp_dir):
+    """将任务列表按骨架文件分组，并拆分为工作进程任务"""
+    groups = {}
+    for job in jobs:
+        key = (os.path.abspath(job['rig']), job.get('armature', ''))
+        groups.setdefault(key, []).append(os.path.abspath(job['motion']))
+
+    # 每个骨架文件按动作数量分配进程数
+    total = sum(len(files) for files in groups.values())
+    tasks = []
+    for (rig, armature), files in groups.items():
+        group_workers = max(1, round(workers * len(files) / total))
+        for chunk in split_jobs(files, min(group_workers, len(files))):
+            index = len(tasks)
+            file_list = os.path.join(temp_dir, f'worker_{index}.txt')
+            with open(file_list, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(chunk))
+            tasks.append({
+                'index': index,
+                'rig': rig,
+                'armature': armature,
+                'files': chunk,
+                'file_list': file_list,
+                'output': os.path.join(temp_dir, f'worker_{index}.blend'),
+                'report': os.path.join(temp_dir, f'worker_{index}.json'),
+            })
+    return tasks
+
+
+def run_worker(blender_path, task, direct_bake=True):
+    """运行一个无界面Blender工作进程"""
+    cmd = [blender_path, '-b', task['rig'], '--python', WORKER_SCRIPT, '--',
+           '--file-list', task['file_list'], '--output', task['output'], '--report', task['report']]
+    if task['armature']:
+        cmd += ['--armature', task['armature']]
+    if not direct_bake:
+        cmd.append('--no-direct-bake')
+
+    time_start = time.time()
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace')
+    task['time'] = time.time() - time_start
+    task['returncode'] = proc.returncode
+    task['log'] = '\n'.join((proc.stdout + proc.stderr).splitlines()[-LOG_TAIL_LINES:])
+
+    task['report_data'] = None
+    if os.path.exists(task['report']):
+        with open(task['report'], encoding='utf-8') as f:
+            task['report_data'] = json.load(f)
+    print(f"工作进程 {task['index']} 完成: {len(task['files'])} 个动作, 返回码 {proc.returncode}, {task['time']:.2f}s")
+    return task
+
+
+def collect_worker_actions(blend_path, action_names, armature_name=''):
+    """从工作进程输出的.blend文件中追加动作，并添加到同名骨架的NLA轨道
+
+    当前文件中没有同名骨架时为动作设置伪用户，避免没有用户的动作在保存时被丢弃
+
+    Returns:
+        {工作进程中的动作名: 追加后的动作}（同名动作已存在时追加后的名称会带有后缀）
+    """
+    with bpy.data.libraries.load(blend_path, link=False) as (data_from, data_to):
+        requested = [name for name in action_names if name in data_from.actions]
+        data_to.actions = list(requested)
+
+    arm = bpy.data.objects.get(armature_name) if armature_name else None
+    if arm and arm.type == 'ARMATURE':
+        if arm.animation_data is None:
+            arm.animation_data_create()
+        for action in data_to.actions:
+            if action is None:
+                continue
+            nla_track = arm.animation_data.nla_tracks.new()
+            nla_track.name = action.name  # 重命名轨道
+            nla_strip = nla_track.strips.new(nla_track.name, int(action.frame_range[0]), action)
+            nla_strip.extrapolation = 'NOTHING'
+            nla_strip.blend_type = 'REPLACE'
+    else:
+        for action in data_to.actions:
+            if action is not None:
+                action.use_fake_user = True
+    return {name: action for name, action in zip(requested, data_to.actions) if action}
+
+
+def parallel_retarget(jobs, workers, blender_path=None, direct_bake=True, keep_temp=False):
+    """并行重定向
+
+    Args:
+        jobs: 任务列表 [{"rig": 骨架.blend, "motion": 动作文件, "armature": 骨架名称(可选)}]
+        workers: 工作进程数量
+        blender_path: Blender可执行文件路径，默认使用当前Blender
+        direct_bake: 是否优先使用直接烘焙
+        keep_temp: 是否保留工作进程的临时文件
+
+    Returns:
+        (成功列表[(文件, 动作名, 耗时)], 失败列表[(文件, 错误信息)])
+    """
+    blender_path = blender_path or bpy.app.binary_path
+    temp_dir = tempfile.mkdtemp(prefix='mmr_retarget_')
+    time_start = time.time()
+
+    tasks = build_tasks(jobs, workers, temp_dir)
+    print(f"并行重定向: {len(jobs)} 个动作, {len(tasks)} 个工作进程, 临时目录 {temp_dir}")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        tasks = list(executor.map(lambda t: run_worker(blender_path, t, direct_bake), tasks))
+
+    results = []
+    failures = []
+    for task in tasks:
+        report = task['report_data']
+        if report is None:
+            # 工作进程崩溃，所有动作记为失败
+            error = f"工作进程返回码 {task['returncode']}\n{task['log']}"
+            failures += [(path, error) for path in task['files']]
+            continue
+
+        for item in report['failures']:
+            failures.append((item['file'], item['error']))
+
+        names = [item['action'] for item in report['results']]
+        try:
+            collected = collect_worker_actions(task['output'], names, report['armature'])
+        except Exception as e:
+            failures += [(item['file'], f"追加动作失败: {e}") for item in report['results']]
+            continue
+        for item in report['results']:
+            if item['action'] in collected:
+                results.append((item['file'], collected[item['action']].name, item['time']))
+            else:
+                failures.append((item['file'], "输出文件中没有找到动作"))
+
+    if not keep_temp and not failures:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print("\n===== 并行重定向 =====")
+    for path, name, cost in results:
+        print(f"完成 {os.path.basename(path)} -> {name} ({cost:.2f}s)")
+    for path, error in failures:
+        print(f"失败 {os.path.basename(path)}: {error}")
+    print(f"总耗时 {time.time() - time_start:.2f}s")
+    return results, failures
+
+
+class MMR_Parallel_Retarget(bpy.types.Operator):
+    """ Retarget a folder of FBX/VMD actions with multiple background Blender processes """
+    bl_idname = 'object.mmr_parallel_retarget'
+    bl_label = 'Parallel retarget actions'
+    bl_options = {'REGISTER', 'UNDO'}  # 启用撤销功能
+
+    directory: bpy.props.StringProperty(subtype='DIR_PATH')
+    workers: bpy.props.IntProperty(
+        name="Workers",
+        description="同时运行的Blender进程数量",
+        default=4,
+        min=1,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.view_layer.objects.active
+        return obj is not None and obj.type == 'ARMATURE'
+
+    def execute(self, context):
+        arm = context.view_layer.objects.active
+
+        # 工作进程从已保存的文件中读取骨架
+        if not bpy.data.is_saved:
+            self.report({'ERROR'}, '请先保存文件')
+            return {'CANCELLED'}
+        bpy.ops.wm.save_mainfile()
+
+        directory = bpy.path.abspath(self.directory)
+        files = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                       if name.lower().endswith(('.fbx', '.vmd'))) if os.path.isdir(directory) else []
+        if not files:
+            self.report({'ERROR'}, '没有找到FBX/VMD动作文件')
+            return {'CANCELLED'}
+
+        jobs = [{'rig': bpy.data.filepath, 'motion': path, 'armature': arm.name} for path in files]
+        results, failures = parallel_retarget(jobs, self.workers, direct_bake=arm.mmr.direct_bake)
+
+        if failures:
+            self.report({'WARNING'}, f"并行重定向完成: 成功 {len(results)} 个, 失败 {len(failures)} 个")
+        else:
+            self.report({'INFO'}, f"并行重定向完成: 成功 {len(results)} 个")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        # 弹出文件夹选择对话框
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description='MikuMikuRig 并行重定向')
+    parser.add_argument('--jobs', default='', help='任务列表JSON文件')
+    parser.add_argument('--rig', default='', help='骨架.blend文件（未指定--jobs时使用）')
+    parser.add_argument('--source', default='', help='动作文件夹（未指定--jobs时使用）')
+    parser.add_argument('--armature', default='', help='映射骨架名称')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2), help='工作进程数量')
+    parser.add_argument('--blender', default='', help='Blender可执行文件路径')
+    parser.add_argument('--output', default='', help='保存路径，默认覆盖当前文件（未打开.blend文件时必须指定）')
+    parser.add_argument('--keep-temp', action='store_true', help='保留临时文件')
+    parser.add_argument('--no-direct-bake', action='store_true', help='禁用直接烘焙')
+    args = parser.parse_args(argv)
+
+    # 在启动工作进程之前确定保存路径，避免追加的动作在最后被丢弃
+    output = os.path.abspath(args.output) if args.output else bpy.data.filepath
+    if not output:
+        print("当前没有打开.blend文件，请使用--output指定保存路径")
+        sys.exit(1)
+
+    if args.jobs:
+        with open(args.jobs, encoding='utf-8') as f:
+            jobs = json.load(f)
+    else:
+        rig = args.rig or bpy.data.filepath
+        jobs = [{'rig': rig, 'motion': os.path.join(args.source, name), 'armature': args.armature}
+                for name in sorted(os.listdir(args.source)) if name.lower().endswith(('.fbx', '.vmd'))]
+    if not jobs:
+        print("没有可执行的任务")
+        sys.exit(1)
+
+    results, failures = parallel_retarget(jobs, args.workers, blender_path=args.blender or None,
+                                          direct_bake=not args.no_direct_bake, keep_temp=args.keep_temp)
+
+    bpy.ops.wm.save_as_mainfile(filepath=output)
+    print(f"已保存: {output}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""刚体物理缓存的烘焙与复用
+
+以动作（包括NLA轨道）、刚体/关节参数和刚体世界设置的哈希作为缓存键，键未改变且帧范围已被烘焙覆盖时直接复用烘焙结果，不再重新模拟。
+刚体的变换在缓存开始帧读取（模拟会改写其他帧的变换）。
+刚体世界的点缓存不支持磁盘缓存，烘焙结果随.blend文件保存，缓存键保存在场景的自定义属性中。
+"""
+import hashlib
+import time
+
+import bpy
+import numpy as np
+
+from .direct_bake import get_action_fcurves, get_slot_fcurves
+
+# 保存缓存状态的场景自定义属性
+PHYSICS_CACHE_KEY = "mmr_physics_cache"
+
+# 参与哈希的刚体属性
+RIGID_BODY_ATTRS = (
+    'enabled', 'type', 'kinematic', 'mass', 'friction', 'restitution', 'linear_damping', 'angular_damping',
+    'collision_shape', 'use_margin', 'collision_margin', 'use_deactivation', 'use_start_deactivated',
+)
+
+# 参与哈希的刚体约束属性
+RIGID_BODY_CONSTRAINT_ATTRS = (
+    'enabled', 'type', 'disable_collisions', 'breaking_threshold', 'use_breaking', 'spring_type',
+    'use_limit_lin_x', 'use_limit_lin_y', 'use_limit_lin_z', 'use_limit_ang_x', 'use_limit_ang_y', 'use_limit_ang_z',
+    'limit_lin_x_lower', 'limit_lin_x_upper', 'limit_lin_y_lower', 'limit_lin_y_upper',
+    'limit_lin_z_lower', 'limit_lin_z_upper', 'limit_ang_x_lower', 'limit_ang_x_upper',
+    'limit_ang_y_lower', 'limit_ang_y_upper', 'limit_ang_z_lower', 'limit_ang_z_upper',
+    'use_spring_x', 'use_spring_y', 'use_spring_z', 'use_spring_ang_x', 'use_spring_ang_y', 'use_spring_ang_z',
+    'spring_stiffness_x', 'spring_stiffness_y', 'spring_stiffness_z',
+    'spring_stiffness_ang_x', 'spring_stiffness_ang_y', 'spring_stiffness_ang_z',
+    'spring_damping_x', 'spring_damping_y', 'spring_damping_z',
+    'spring_damping_ang_x', 'spring_damping_ang_y', 'spring_damping_ang_z',
+)
+
+# 参与哈希的NLA片段属性
+NLA_STRIP_ATTRS = (
+    'frame_start', 'frame_end', 'action_frame_start', 'action_frame_end', 'scale', 'repeat', 'blend_type',
+    'influence', 'use_animated_influence', 'extrapolation', 'blend_in', 'blend_out', 'use_reverse', 'mute',
+)
+
+# 参与哈希的刚体世界属性
+RIGID_BODY_WORLD_ATTRS = ('enabled', 'time_scale', 'substeps_per_frame', 'solver_iterations', 'use_split_impulse')
+
+
+def hash_values(h, values):
+    h.update(repr(values).encode('utf-8'))
+
+
+def hash_fcurves(h, fcurves):
+    """哈希F曲线（关键帧与控制柄）"""
+    for fcurve in sorted(fcurves, key=lambda fc: (fc.data_path, fc.array_index)):
+        hash_values(h, (fcurve.data_path, fcurve.array_index, fcurve.mute, len(fcurve.keyframe_points)))
+        for attr in ('co', 'handle_left', 'handle_right'):
+            data = np.empty(len(fcurve.keyframe_points) * 2, dtype=np.float32)
+            fcurve.keyframe_points.foreach_get(attr, data)
+            h.update(data.tobytes())
+
+
+def hash_animation(h, obj):
+    """哈希物体的当前动作与所有未静音的NLA轨道和片段"""
+    anim_data = obj.animation_data
+    if not anim_data:
+        return
+    hash_values(h, (anim_data.action.name if anim_data.action else '', anim_data.use_nla,
+                    anim_data.action_blend_type, anim_data.action_influence))
+    hash_fcurves(h, get_action_fcurves(obj))
+    if not anim_data.use_nla:
+        return
+    for track in anim_data.nla_tracks:
+        if track.mute:
+            continue
+        hash_values(h, (track.name, track.is_solo))
+        for strip in track.strips:
+            if strip.mute:
+                continue
+            hash_values(h, (strip.name, strip.action.name if strip.action else '')
+                        + tuple(getattr(strip, attr) for attr in NLA_STRIP_ATTRS))
+            if strip.action:
+                hash_fcurves(h, get_slot_fcurves(strip.action, getattr(strip, 'action_slot', None)))
+
+
+def has_animation(obj):
+    """物体是否有动作或NLA轨道"""
+    anim_data = obj.animation_data
+    return bool(anim_data and (anim_data.action or anim_data.nla_tracks))
+
+
+def hash_object_transform(h, obj):
+    hash_values(h, (obj.name, obj.parent.name if obj.parent else '', obj.parent_type, obj.parent_bone))
+    h.update(np.array(obj.matrix_local, dtype=np.float32).tobytes())
+    h.update(np.array(obj.dimensions, dtype=np.float32).tobytes())
+
+
+def physics_cache_key(scene):
+    """计算刚体物理缓存键
+
+    包括刚体世界中所有刚体与关节的参数、驱动刚体的骨架动作与NLA轨道、刚体世界设置与缓存开始帧。
+    缓存结束帧不参与计算，由帧范围单独判断。刚体的变换会被模拟改写，调用前需跳转到缓存开始帧。
+    """
+    rigidbody_world = scene.rigidbody_world
+    h = hashlib.sha1()
+    hash_values(h, tuple(getattr(rigidbody_world, attr) for attr in RIGID_BODY_WORLD_ATTRS))
+    hash_values(h, (tuple(scene.gravity), scene.use_gravity, scene.render.fps, scene.render.fps_base,
+                    rigidbody_world.point_cache.frame_start))
+
+    rigid_objects = sorted(rigidbody_world.collection.objects, key=lambda o: o.name) \
+        if rigidbody_world.collection else []
+    armatures = set()
+    for obj in rigid_objects:
+        rb = obj.rigid_body
+        if rb is None:
+            continue
+        hash_object_transform(h, obj)
+        hash_values(h, tuple(getattr(rb, attr) for attr in RIGID_BODY_ATTRS))
+        hash_values(h, tuple(rb.collision_collections))
+        hash_animation(h, obj)
+        for parent in obj.parent_recursive:
+            if parent.type == 'ARMATURE':
+                armatures.add(parent)
+
+    constraint_objects = sorted(rigidbody_world.constraints.objects, key=lambda o: o.name) \
+        if rigidbody_world.constraints else []
+    for obj in constraint_objects:
+        rbc = obj.rigid_body_constraint
+        if rbc is None:
+            continue
+        hash_object_transform(h, obj)
+        hash_values(h, tuple(getattr(rbc, attr) for attr in RIGID_BODY_CONSTRAINT_ATTRS))
+        hash_values(h, (rbc.object1.name if rbc.object1 else '', rbc.object2.name if rbc.object2 else ''))
+
+    # 驱动刚体的骨架：刚体的父级骨架，以及场景中带动作或NLA轨道的骨架（刚体通过约束跟随骨骼时没有父子关系）
+    for obj in scene.objects:
+        if obj.type == 'ARMATURE' and has_animation(obj):
+            armatures.add(obj)
+    for arm in sorted(armatures, key=lambda o: o.name):
+        hash_values(h, (arm.name,))
+        hash_animation(h, arm)
+
+    return h.hexdigest()
+
+
+def get_cache_state(scene):
+    """读取上次烘焙时的缓存状态 {key, frame_start, frame_end}，没有时返回None"""
+    state = scene.get(PHYSICS_CACHE_KEY)
+    if not state:
+        return None
+    return {'key': state.get('key', ''), 'frame_start': state.get('frame_start', 0), 'frame_end': state.get('frame_end', 0)}
+
+
+def set_cache_state(scene, key, frame_start, frame_end):
+    scene[PHYSICS_CACHE_KEY] = {'key': key, 'frame_start': int(frame_start), 'frame_end': int(frame_end)}
+
+
+def clear_cache_state(scene):
+    if PHYSICS_CACHE_KEY in scene:
+        del scene[PHYSICS_CACHE_KEY]
+
+
+def ptcache_operator(context, operator, **kwargs):
+    """对刚体世界的点缓存调用 bpy.ops.ptcache 操作符"""
+    point_cache = context.scene.rigidbody_world.point_cache
+    with context.temp_override(scene=context.scene, point_cache=point_cache):
+        return operator(**kwargs)
+
+
+# 烘焙物理缓存
+class MMR_Bake_Physics_Cache(bpy.types.Operator):
+    bl_idname = "mmr.bake_physics_cache"
+    bl_label = "Bake Physics Cache"
+    bl_description = "Bake the rigid body cache, reuse the existing bake when motion, rig and world are unchanged"
+    bl_options = {'REGISTER'}
+
+    # 即使缓存键未改变也重新烘焙
+    force: bpy.props.BoolProperty(
+        name="Force",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        if context.screen and context.screen.is_animation_playing:
+            return False
+        return context.scene.rigidbody_world is not None
+
+    def execute(self, context):
+        scene = context.scene
+        rigidbody_world = scene.rigidbody_world
+        point_cache = rigidbody_world.point_cache
+        if not rigidbody_world.enabled:
+            self.report({'ERROR'}, "未启用刚体世界")
+            return {'CANCELLED'}
+
+        frame_start = point_cache.frame_start
+        frame_end = max(scene.frame_end, frame_start)
+        context_frame = scene.frame_current
+
+        # 在缓存开始帧读取刚体的初始变换
+        start_time = time.time()
+        scene.frame_set(frame_start)
+        key = physics_cache_key(scene)
+        print(f"物理缓存键: {key}, 计算耗时{time.time() - start_time:.3f}s")
+
+        state = get_cache_state(scene)
+
+        # 键相同且已烘焙的帧范围覆盖场景结束帧时复用
+        if not self.force and point_cache.is_baked and state and state['key'] == key \
+                and state['frame_start'] == frame_start and state['frame_end'] >= frame_end:
+            scene.frame_set(context_frame)
+            self.report({'INFO'}, f"物理缓存未改变, 复用已烘焙的{state['frame_start']}-{state['frame_end']}帧")
+            return {'FINISHED'}
+
+        if point_cache.is_baked:
+            ptcache_operator(context, bpy.ops.ptcache.free_bake)
+        if state and state['key'] == key and state['frame_end'] < frame_end:
+            print(f"物理缓存帧范围扩展: {state['frame_end']} -> {frame_end}")
+
+        point_cache.frame_end = frame_end
+        start_time = time.time()
+        ptcache_operator(context, bpy.ops.ptcache.bake, bake=True)
+        cost = time.time() - start_time
+        scene.frame_set(context_frame)
+
+        if not point_cache.is_baked:
+            clear_cache_state(scene)
+            self.report({'ERROR'}, "物理缓存烘焙失败")
+            return {'CANCELLED'}
+
+        set_cache_state(scene, key, frame_start, frame_end)
+        frames = frame_end - frame_start + 1
+        self.report({'INFO'}, f"已烘焙物理缓存{frame_start}-{frame_end}帧, 耗时{cost:.1f}s ({frames / max(cost, 1e-6):.1f}帧/秒)")
+        return {'FINISHED'}
+
+
+# 删除物理缓存
+class MMR_Free_Physics_Cache(bpy.types.Operator):
+    bl_idname = "mmr.free_physics_cache"
+    bl_label = "Free Physics Cache"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        rigidbody_world = context.scene.rigidbody_world
+        return rigidbody_world is not None and rigidbody_world.point_cache.is_baked
+
+    def execute(self, context):
+        ptcache_operator(context, bpy.ops.ptcache.free_bake)
+        clear_cache_state(context.scene)
+        return {'FINISHED'}
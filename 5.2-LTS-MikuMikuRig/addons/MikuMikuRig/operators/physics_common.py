@@ -0,0 +1,324 @@
+"""物理构建的公共工具
+
+供 Physics.Assign_Rigidbody 与 mmd_rig_physics.Model 共用。
+"""
+import itertools
+import math
+import time
+
+import bpy
+import numpy as np
+
+# MMD碰撞组数量
+COLLISION_GROUP_COUNT = 16
+
+# Blender刚体碰撞集合数量
+COLLISION_COLLECTION_COUNT = 20
+
+# 保存原始碰撞集合的自定义属性
+COLLISION_COLLECTIONS_KEY = "mmr_collision_collections"
+
+# 3x3x3 相邻网格偏移
+NEIGHBOR_OFFSETS = list(itertools.product((-1, 0, 1), repeat=3))
+
+
+def get_rigid_range(obj) -> float:
+    """计算刚体对象的最大尺寸范围
+
+    Args:
+        obj: 刚体对象
+
+    Returns:
+        刚体在X、Y、Z三个轴向上的最大尺寸
+    """
+    x0, y0, z0 = obj.bound_box[0]  # 获取边界框的最小点
+    x1, y1, z1 = obj.bound_box[6]  # 获取边界框的最大点
+    return max(x1 - x0, y1 - y0, z1 - z0)  # 返回三个轴向的最大尺寸
+
+
+def find_non_collision_pairs(locations, ranges, groups, masks, distance_scale, excluded=None):
+    """宽相位：查找需要禁用碰撞的刚体对
+
+    刚体A的碰撞组遮罩包含刚体B的碰撞组，且两者距离小于 distance_scale * (A尺寸 + B尺寸) / 2 时成对。
+    先按 (碰撞组, 网格坐标) 分桶，只在相邻网格内用NumPy批量计算距离。
+    网格边长为 distance_scale * 最大尺寸，保证满足距离条件的刚体一定在相邻网格内。
+
+    Args:
+        locations: (n, 3) 刚体位置
+        ranges: (n,) 刚体尺寸
+        groups: (n,) 碰撞组编号
+        masks: (n, 16) 碰撞组遮罩
+        distance_scale: 非碰撞距离缩放系数
+        excluded: 不需要处理的索引对集合 {frozenset((i, j))}，如已有关节连接的刚体
+
+    Returns:
+        [(i, j)] 索引对列表，i为遮罩命中的刚体，顺序与逐对遍历一致
+    """
+    locations = np.asarray(locations, dtype=np.float64).reshape(-1, 3)
+    ranges = np.asarray(ranges, dtype=np.float64)
+    groups = np.asarray(groups, dtype=np.int64)
+    masks = np.asarray(masks, dtype=bool).reshape(len(ranges), -1)
+    excluded = excluded or set()
+    count = len(ranges)
+    if count < 2:
+        return []
+
+    cell_size = distance_scale * float(ranges.max())
+    if cell_size > 0 and math.isfinite(cell_size):
+        cells = np.floor(locations / cell_size).astype(np.int64)
+    else:
+        cells = np.zeros((count, 3), dtype=np.int64)
+
+    buckets = {}
+    for i in range(count):
+        buckets.setdefault((int(groups[i]),) + tuple(cells[i]), []).append(i)
+
+    pairs = []
+    seen = set(excluded)
+    for a in range(count):
+        cx, cy, cz = cells[a]
+        candidates = []
+        for group in np.flatnonzero(masks[a]):
+            for dx, dy, dz in NEIGHBOR_OFFSETS:
+                candidates += buckets.get((int(group), cx + dx, cy + dy, cz + dz), ())
+        if not candidates:
+            continue
+
+        candidates = np.unique(np.asarray(candidates, dtype=np.int64))
+        candidates = candidates[candidates != a]
+        distance = np.linalg.norm(locations[candidates] - locations[a], axis=1)
+        limit = distance_scale * (ranges[candidates] + ranges[a]) * 0.5
+        for b in candidates[distance < limit]:
+            pair = frozenset((a, int(b)))
+            if pair not in seen:
+                seen.add(pair)
+                pairs.append((a, int(b)))
+    return pairs
+
+
+def create_constraint_template(context, collection, name):
+    """创建带GENERIC非碰撞刚体约束的空物体模板
+
+    刚体约束只能通过操作符添加，这里只调用一次，并使用上下文覆盖，不改变当前选择与活动物体
+    """
+    template = bpy.data.objects.new(name, None)
+    collection.objects.link(template)
+    with context.temp_override(object=template, active_object=template,
+                               selected_objects=[template], selected_editable_objects=[template]):
+        bpy.ops.rigidbody.constraint_add(type='GENERIC')
+    template.rigid_body_constraint.disable_collisions = True
+    return template
+
+
+def allocate_constraint_empties(template, pairs, collection, parent=None, name_format=None):
+    """按刚体对批量复制约束空物体
+
+    先通过数据API复制全部物体并设置约束对象，再统一链接到集合并隐藏，避免逐个物体的操作符调用与选择切换
+
+    Args:
+        template: create_constraint_template 创建的模板
+        pairs: [(刚体A, 刚体B)]
+        collection: 链接到的集合
+        parent: 父物体
+        name_format: 名称格式，如 "empty_{0}_{1}"（参数为两个刚体的名称），为None时使用模板名称自动编号
+
+    Returns:
+        创建的空物体列表
+    """
+    start_time = time.time()
+    objects = []
+    for obj_a, obj_b in pairs:
+        obj = template.copy()
+        if name_format:
+            obj.name = name_format.format(obj_a.name, obj_b.name)
+        obj.parent = parent
+        rbc = obj.rigid_body_constraint
+        if rbc is not None:
+            rbc.object1 = obj_a
+            rbc.object2 = obj_b
+        obj.hide_select = True
+        objects.append(obj)
+
+    link = collection.objects.link
+    for obj in objects:
+        link(obj)
+    for obj in objects:
+        obj.hide_set(True)  # 隐藏约束对象
+
+    cost = time.time() - start_time
+    if objects:
+        print(f"创建{len(objects)}个约束空物体, 耗时{cost:.3f}s ({len(objects) / max(cost, 1e-6):.0f}个/秒)")
+    return objects
+
+
+def solve_collision_collections(groups, masks, max_collections=COLLISION_COLLECTION_COUNT):
+    """将MMD碰撞组遮罩求解为Blender刚体碰撞集合
+
+    Blender中两个刚体只要共享一个碰撞集合就会碰撞。先按 (碰撞组, 遮罩) 把刚体归类，
+    类之间能否碰撞构成一张图，再用贪心的团覆盖为每个碰撞集合选出一组两两可碰撞的类，
+    直到所有需要碰撞的类对都被某个集合覆盖。
+    同类刚体之间本不应碰撞（自身碰撞组在遮罩中）但又必须放入集合时，会留下冲突，由调用方逐对添加约束。
+
+    注意碰撞语义与逐对约束不同: 刚体离开原有的碰撞集合0，不再与场景中其他刚体（地面、道具等）碰撞；
+    逐对约束只禁用距离较近的刚体对，碰撞集合则使互相遮罩的刚体无论距离远近都不再碰撞。
+    因此碰撞集合模式需要手动选择，并由 find_unmanaged_colliders 提示受影响的刚体。
+
+    Args:
+        groups: (n,) 碰撞组编号，-1表示无碰撞组
+        masks: (n, 16) 碰撞组遮罩，True表示不与该组碰撞
+        max_collections: 可用的碰撞集合数量
+
+    Returns:
+        (n, max_collections) 布尔数组；集合数量不足以表示全部需要碰撞的刚体对时返回None
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    masks = np.asarray(masks, dtype=bool).reshape(len(groups), -1)
+
+    # 按 (碰撞组, 遮罩) 归类
+    classes = {}
+    body_class = np.array([classes.setdefault((int(groups[i]), masks[i].tobytes()), len(classes))
+                           for i in range(len(groups))], dtype=np.int64)
+    class_groups = np.empty(len(classes), dtype=np.int64)
+    class_masks = np.zeros((len(classes), masks.shape[1]), dtype=bool)
+    for i, c in enumerate(body_class):
+        class_groups[c] = groups[i]
+        class_masks[c] = masks[i]
+
+    # compatible[a, b]：类a与类b的刚体可以碰撞（对角线为同类刚体之间）
+    has_group = class_groups >= 0
+    excludes = np.zeros((len(classes), len(classes)), dtype=bool)
+    excludes[:, has_group] = class_masks[:, class_groups[has_group]]
+    compatible = ~(excludes | excludes.T)
+
+    uncovered = compatible.copy()
+    cliques = []
+    while uncovered.any():
+        if len(cliques) >= max_collections:
+            return None
+        # argwhere按行优先，第一个元素满足 a <= b
+        a, b = (int(v) for v in np.argwhere(uncovered)[0])
+        members = np.zeros(len(classes), dtype=bool)
+        members[[a, b]] = True
+        while True:
+            candidates = compatible[members].all(axis=0) & ~members
+            gain = np.where(candidates, uncovered[members].sum(axis=0) + uncovered.diagonal(), 0)
+            v = int(np.argmax(gain))
+            if gain[v] <= 0:
+                break
+            members[v] = True
+        uncovered[np.ix_(members, members)] = False
+        cliques.append(members)
+
+    layers = np.zeros((len(body_class), max_collections), dtype=bool)
+    for c, members in enumerate(cliques):
+        layers[:, c] = members[body_class]
+    return layers
+
+
+def pairs_sharing_collections(pairs, layers):
+    """筛选共享碰撞集合（仍会碰撞）的刚体对，这些刚体对仍需要非碰撞约束"""
+    return [(a, b) for a, b in pairs if np.any(layers[a] & layers[b])]
+
+
+def apply_collision_collections(objects, layers):
+    """设置刚体的碰撞集合，原始设置保存在自定义属性中，解除物理时恢复"""
+    for obj, layer in zip(objects, layers):
+        rb = obj.rigid_body
+        if rb is None:
+            continue
+        if COLLISION_COLLECTIONS_KEY not in obj:
+            obj[COLLISION_COLLECTIONS_KEY] = [bool(v) for v in rb.collision_collections]
+        rb.collision_collections = [bool(v) for v in layer]
+
+
+def find_unmanaged_colliders(scene, objects):
+    """查找原本与objects碰撞、应用碰撞集合后不再碰撞的其他刚体（地面、道具等）
+
+    Args:
+        scene: 场景
+        objects: 将应用碰撞集合的刚体
+
+    Returns:
+        刚体世界中不属于objects、与objects原有碰撞集合有交集的刚体列表
+    """
+    rigidbody_world = scene.rigidbody_world
+    if rigidbody_world is None or rigidbody_world.collection is None:
+        return []
+    managed = set(objects)
+    used = np.zeros(COLLISION_COLLECTION_COUNT, dtype=bool)
+    for obj in objects:
+        if obj.rigid_body is not None:
+            used |= np.array(list(obj.get(COLLISION_COLLECTIONS_KEY, obj.rigid_body.collision_collections)), dtype=bool)
+    return [obj for obj in rigidbody_world.collection.objects
+            if obj not in managed and obj.rigid_body is not None
+            and np.any(np.array(list(obj.rigid_body.collision_collections), dtype=bool) & used)]
+
+
+def restore_collision_collections(objects):
+    """恢复 apply_collision_collections 修改前的碰撞集合"""
+    for obj in objects:
+        if COLLISION_COLLECTIONS_KEY not in obj:
+            continue
+        if obj.rigid_body is not None:
+            obj.rigid_body.collision_collections = [bool(v) for v in obj[COLLISION_COLLECTIONS_KEY]]
+        del obj[COLLISION_COLLECTIONS_KEY]
+
+
+def benchmark_simulation(scene, frame_count):
+    """从缓存开始帧逐帧模拟，测量刚体模拟速度
+
+    Returns:
+        (模拟帧数, 耗时秒)
+    """
+    rigidbody_world = scene.rigidbody_world
+    point_cache = rigidbody_world.point_cache
+    context_frame = scene.frame_current
+    frame_start = point_cache.frame_start
+    frame_end = min(point_cache.frame_end, frame_start + frame_count)
+
+    # 重新赋值世界属性会重置缓存，保证每一帧都重新模拟
+    rigidbody_world.substeps_per_frame = rigidbody_world.substeps_per_frame
+    scene.frame_set(frame_start)
+    start_time = time.time()
+    for frame in range(frame_start + 1, frame_end + 1):
+        scene.frame_set(frame)
+    cost = time.time() - start_time
+
+    scene.frame_set(context_frame)
+    return frame_end - frame_start, cost
+
+
+def diff_constraint_empties(existing, pairs):
+    """对比现有的非碰撞约束空物体与需要的刚体对
+
+    Args:
+        existing: 现有的约束空物体（没有设置刚体对的模板不参与对比）
+        pairs: 需要的 [(刚体A, 刚体B)]
+
+    Returns:
+        (需要删除的空物体列表, 需要新增的刚体对列表)
+    """
+    wanted = {}
+    for pair in pairs:
+        wanted.setdefault(frozenset(pair), pair)
+    kept = set()
+    stale = []
+    for obj in existing:
+        rbc = obj.rigid_body_constraint
+        if rbc is None or rbc.object1 is None or rbc.object2 is None:
+            continue
+        key = frozenset((rbc.object1, rbc.object2))
+        if key in wanted and key not in kept:
+            kept.add(key)
+        else:
+            stale.append(obj)
+    return stale, [pair for key, pair in wanted.items() if key not in kept]
+
+
+def find_constraint_template(objects):
+    """查找没有设置刚体对的约束空物体模板"""
+    for obj in objects:
+        rbc = obj.rigid_body_constraint
+        if rbc is not None and rbc.object1 is None and rbc.object2 is None:
+            return obj
+    return None
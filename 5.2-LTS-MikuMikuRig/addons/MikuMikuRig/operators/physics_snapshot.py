@@ -0,0 +1,131 @@
+"""物理构建快照
+
+构建物理时记录每个刚体与关节的参数，增量更新时与当前参数对比:
+    structure: 骨骼、刚体类型、父级与变换，改变后需要重新装配
+    collision: 碰撞组、遮罩与尺寸，改变后只需更新非碰撞约束
+    params: 质量、摩擦、阻尼、关节限制等，直接在刚体上生效，不需要重建
+快照以JSON文本保存在根对象的自定义属性中。
+"""
+import json
+
+from .physics_cache import RIGID_BODY_ATTRS, RIGID_BODY_CONSTRAINT_ATTRS
+from .physics_common import get_rigid_range
+
+# 保存快照的根对象自定义属性
+PHYSICS_SNAPSHOT_KEY = "mmr_physics_snapshot"
+
+# 快照中浮点数保留的小数位数
+SNAPSHOT_PRECISION = 5
+
+
+def rounded(values):
+    result = []
+    for value in values:
+        if isinstance(value, float):
+            value = round(value, SNAPSHOT_PRECISION)
+        elif not isinstance(value, (bool, int, str)):
+            value = str(value)
+        result.append(value)
+    return result
+
+
+def goto_cache_start(scene):
+    """跳转到刚体缓存开始帧并返回原来的帧
+
+    模拟会改写其他帧的刚体变换，记录或对比快照前需要先跳转到缓存开始帧。
+    """
+    frame = scene.frame_current
+    rigidbody_world = scene.rigidbody_world
+    if rigidbody_world and frame != rigidbody_world.point_cache.frame_start:
+        scene.frame_set(rigidbody_world.point_cache.frame_start)
+    return frame
+
+
+def object_transform(obj):
+    values = [obj.parent.name if obj.parent else '', obj.parent_type, obj.parent_bone]
+    values += [v for row in obj.matrix_local for v in row]
+    return rounded(values)
+
+
+def rigid_body_entry(obj, group, mask, bone, kind, location=None):
+    """刚体的快照项
+
+    Args:
+        obj: 刚体对象
+        group: 碰撞组编号
+        mask: 碰撞组遮罩
+        bone: 关联骨骼名称
+        kind: 刚体类型（装配方式）
+        location: 构建前的位置，用于增量更新时计算非碰撞刚体对
+    """
+    rb = obj.rigid_body
+    entry = {
+        'structure': [bone, str(kind)] + object_transform(obj),
+        'collision': rounded([int(group)] + [bool(v) for v in mask] + [get_rigid_range(obj)]),
+        'params': rounded([getattr(rb, attr) for attr in RIGID_BODY_ATTRS]) if rb else [],
+    }
+    if location is not None:
+        entry['location'] = rounded(list(location))
+    return entry
+
+
+def joint_entry(obj):
+    """关节的快照项"""
+    rbc = obj.rigid_body_constraint
+    return {
+        'structure': [rbc.object1.name if rbc.object1 else '', rbc.object2.name if rbc.object2 else '']
+                     + object_transform(obj),
+        'params': rounded([getattr(rbc, attr) for attr in RIGID_BODY_CONSTRAINT_ATTRS]),
+    }
+
+
+def save_physics_snapshot(root, rigid_entries, joint_entries, settings):
+    root[PHYSICS_SNAPSHOT_KEY] = json.dumps({
+        'settings': rounded(settings),
+        'rigid_bodies': rigid_entries,
+        'joints': joint_entries,
+    })
+
+
+def load_physics_snapshot(root):
+    text = root.get(PHYSICS_SNAPSHOT_KEY)
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def clear_physics_snapshot(root):
+    if PHYSICS_SNAPSHOT_KEY in root:
+        del root[PHYSICS_SNAPSHOT_KEY]
+
+
+def diff_physics_snapshot(old, rigid_entries, joint_entries, settings):
+    """对比快照与当前参数
+
+    Returns:
+        {'added', 'removed', 'structure', 'collision', 'params': 名称集合, 'settings': 构建设置是否改变}，
+        没有快照时返回None
+    """
+    if old is None:
+        return None
+    # 经过JSON往返，保证类型一致
+    new = json.loads(json.dumps({'settings': rounded(settings), 'rigid_bodies': rigid_entries, 'joints': joint_entries}))
+    diff = {'added': set(), 'removed': set(), 'structure': set(), 'collision': set(), 'params': set(),
+            'settings': old.get('settings') != new['settings']}
+    for kind in ('rigid_bodies', 'joints'):
+        old_entries, new_entries = old.get(kind, {}), new[kind]
+        diff['added'] |= new_entries.keys() - old_entries.keys()
+        diff['removed'] |= old_entries.keys() - new_entries.keys()
+        for name in new_entries.keys() & old_entries.keys():
+            for part in ('structure', 'collision', 'params'):
+                if old_entries[name].get(part) != new_entries[name].get(part):
+                    diff[part].add(name)
+    return diff
+
+
+def needs_full_rebuild(diff):
+    """增加、删除或结构改变时需要完整重建"""
+    return diff is None or bool(diff['added'] or diff['removed'] or diff['structure'])
@@ -1,617 +0,0 @@
-import bpy
-s = bpy.context.scene.mmr_kumopult_bac_owner.data.mmr_kumopult_bac
-
-s.mappings.clear()
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'hips'
-item_sub_1.owner = 'hips'
-item_sub_1.target = 'mixamorig:Hips'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (-1.5707963705062866, 0.0, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'torso'
-item_sub_1.owner = 'torso'
-item_sub_1.target = 'mixamorig:Hips'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = True
-item_sub_1.has_ik = False
-item_sub_1.offset = (-1.5707963705062866, 0.0, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'chest'
-item_sub_1.owner = 'chest'
-item_sub_1.target = 'mixamorig:Spine2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (-1.5707963705062866, 0.0, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'neck'
-item_sub_1.owner = 'neck'
-item_sub_1.target = 'mixamorig:Neck'
-item_sub_1.has_rotoffs = False
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 0.0, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'head'
-item_sub_1.owner = 'head'
-item_sub_1.target = 'mixamorig:Head'
-item_sub_1.has_rotoffs = False
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 0.0, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'shoulder.R'
-item_sub_1.owner = 'shoulder.R'
-item_sub_1.target = 'mixamorig:RightShoulder'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'shoulder.L'
-item_sub_1.owner = 'shoulder.L'
-item_sub_1.target = 'mixamorig:LeftShoulder'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'upper_arm_fk.L'
-item_sub_1.owner = 'upper_arm_fk.L'
-item_sub_1.target = 'mixamorig:LeftArm'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (-1.5707963705062866, -1.5707963705062866, 1.5707963705062866)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'forearm_fk.L'
-item_sub_1.owner = 'forearm_fk.L'
-item_sub_1.target = 'mixamorig:LeftForeArm'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -1.5707963705062866, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'hand_fk.L'
-item_sub_1.owner = 'hand_fk.L'
-item_sub_1.target = 'mixamorig:LeftHand'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -1.5707963705062866, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'upper_arm_fk.R'
-item_sub_1.owner = 'upper_arm_fk.R'
-item_sub_1.target = 'mixamorig:RightArm'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (-1.5707963705062866, 1.5707963705062866, -1.5707963705062866)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'forearm_fk.R'
-item_sub_1.owner = 'forearm_fk.R'
-item_sub_1.target = 'mixamorig:RightForeArm'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 1.5707963705062866, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'hand_fk.R'
-item_sub_1.owner = 'hand_fk.R'
-item_sub_1.target = 'mixamorig:RightHand'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 1.5707963705062866, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'thigh_fk.R'
-item_sub_1.owner = 'thigh_fk.R'
-item_sub_1.target = 'mixamorig:RightUpLeg'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'shin_fk.R'
-item_sub_1.owner = 'shin_fk.R'
-item_sub_1.target = 'mixamorig:RightLeg'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'foot_fk.R'
-item_sub_1.owner = 'foot_fk.R'
-item_sub_1.target = 'mixamorig:RightFoot'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'toe.R'
-item_sub_1.owner = 'toe.R'
-item_sub_1.target = 'mixamorig:RightToeBase'
-item_sub_1.has_rotoffs = False
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 0.0, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'thigh_fk.L'
-item_sub_1.owner = 'thigh_fk.L'
-item_sub_1.target = 'mixamorig:LeftUpLeg'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'shin_fk.L'
-item_sub_1.owner = 'shin_fk.L'
-item_sub_1.target = 'mixamorig:LeftLeg'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'foot_fk.L'
-item_sub_1.owner = 'foot_fk.L'
-item_sub_1.target = 'mixamorig:LeftFoot'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'toe.L'
-item_sub_1.owner = 'toe.L'
-item_sub_1.target = 'mixamorig:LeftToeBase'
-item_sub_1.has_rotoffs = False
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 0.0, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'thumb.01.R'
-item_sub_1.owner = 'thumb.01.R'
-item_sub_1.target = 'mixamorig:RightHandThumb1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (1.5707963705062866, -1.5707963705062866, -1.5707963705062866)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'thumb.02.R'
-item_sub_1.owner = 'thumb.02.R'
-item_sub_1.target = 'mixamorig:RightHandThumb2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (1.5707963705062866, 1.5707963705062866, 1.5707963705062866)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'thumb.03.R'
-item_sub_1.owner = 'thumb.03.R'
-item_sub_1.target = 'mixamorig:RightHandThumb3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (-1.5707963705062866, 1.5707963705062866, -1.5707963705062866)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_index.01.R'
-item_sub_1.owner = 'f_index.01.R'
-item_sub_1.target = 'mixamorig:RightHandIndex1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_index.02.R'
-item_sub_1.owner = 'f_index.02.R'
-item_sub_1.target = 'mixamorig:RightHandIndex2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_index.03.R'
-item_sub_1.owner = 'f_index.03.R'
-item_sub_1.target = 'mixamorig:RightHandIndex3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_middle.01.R'
-item_sub_1.owner = 'f_middle.01.R'
-item_sub_1.target = 'mixamorig:RightHandMiddle1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_middle.02.R'
-item_sub_1.owner = 'f_middle.02.R'
-item_sub_1.target = 'mixamorig:RightHandMiddle2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_middle.03.R'
-item_sub_1.owner = 'f_middle.03.R'
-item_sub_1.target = 'mixamorig:RightHandMiddle3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_ring.01.R'
-item_sub_1.owner = 'f_ring.01.R'
-item_sub_1.target = 'mixamorig:RightHandRing1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_ring.02.R'
-item_sub_1.owner = 'f_ring.02.R'
-item_sub_1.target = 'mixamorig:RightHandRing2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_ring.03.R'
-item_sub_1.owner = 'f_ring.03.R'
-item_sub_1.target = 'mixamorig:RightHandRing3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_pinky.01.R'
-item_sub_1.owner = 'f_pinky.01.R'
-item_sub_1.target = 'mixamorig:RightHandPinky1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, 3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_pinky.02.R'
-item_sub_1.owner = 'f_pinky.02.R'
-item_sub_1.target = 'mixamorig:RightHandPinky2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_pinky.03.R'
-item_sub_1.owner = 'f_pinky.03.R'
-item_sub_1.target = 'mixamorig:RightHandPinky3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'thumb.01.L'
-item_sub_1.owner = 'thumb.01.L'
-item_sub_1.target = 'mixamorig:LeftHandThumb1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (1.5707963705062866, 1.5707963705062866, 1.5707963705062866)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'thumb.02.L'
-item_sub_1.owner = 'thumb.02.L'
-item_sub_1.target = 'mixamorig:LeftHandThumb2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (1.5707963705062866, -1.5707963705062866, -1.5707963705062866)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'thumb.03.L'
-item_sub_1.owner = 'thumb.03.L'
-item_sub_1.target = 'mixamorig:LeftHandThumb3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (-1.5707963705062866, -1.5707963705062866, 1.5707963705062866)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_index.01.L'
-item_sub_1.owner = 'f_index.01.L'
-item_sub_1.target = 'mixamorig:LeftHandIndex1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_index.02.L'
-item_sub_1.owner = 'f_index.02.L'
-item_sub_1.target = 'mixamorig:LeftHandIndex2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_index.03.L'
-item_sub_1.owner = 'f_index.03.L'
-item_sub_1.target = 'mixamorig:LeftHandIndex3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_middle.01.L'
-item_sub_1.owner = 'f_middle.01.L'
-item_sub_1.target = 'mixamorig:LeftHandMiddle1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_middle.02.L'
-item_sub_1.owner = 'f_middle.02.L'
-item_sub_1.target = 'mixamorig:LeftHandMiddle2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_middle.03.L'
-item_sub_1.owner = 'f_middle.03.L'
-item_sub_1.target = 'mixamorig:LeftHandMiddle3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_ring.01.L'
-item_sub_1.owner = 'f_ring.01.L'
-item_sub_1.target = 'mixamorig:LeftHandRing1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_ring.02.L'
-item_sub_1.owner = 'f_ring.02.L'
-item_sub_1.target = 'mixamorig:LeftHandRing2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_ring.03.L'
-item_sub_1.owner = 'f_ring.03.L'
-item_sub_1.target = 'mixamorig:LeftHandRing3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_pinky.01.L'
-item_sub_1.owner = 'f_pinky.01.L'
-item_sub_1.target = 'mixamorig:LeftHandPinky1'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_pinky.02.L'
-item_sub_1.owner = 'f_pinky.02.L'
-item_sub_1.target = 'mixamorig:LeftHandPinky2'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-item_sub_1 = s.mappings.add()
-item_sub_1.name = ''
-item_sub_1.selected_owner = 'f_pinky.03.L'
-item_sub_1.owner = 'f_pinky.03.L'
-item_sub_1.target = 'mixamorig:LeftHandPinky3'
-item_sub_1.has_rotoffs = True
-item_sub_1.has_loccopy = False
-item_sub_1.has_ik = False
-item_sub_1.offset = (0.0, -3.1415927410125732, 0.0)
-item_sub_1.loc_axis = (True, True, True)
-item_sub_1.ik_influence = 1.0
-item_sub_1.selected = False
-s.selected_count = 0
@@ -1,7 +1,794 @@
+import glob
+import hashlib
 import os
+import time
+import traceback
 import bpy
+import numpy as np
 from mathutils import Matrix
 from mathutils import Vector
+from addons.MikuMikuRig.operators.direct_bake import direct_bake_mappings, set_bac_constraints_enabled, BAC_CONSTRAINTS, \
+    make_frames, sample_pose_by_depsgraph
+from addons.MikuMikuRig.mapping_preset import load_mapping_preset, find_mapping_preset
+from addons.MikuMikuRig.utilfuncs import calc_rotation_offset, suppress_mapping_updates
+from addons.MikuMikuRig.operators.template_library import append_template_collection
+
+# 仅导入动画时需要清理的数据类型
+FBX_PURGE_TYPES = ('meshes', 'materials', 'images', 'textures', 'node_groups', 'cameras', 'lights', 'curves')
+
+# 映射表缓存 {(源骨架签名, 映射骨架签名, 预设路径, 预设修改时间, 自动偏移设置): 映射行}
+_mapping_cache = {}
+
+# 地面高度分析需要监控的骨骼名称
+GROUND_BONE_NAMES = ['head', 'torso', 'chest', "ORG-heel.02.R", "ORG-heel.02.L", 'ORG-hand.R', 'ORG-hand.L',
+                     'ORG-forearm.R', 'ORG-forearm.L', 'ORG-shin.R', 'ORG-shin.L', 'ORG-toe.R', 'ORG-toe.L']
+
+# 地面高度扫描的粗采样帧间隔，以及逐帧细化的最低粗采样帧数量
+GROUND_SCAN_STRIDE = 4
+GROUND_REFINE_CANDIDATES = 3
+
+
+def check_bones_exist(armature, bone_names):
+    """验证骨骼存在性"""
+    for name in bone_names:
+        if name not in armature.pose.bones:
+            raise Exception(f"骨骼不存在: {name}")
+
+
+def ground_height_from_poses(armature, bone_names, frames, poses, contact_threshold=None, verbose=True):
+    """由已经求值的骨骼姿态求出监控骨骼的全局最低点
+
+    Args:
+        armature: 骨架物体
+        bone_names: 需要监控的骨骼名称
+        frames: 帧数组
+        poses: {骨骼名称: 骨架空间姿态矩阵数组(F,4,4)}
+        contact_threshold: 接地阈值，设置时返回每帧是否接地
+        verbose: 是否打印分析结果
+
+    Returns:
+        字典: min_z 最低Z值, frame 最低帧, bones 最低骨骼, frames 帧数组,
+        heights 每帧每根骨骼的Z值(F,N), contact 每帧接地状态（未设置阈值时为None）
+    """
+    locations = np.stack([poses[name][:, :3, 3] for name in bone_names], axis=1)
+    world_z = np.array(armature.matrix_world)[2]
+    heights = locations @ world_z[:3] + world_z[3]
+
+    # 每帧最低值，相同Z值时取更早的帧
+    frame_min = heights.min(axis=1)
+    min_index = int(np.argmin(frame_min))
+    min_z = float(frame_min[min_index])
+    min_bones = [bone_names[i] for i in np.flatnonzero(heights[min_index] == min_z)]
+
+    contact = None
+    if contact_threshold is not None:
+        contact = (frame_min - min_z) <= contact_threshold
+
+    if verbose:
+        print(f"\n===== 地面高度分析 =====")
+        print(f"扫描帧数    : {len(frames)}")
+        print(f"最低位置帧 : {int(frames[min_index])}")
+        print(f"Z轴坐标     : {min_z:.6f}")
+        print(f"涉及骨骼    : {', '.join(min_bones)}")
+
+    return {
+        'min_z': min_z,
+        'frame': int(frames[min_index]),
+        'bones': min_bones,
+        'frames': frames,
+        'heights': heights,
+        'contact': contact,
+    }
+
+
+def scan_ground_height(context, armature, bone_names, frames, contact_threshold=None, stride=GROUND_SCAN_STRIDE):
+    """逐帧刷新场景读取监控骨骼的姿态并求出全局最低点
+
+    只在直接烘焙无法由求解结果得到所有监控骨骼时使用。先按 stride 间隔粗采样，
+    再在最低的几个粗采样帧附近逐帧细化；设置接地阈值时需要每帧的接地状态，逐帧扫描
+
+    Args:
+        context: 上下文
+        armature: 骨架物体
+        bone_names: 需要监控的骨骼名称
+        frames: 帧数组（与烘焙帧一致）
+        contact_threshold: 接地阈值，设置时返回每帧是否接地
+        stride: 粗采样帧间隔，1为逐帧扫描
+
+    Returns:
+        同 ground_height_from_poses（frames 与 heights 只包含采样的帧）
+    """
+    check_bones_exist(armature, bone_names)
+    scene = context.scene
+    frame_current = scene.frame_current
+    stride = 1 if contact_threshold is not None else max(1, int(stride))
+
+    # 粗采样（包含结束帧）
+    indices = np.arange(0, len(frames), stride)
+    if len(indices) and indices[-1] != len(frames) - 1:
+        indices = np.append(indices, len(frames) - 1)
+    [(poses, _)] = sample_pose_by_depsgraph(scene, [(armature, bone_names)], frames[indices])
+
+    # 在最低的几个粗采样帧前后逐帧细化
+    if stride > 1 and len(indices):
+        coarse = ground_height_from_poses(armature, bone_names, frames[indices], poses, verbose=False)
+        refine = set()
+        for k in np.argsort(coarse['heights'].min(axis=1), kind='stable')[:GROUND_REFINE_CANDIDATES]:
+            refine.update(range(indices[max(k - 1, 0)], indices[min(k + 1, len(indices) - 1)] + 1))
+        refine = np.array(sorted(refine - set(indices.tolist())), dtype=int)
+        if len(refine):
+            [(refined, _)] = sample_pose_by_depsgraph(scene, [(armature, bone_names)], frames[refine])
+            indices = np.concatenate([indices, refine])
+            order = np.argsort(indices)
+            indices = indices[order]
+            poses = {name: np.concatenate([poses[name], refined[name]])[order] for name in bone_names}
+    scene.frame_set(frame_current)
+    print(f"地面高度扫描: {len(indices)} / {len(frames)} 帧")
+    return ground_height_from_poses(armature, bone_names, frames[indices], poses, contact_threshold)
+
+
+# IK/FK切换属性所在的骨骼
+IK_FK_BONES = ["upper_arm_parent.L", "upper_arm_parent.R", "thigh_parent.R", "thigh_parent.L"]
+
+# VMD动作源骨架与映射骨骼的脚部对应关系
+VMD_FOOT_BONES = {'foot_fk.L': '足首.L', 'foot_fk.R': '足首.R', 'toe.L': '足先EX.L', 'toe.R': '足先EX.R'}
+
+# 支持批量重定向的动作文件
+MOTION_EXTENSIONS = ('.fbx', '.vmd')
+
+
+def copy_pose_transform(pose_bone):
+    """复制骨骼的基础变换"""
+    return {
+        "location": pose_bone.location.copy(),
+        "rotation_quaternion": pose_bone.rotation_quaternion.copy(),
+        "rotation_euler": pose_bone.rotation_euler.copy(),
+        "scale": pose_bone.scale.copy()
+    }
+
+
+def paste_pose_transform(pose_bone, transform):
+    """恢复骨骼的基础变换"""
+    pose_bone.location = transform["location"]
+    pose_bone.rotation_quaternion = transform["rotation_quaternion"]
+    pose_bone.rotation_euler = transform["rotation_euler"]
+    pose_bone.scale = transform["scale"]
+
+
+def clear_pose_transform(pose_bone):
+    """清空骨骼的基础变换"""
+    pose_bone.location = (0, 0, 0)
+    pose_bone.rotation_quaternion = (1, 0, 0, 0)
+    pose_bone.rotation_euler = (0, 0, 0)
+    pose_bone.scale = (1, 1, 1)
+
+
+def backup_retarget_state(context, arm):
+    """记住场景帧范围与骨架变换，并清空'torso_root'和'root'的变换"""
+    scene = context.scene
+    state = {
+        "frame_start": scene.frame_start,
+        "frame_end": scene.frame_end,
+        "frame_current": scene.frame_current,
+        "matrix_world": arm.matrix_world.copy(),
+        "torso_root": copy_pose_transform(arm.pose.bones['torso_root']),
+        "root": copy_pose_transform(arm.pose.bones['root']),
+    }
+
+    scene.tool_settings.use_keyframe_insert_auto = False  # 禁用自动插帧
+
+    # 清空变换
+    clear_pose_transform(arm.pose.bones['torso_root'])
+    clear_pose_transform(arm.pose.bones['root'])
+
+    # 清空arm的旋转
+    arm.rotation_euler = (0, 0, 0)
+    arm.rotation_quaternion = (1, 0, 0, 0)
+    return state
+
+
+def restore_retarget_state(context, arm, state):
+    """恢复场景帧范围与骨架变换"""
+    scene = context.scene
+    paste_pose_transform(arm.pose.bones['torso_root'], state["torso_root"])
+    paste_pose_transform(arm.pose.bones['root'], state["root"])
+
+    # 恢复arm的变换
+    arm.matrix_world = state["matrix_world"].copy()
+
+    scene.mmr_kumopult_bac_owner = None  # 取消选择目标骨架
+
+    scene.frame_start = int(state["frame_start"])
+    scene.frame_end = int(state["frame_end"])
+    scene.frame_current = int(state["frame_current"])
+
+
+def set_ik_fk(arm):
+    """切换到FK"""
+    for i in IK_FK_BONES:
+        arm.pose.bones[i]["IK_FK"] = 1  # 设置IK_FK属性为1
+
+
+def activate_object(context, obj):
+    """取消选择所有物体并激活指定物体"""
+    for o in context.selected_objects:
+        o.select_set(False)
+    context.view_layer.objects.active = obj
+    obj.select_set(True)
+
+
+def armature_signature(obj):
+    """骨架签名：骨骼名称、静止矩阵与物体旋转缩放的哈希"""
+    bones = obj.data.bones
+    matrices = np.empty(len(bones) * 16, dtype=np.float32)
+    bones.foreach_get('matrix_local', matrices)
+    rotation_scale = np.array(obj.matrix_world.to_3x3(), dtype=np.float32)
+    h = hashlib.sha1()
+    h.update('\0'.join(bone.name for bone in bones).encode('utf-8'))
+    # +0.0 将 -0.0 统一为 0.0
+    h.update((np.round(matrices, 4) + 0.0).tobytes())
+    h.update((np.round(rotation_scale, 4) + 0.0).tobytes())
+    return h.hexdigest()
+
+
+def resolve_mapping_rows(arm, source, preset_path):
+    """读取映射预设并计算未指定的旋转偏移，按 (源骨架签名, 映射骨架签名, 预设) 缓存
+
+    旋转偏移按静止姿态计算，同一骨架类型的后续动作直接复用结果
+    """
+    s = arm.data.mmr_kumopult_bac
+    key = (armature_signature(source), armature_signature(arm), os.path.abspath(preset_path),
+           os.path.getmtime(preset_path), s.calc_offset, s.ortho_offset)
+    rows = _mapping_cache.get(key)
+    if rows is not None:
+        print(f"映射缓存命中: {source.name}")
+        return rows
+
+    rows = []
+    for row in load_mapping_preset(preset_path):
+        if row['offset'] is None:
+            row = dict(row)
+            owner_bone = arm.data.bones.get(row['owner'])
+            target_bone = source.data.bones.get(row['target'])
+            offset = None
+            if s.calc_offset and owner_bone and target_bone:
+                offset = calc_rotation_offset(source.matrix_world @ target_bone.matrix_local,
+                                              arm.matrix_world @ owner_bone.matrix_local, s.ortho_offset)
+            row['offset'] = list(offset) if offset else [0.0, 0.0, 0.0]
+            row['has_rotoffs'] = row['has_rotoffs'] or offset is not None
+        rows.append(row)
+    _mapping_cache[key] = rows
+    return rows
+
+
+def setup_bone_mapping(context, arm, source, preset_path):
+    """设置映射骨架与约束目标，并应用映射预设"""
+    activate_object(context, arm)
+    context.scene.mmr_kumopult_bac_owner = arm  # 选择目标骨架
+    try:
+        rows = resolve_mapping_rows(arm, source, preset_path)
+    except (ValueError, SyntaxError) as e:
+        # 无法转换的自定义脚本预设仍然直接运行
+        if not preset_path.lower().endswith('.py'):
+            raise
+        print(f"映射预设无法解析，将运行脚本: {e}")
+        arm.data.mmr_kumopult_bac.selected_target = source  # 选择要复制的骨架
+        bpy.ops.script.python_file_run(filepath=preset_path)  # 运行脚本
+        return
+    # 切换目标骨架时不刷新旧映射的约束，映射表一次性生成约束
+    with suppress_mapping_updates():
+        arm.data.mmr_kumopult_bac.selected_target = source  # 选择要复制的骨架
+    arm.data.mmr_kumopult_bac.apply_mapping_table(rows)
+
+
+def remove_bac_constraints(arm):
+    """删除骨骼映射生成的约束"""
+    for bone in arm.pose.bones:
+        for constraint in list(bone.constraints):
+            if constraint.name in BAC_CONSTRAINTS:
+                bone.constraints.remove(constraint)
+
+
+def align_root_to_torso(arm):
+    """临时将root设为torso的子级，记住root的变换后恢复原父级"""
+    bpy.ops.object.mode_set(mode='EDIT')  # 进入编辑模式
+    edit_bones = arm.data.edit_bones
+
+    # 获取'torso'和'root'骨骼父级
+    torso_parent = edit_bones['torso'].parent
+    torso_parent = torso_parent.name if torso_parent else None
+    root_parent = edit_bones['root'].parent
+    root_parent = root_parent.name if root_parent else None
+
+    # 清空骨骼父级
+    edit_bones['torso'].parent = None
+    edit_bones['root'].parent = None
+
+    # 设置骨骼父级
+    edit_bones['root'].parent = edit_bones.get('torso')
+    # 不要继承父级的变换
+    edit_bones['root'].use_inherit_rotation = False
+    edit_bones['root'].inherit_scale = 'NONE'
+
+    bpy.ops.object.mode_set(mode="POSE")  # 进入姿态模式
+    # 记住root骨骼的世界变换
+    root_world_matrix_copy = arm.pose.bones['root'].matrix.copy()
+
+    bpy.ops.object.mode_set(mode="EDIT")  # 进入编辑模式
+    edit_bones = arm.data.edit_bones
+    # 恢复root骨骼的父级
+    edit_bones['root'].parent = edit_bones.get(root_parent) if root_parent else None
+    # 恢复torso骨骼的父级
+    edit_bones['torso'].parent = edit_bones.get(torso_parent) if torso_parent else None
+
+    bpy.ops.object.mode_set(mode="POSE")  # 进入姿态模式
+    arm.pose.bones['root'].matrix = root_world_matrix_copy  # 恢复root骨骼的世界变换
+
+
+def push_action_to_nla(context, arm, action, start_frame):
+    """将动作添加到新的NLA轨道"""
+    area = context.area
+    area_type = area.type if area else None  # 保存当前区域类型
+
+    # 临时切换到非线性动画
+    if area:
+        area.type = 'NLA_EDITOR'
+    # 新建一个NLA轨道
+    nla_track = arm.animation_data.nla_tracks.new()
+    nla_track.name = action.name  # 重命名轨道
+    # 在NLA轨道上添加动作
+    nla_strip = nla_track.strips.new(nla_track.name, int(start_frame), action)
+    nla_strip.extrapolation = 'NOTHING'
+    nla_strip.blend_type = 'REPLACE'
+
+    # 恢复原来ui界面
+    if area:
+        area.type = area_type
+    return nla_track
+
+
+def bake_retarget_clip(context, arm, action_name, start_frame, end_frame, frame_step, direct_bake=True,
+                       keep_constraints=False):
+    """对当前源动作执行root对齐、地面高度分析、烘焙与NLA轨道创建
+
+    Args:
+        context: 上下文
+        arm: 映射骨架
+        action_name: 烘焙后的动作名称
+        start_frame: 起始帧
+        end_frame: 结束帧
+        frame_step: 烘焙帧步长
+        direct_bake: 是否优先使用直接烘焙
+        keep_constraints: 是否保留映射约束（批量重定向时复用）
+
+    Returns:
+        烘焙后的动作，失败时返回None
+    """
+    root = arm.pose.bones['root']
+
+    align_root_to_torso(arm)
+    check_bones_exist(arm, GROUND_BONE_NAMES)
+
+    scan = {}
+
+    def apply_ground_height(frames, poses):
+        """地面高度分析，并将root的Z轴位置设为最低点"""
+        if all(name in poses for name in GROUND_BONE_NAMES):
+            scan.update(ground_height_from_poses(arm, GROUND_BONE_NAMES, frames, poses))
+        else:
+            scan.update(scan_ground_height(context, arm, GROUND_BONE_NAMES, frames))
+        root.matrix.translation.z = scan['min_z']
+
+    # 直接根据映射表烘焙，地面高度分析使用直接烘焙求解的姿态；无法直接计算时回退到可视化烘焙
+    baked_count = 0
+    if direct_bake:
+        baked_count = direct_bake_mappings(context, arm, int(start_frame), int(end_frame), frame_step,
+                                           reference_bones=GROUND_BONE_NAMES, on_reference=apply_ground_height)
+
+    # 回退到可视化烘焙时单独扫描
+    if not scan:
+        apply_ground_height(make_frames(start_frame, end_frame, frame_step), {})
+
+    if not baked_count:
+        bpy.ops.pose.select_all(action='DESELECT')  # 取消选择所有骨骼
+
+        # 检查所有的骨骼，如果有名称为"BAC_ROT_COPY"的骨骼约束，则选中
+        for bone in arm.pose.bones:
+            for constraint in bone.constraints:
+                if constraint.name == "BAC_ROT_COPY":
+                    bone.select = True
+                    break
+
+        bpy.ops.nla.bake(frame_start=int(start_frame),
+                         frame_end=int(end_frame),
+                         visual_keying=True,
+                         bake_types={'POSE'},
+                         step=frame_step,
+                         )
+
+    # 清空root变换
+    clear_pose_transform(root)
+
+    if keep_constraints:
+        set_bac_constraints_enabled(arm, True)
+    else:
+        remove_bac_constraints(arm)
+
+    # 获取烘焙后的动作
+    baked_action = None
+    if arm.animation_data:
+        baked_action = arm.animation_data.action
+        if baked_action:
+            baked_action.name = action_name  # 重命名动作
+            # 取消关联动作
+            arm.animation_data.action = None
+            print("已烘焙动作:", baked_action.name)
+
+    if baked_action:
+        push_action_to_nla(context, arm, baked_action, start_frame)
+    return baked_action
+
+
+def snapshot_pose_basis(arm):
+    """记住所有骨骼的基础变换"""
+    return {pb.name: pb.matrix_basis.copy() for pb in arm.pose.bones}
+
+
+def restore_pose_basis(arm, snapshot):
+    """恢复所有骨骼的基础变换"""
+    for name, matrix in snapshot.items():
+        pb = arm.pose.bones.get(name)
+        if pb:
+            pb.matrix_basis = matrix
+
+
+def get_action_frame_range(obj):
+    """获取物体当前动作的帧范围"""
+    frame_range = obj.animation_data.action.frame_range
+    print('帧范围：', frame_range[0], '///', frame_range[1])
+    return frame_range[0], frame_range[1]
+
+
+def snapshot_data_ids(types):
+    """记录当前各类数据块的指针，用于找出导入后新增的数据块"""
+    return {t: {id_data.as_pointer() for id_data in getattr(bpy.data, t)} for t in types}
+
+
+def purge_new_data(before):
+    """删除导入时新增的数据块（网格、材质、贴图等）
+
+    Returns:
+        删除的数据块数量
+    """
+    new_ids = []
+    for t, pointers in before.items():
+        new_ids += [id_data for id_data in getattr(bpy.data, t) if id_data.as_pointer() not in pointers]
+    if new_ids:
+        bpy.data.batch_remove(new_ids)
+    return len(new_ids)
+
+
+def import_fbx_armature(context, filepath, animation_only=True):
+    """导入FBX文件，删除非骨架物体并返回骨架
+
+    Args:
+        animation_only: 仅保留骨架与动画，跳过贴图搜索与自定义法线，并清理导入产生的网格、材质、贴图等数据块
+    """
+    before = snapshot_data_ids(FBX_PURGE_TYPES) if animation_only else None
+    if animation_only:
+        bpy.ops.import_scene.fbx(filepath=filepath, use_image_search=False, use_custom_normals=False)
+    else:
+        bpy.ops.import_scene.fbx(filepath=filepath)
+
+    fbx_arm = None
+    # 从当前选择的东西获取骨架
+    others = []
+    for obj in context.selected_objects:
+        # 删掉除了骨架之外的物体
+        if obj.type == 'ARMATURE':
+            fbx_arm = obj
+        else:
+            others.append(obj)
+    if others:
+        bpy.data.batch_remove(others)  # 删除非骨架物体
+
+    if animation_only:
+        count = purge_new_data(before)
+        if count:
+            print(f"已清理FBX导入的 {count} 个数据块")
+    return fbx_arm
+
+
+def remove_source_armature(obj):
+    """删除源骨架及其不再使用的骨架数据与动作"""
+    action = obj.animation_data.action if obj.animation_data else None
+    armature_data = obj.data
+    bpy.data.objects.remove(obj)
+    if armature_data.users == 0:
+        bpy.data.armatures.remove(armature_data)
+    if action and action.users == 0:
+        bpy.data.actions.remove(action)
+
+
+def transfer_source_action(source, imported):
+    """将新导入骨架的动作转移到已有的源骨架上，并删除新导入的骨架"""
+    action = imported.animation_data.action
+    old_action = source.animation_data.action if source.animation_data else None
+
+    if source.animation_data is None:
+        source.animation_data_create()
+    source.animation_data.action = action
+    # 分层动作需要指定动作槽
+    if hasattr(source.animation_data, 'action_slot') and source.animation_data.action_slot is None and action.slots:
+        source.animation_data.action_slot = action.slots[0]
+
+    armature_data = imported.data
+    bpy.data.objects.remove(imported)
+    if armature_data.users == 0:
+        bpy.data.armatures.remove(armature_data)
+
+    # 删除已经烘焙过的源动作
+    if old_action and old_action is not action and old_action.users == 0:
+        bpy.data.actions.remove(old_action)
+
+
+def fit_armature_size(obj_a, obj_b):
+    """按Z轴尺寸缩放物体A，使其与物体B一致并应用缩放"""
+    bpy.ops.object.mode_set(mode='OBJECT')  # 进入物体模式
+
+    if obj_a and obj_b:
+        # 获取目标Z轴尺寸和当前Z轴尺寸
+        target_z = obj_b.dimensions.z
+        current_z = obj_a.dimensions.z
+
+        # 避免除以零错误
+        if current_z == 0:
+            print("Error: 物体A的Z轴尺寸为0，无法缩放")
+            return
+
+        if target_z == current_z:
+            print('尺寸相同，无法缩放')
+            return
+
+        # 直接计算缩放因子
+        scale_factor = target_z / current_z
+
+        # 应用缩放因子到所有轴向（保持比例）
+        obj_a.scale *= scale_factor
+
+        # 更新视图层以确保尺寸计算准确
+        bpy.context.view_layer.update()
+
+        # 应用缩放变换
+        bpy.ops.object.select_all(action='DESELECT')
+        obj_a.select_set(True)
+        bpy.context.view_layer.objects.active = obj_a
+        bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+
+
+def load_vmd_source(context, arm):
+    """追加VMD动作源骨架，并将其尺寸与脚部姿态匹配到映射骨架"""
+    # 从模板库复制VMD源骨架集合
+    if bpy.data.objects.get('MMR_leg_VMD_arm') is None:
+        append_template_collection(context, 'MMR_Leb.blend', 'MMR_leg_VMD')
+
+    fbx_arm = bpy.data.objects['MMR_leg_VMD_arm']
+
+    bpy.ops.object.mode_set(mode='POSE')  # 进入姿态模式
+
+    # 清空arm骨架变换
+    context.view_layer.objects.active = arm
+    arm.select_set(True)
+    bpy.ops.pose.select_all(action='SELECT')
+    bpy.ops.pose.transforms_clear()
+
+    # 缩放
+    fit_armature_size(fbx_arm, arm)
+
+    bpy.ops.object.mode_set(mode='POSE')
+
+    for key, value in VMD_FOOT_BONES.items():
+        print(f"键名: {key}, 值: {value}")
+        context.view_layer.update()  # 更新视图层
+        # 获取骨骼
+        bone_a = fbx_arm.pose.bones.get(value)
+        bone_b = arm.pose.bones.get(key)
+
+        if bone_a and bone_b:
+
+            bone_b_location = bone_a.location.copy()  # 复制位置
+            bone_b_scale = bone_a.scale.copy()  # 复制缩放
+
+            bone_a.matrix = bone_b.matrix.copy()
+
+            bone_a.location = bone_b_location  # 恢复位置
+            bone_a.scale = bone_b_scale  # 恢复缩放
+            bpy.ops.pose.armature_apply(selected=False)
+
+    context.view_layer.objects.active = arm
+    arm.select_set(True)
+    return fbx_arm
+
+
+def import_vmd_motion(context, fbx_arm, filepath, ik_import):
+    """将VMD动作导入到源骨架"""
+    context.view_layer.objects.active = fbx_arm  # 激活目标对象
+    fbx_arm.select_set(True)
+
+    # 导入VMD文件
+    file_path = str(filepath)
+    file_name = os.path.basename(file_path)
+    new_path1 = os.path.dirname(file_path)
+
+    bpy.ops.mmd_tools.import_vmd(filepath=file_path,
+                                 files=[{"name": file_name, "name": file_name}],
+                                 directory=new_path1)
+
+    if ik_import:
+        subtarget = ['つま先ＩＫ.L', 'つま先ＩＫ.R', '足ＩＫ.R', '足ＩＫ.L']
+        # 遍历骨骼
+        for bone in fbx_arm.pose.bones:
+            # 遍历骨骼约束
+            for constraint in bone.constraints:
+                # 类型是否为IK
+                if constraint.type == 'IK':
+                    for s in subtarget:
+                        if constraint.subtarget == s:
+                            # 设置影响值为0
+                            constraint.influence = 1.0
+                            print(f"已将骨骼 '{bone.name}' 的IK约束影响值设置为1.0")
+
+
+def remove_vmd_source(fbx_arm):
+    """删除VMD动作源骨架及其集合"""
+    bpy.data.objects.remove(fbx_arm)  # 删除
+    vmd_obj = bpy.data.objects.get("MMR_leg_VMD")
+    if vmd_obj:
+        bpy.data.objects.remove(vmd_obj)  # 删除
+    vmd_collection = bpy.data.collections.get("MMR_leg_VMD")
+    if vmd_collection:
+        bpy.data.collections.remove(vmd_collection)  # 删除集合
+
+
+def get_fbx_preset_path(mmr):
+    """FBX映射预设路径"""
+    return find_mapping_preset(os.path.join(os.path.dirname(__file__), 'presets'), mmr.py_presets)
+
+
+def get_vmd_preset_path():
+    """VMD映射预设路径"""
+    return find_mapping_preset(os.path.join(os.path.dirname(__file__), 'MMR_OP_Presets'), 'MMR_VMD')
+
+
+def collect_motion_files(pattern):
+    """收集文件夹或通配符路径下的动作文件
+
+    Args:
+        pattern: 文件夹路径或通配符路径（例如 D:/mocap/*.fbx）
+
+    Returns:
+        排序后的FBX/VMD文件路径列表
+    """
+    pattern = bpy.path.abspath(pattern)
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p) and p.lower().endswith(MOTION_EXTENSIONS))
+
+
+def batch_retarget(context, arm, files, direct_bake=True):
+    """批量重定向多个FBX/VMD动作，每个文件生成一个动作和NLA轨道
+
+    同类型的文件复用同一个源骨架与映射约束，不会为每个文件重新追加源骨架或重建约束
+
+    Args:
+        context: 上下文
+        arm: 映射骨架
+        files: 动作文件路径列表
+        direct_bake: 是否优先使用直接烘焙
+
+    Returns:
+        (成功列表[(文件, 动作名, 耗时)], 失败列表[(文件, 错误信息)])
+    """
+    mmr = arm.mmr
+    results = []
+    failures = []
+
+    activate_object(context, arm)
+    bpy.ops.object.mode_set(mode='POSE')  # 进入姿态模式
+    set_ik_fk(arm)
+    state = backup_retarget_state(context, arm)
+    pose_snapshot = snapshot_pose_basis(arm)
+
+    # 已有的NLA轨道会影响烘焙结果，批量处理期间暂时关闭
+    if arm.animation_data is None:
+        arm.animation_data_create()
+    use_nla = arm.animation_data.use_nla
+    arm.animation_data.use_nla = False
+
+    fbx_files = [f for f in files if f.lower().endswith('.fbx')]
+    vmd_files = [f for f in files if f.lower().endswith('.vmd')]
+
+    # FBX动作: 骨架相同（骨骼名称与静止姿态一致）的文件共用源骨架，只转移动作；
+    # 骨架不同时改用新骨架作为源骨架并重新建立映射
+    fbx_source = None
+    fbx_signature = None
+    for path in fbx_files:
+        time_start = time.time()
+        try:
+            imported = import_fbx_armature(context, path, mmr.fbx_animation_only)
+            if imported is None:
+                raise Exception("FBX文件中没有骨架")
+            signature = armature_signature(imported)
+            if fbx_source is not None and signature == fbx_signature:
+                transfer_source_action(fbx_source, imported)
+            else:
+                if fbx_source is not None:
+                    print(f"源骨架不同，重新建立映射: {os.path.basename(path)}")
+                    remove_bac_constraints(arm)
+                    remove_source_armature(fbx_source)
+                fbx_source = imported
+                fbx_signature = signature
+                setup_bone_mapping(context, arm, fbx_source, get_fbx_preset_path(mmr))
+            fbx_source.matrix_world.translation = arm.matrix_world.translation
+
+            start_frame, end_frame = get_action_frame_range(fbx_source)
+            activate_object(context, arm)
+            bpy.ops.object.mode_set(mode='POSE')
+            name = os.path.splitext(os.path.basename(path))[0]
+            action = bake_retarget_clip(context, arm, name, start_frame, end_frame, mmr.frame_step,
+                                        direct_bake=direct_bake, keep_constraints=True)
+            results.append((path, action.name if action else name, time.time() - time_start))
+        except Exception as e:
+            traceback.print_exc()
+            failures.append((path, str(e)))
+        # 每个动作都从相同的姿态开始烘焙
+        restore_pose_basis(arm, pose_snapshot)
+
+    if fbx_source:
+        remove_bac_constraints(arm)
+        remove_source_armature(fbx_source)
+
+    # VMD动作: 源骨架只追加一次
+    vmd_source = None
+    for path in vmd_files:
+        time_start = time.time()
+        try:
+            if vmd_source is None:
+                vmd_source = load_vmd_source(context, arm)
+            import_vmd_motion(context, vmd_source, path, mmr.IK_import_bool)
+            vmd_source.matrix_world.translation = arm.matrix_world.translation
+            if arm.data.mmr_kumopult_bac.target is not vmd_source:
+                setup_bone_mapping(context, arm, vmd_source, get_vmd_preset_path())
+
+            start_frame, end_frame = get_action_frame_range(vmd_source)
+            activate_object(context, arm)
+            bpy.ops.object.mode_set(mode='POSE')
+            name = os.path.splitext(os.path.basename(path))[0]
+            action = bake_retarget_clip(context, arm, name, start_frame, end_frame, mmr.frame_step,
+                                        direct_bake=direct_bake, keep_constraints=True)
+            results.append((path, action.name if action else name, time.time() - time_start))
+        except Exception as e:
+            traceback.print_exc()
+            failures.append((path, str(e)))
+        # 每个动作都从相同的姿态开始烘焙
+        restore_pose_basis(arm, pose_snapshot)
+
+    if vmd_source:
+        remove_bac_constraints(arm)
+        remove_vmd_source(vmd_source)
+
+    arm.animation_data.use_nla = use_nla
+    restore_retarget_state(context, arm, state)
+
+    print(f"\n===== 批量重定向 =====")
+    for path, name, cost in results:
+        print(f"完成 {os.path.basename(path)} -> {name} ({cost:.2f}s)")
+    for path, error in failures:
+        print(f"失败 {os.path.basename(path)}: {error}")
+    return results, failures
+
 
 class MMR_redirect(bpy.types.Operator):
     """ Import FBX actions """
@@ -20,11 +807,6 @@ class MMR_redirect(bpy.types.Operator):
 
         mmr = context.object.mmr
 
-        # 获取当前运行的Py文件的路径
-        current_file_path = __file__
-        # 获取当前Py文件所在的文件夹路径
-        new_path = os.path.dirname(current_file_path)
-
         # 获取当前活动对象
         arm = bpy.context.active_object
         # 检查是否为骨架
@@ -32,345 +814,35 @@ class MMR_redirect(bpy.types.Operator):
             self.report({'ERROR'}, '请选择一个骨架')
             return {'CANCELLED'}
 
-        # 记住开始帧
-        start_frame1 = bpy.context.scene.frame_start
-        # 记住结束帧
-        end_frame1 = bpy.context.scene.frame_end
-        # 记住当前帧
-        current_frame1 = bpy.context.scene.frame_current
-
         bpy.ops.object.mode_set(mode='POSE')  # 进入姿态模式
 
-        ik_fk = ["upper_arm_parent.L", "upper_arm_parent.R", "thigh_parent.R","thigh_parent.L" ]
-
-        for i in ik_fk:
-            arm.pose.bones[i]["IK_FK"] = 1  # 设置IK_FK属性为1
-
-        bpy.context.scene.tool_settings.use_keyframe_insert_auto = False  # 禁用自动插帧
-
-        # 记住arm的变换
-        arm_matrix_world = arm.matrix_world.copy()
-
-        # 获取'torso_root'骨骼变换
-        torso_root = arm.pose.bones['torso_root']
-        # 复制'torso_root'的变换信息
-        torso_root_copy = {
-            "location": torso_root.location.copy(),
-            "rotation_quaternion": torso_root.rotation_quaternion.copy(),
-            "rotation_euler": torso_root.rotation_euler.copy(),
-            "scale": torso_root.scale.copy()
-        }
-
-        # 获取'root'骨骼变换
-        root = arm.pose.bones['root']
-        # 复制'root'的变换信息
-        root_copy = {
-            "location": root.location.copy(),
-            "rotation_quaternion": root.rotation_quaternion.copy(),
-            "rotation_euler": root.rotation_euler.copy(),
-            "scale": root.scale.copy()
-        }
-
-        # 清空变换
-        torso_root.location = (0, 0, 0)
-        torso_root.rotation_quaternion = (1, 0, 0, 0)
-        torso_root.rotation_euler = (0, 0, 0)
-        torso_root.scale = (1, 1, 1)
-
-        root.location = (0, 0, 0)
-        root.rotation_quaternion = (1, 0, 0, 0)
-        root.rotation_euler = (0, 0, 0)
-        root.scale = (1, 1, 1)
-
-        # 清空arm的旋转
-        arm.rotation_euler = (0, 0, 0)
-        arm.rotation_quaternion = (1, 0, 0, 0)
-
-        # 編輯模式
-        bpy.ops.object.mode_set(mode='EDIT')
-
-        # 获取'torso'骨骼父级
-        torso_parent_copy = arm.data.edit_bones['torso'].parent
-        if torso_parent_copy is None:
-            print("'torso'骨骼没有父级")
-        else:
-            torso_parent_copy = torso_parent_copy.name  # 获取父级的名称
+        set_ik_fk(arm)
 
-        # 获取'root'骨骼父级
-        root_parent_copy = arm.data.edit_bones['root'].parent
-        if root_parent_copy is None:
-            print("'root'骨骼没有父级")
-        else:
-            root_parent_copy = root_parent_copy.name  # 获取父级的名称
+        state = backup_retarget_state(context, arm)
 
         # 导入FBX文件
-        bpy.ops.import_scene.fbx(filepath=self.filepath)
+        fbx_arm = import_fbx_armature(context, self.filepath, mmr.fbx_animation_only)
         # 获取FBX文件名称
-        fbx_name = os.path.basename(self.filepath)
-        # 移除扩展名
-        fbx_name = os.path.splitext(fbx_name)[0]
-
-        # 从当前选择的东西获取骨架
-        for obj in bpy.context.selected_objects:
-            # 删掉除了骨架之外的物体
-            if obj.type == 'ARMATURE':
-                fbx_arm = obj
-            else:
-                bpy.data.objects.remove(obj)  # 删除非骨架物体
+        fbx_name = os.path.splitext(os.path.basename(self.filepath))[0]
 
         # fbx_arm 移动到 arm 的位置
         fbx_arm.matrix_world.translation = arm.matrix_world.translation
 
         # fbx_arm 的骨骼动画帧范围
-        start_frame = fbx_arm.animation_data.action.frame_range[0]
-        end_frame = fbx_arm.animation_data.action.frame_range[1]
-
-        print('帧范围：',start_frame, '///', end_frame)
-
-        # 取消选择所有物体
-        for obj in bpy.context.selected_objects:
-            obj.select_set(False)
-
-        # 激活 arm
-        bpy.context.view_layer.objects.active = arm
-        arm.select_set(True)
-
-        bpy.context.scene.mmr_kumopult_bac_owner = arm  # 选择目标骨架
-        arm.data.mmr_kumopult_bac.selected_target = fbx_arm  # 选择要复制的骨架
-
-        target_script = os.path.join(new_path, 'presets', mmr.py_presets + '.py')  # 目标脚本路径
+        start_frame, end_frame = get_action_frame_range(fbx_arm)
 
-        bpy.ops.script.python_file_run(filepath=target_script)  # 运行脚本
+        setup_bone_mapping(context, arm, fbx_arm, get_fbx_preset_path(mmr))
 
         if mmr.Manually_adjust_FBX_movements:
             bpy.ops.object.mode_set(mode='POSE')
             return {"FINISHED"}
 
-        bpy.ops.object.mode_set(mode='EDIT')  # 进入编辑模式
-
-        # 清空骨骼父级
-        arm.data.edit_bones['torso'].parent = None
-        arm.data.edit_bones['root'].parent = None
-
-        # 设置骨骼父级
-        arm.data.edit_bones['root'].parent = arm.data.edit_bones.get('torso')
-        # 不要继承父级的变换
-        arm.data.edit_bones['root'].use_inherit_rotation = False
-        arm.data.edit_bones['root'].inherit_scale = 'NONE'
-
-        bpy.ops.object.mode_set(mode="POSE")  # 进入姿态模式
-        # 记住root骨骼的世界变换
-        root_world_matrix_copy = arm.pose.bones['root'].matrix.copy()
-
-        bpy.ops.object.mode_set(mode="EDIT")  # 进入编辑模式
-        # 恢复root骨骼的父级
-        if root_parent_copy is None:
-            arm.data.edit_bones['root'].parent = None
-        else:
-            arm.data.edit_bones['root'].parent = arm.data.edit_bones.get(root_parent_copy)
-        # 恢复torso骨骼的父级
-        if torso_parent_copy is None:
-            arm.data.edit_bones['torso'].parent = None
-        else:
-            arm.data.edit_bones['torso'].parent = arm.data.edit_bones.get(torso_parent_copy)
-
-        bpy.ops.object.mode_set(mode="POSE")  # 进入姿态模式
-        arm.pose.bones['root'].matrix = root_world_matrix_copy  # 恢复root骨骼的世界变换
-
-        # 配置参数
-        ARMATURE_NAME = arm.name  # 骨架名称
-        BONE_NAMES = [ 'head', 'torso', 'chest', "ORG-heel.02.R", "ORG-heel.02.L",'ORG-hand.R', 'ORG-hand.L',
-                      'ORG-forearm.R','ORG-forearm.L','ORG-shin.R','ORG-shin.L','ORG-toe.R','ORG-toe.L']  # 需要监控的骨骼名称
-        START_FRAME = int(start_frame)  # 起始帧
-        END_FRAME = int(end_frame)  # 结束帧
-        SCAN_PHASES = [25, 10, 5, 2, 1]  # 多级扫描相位
-
-        # 获取骨架对象
-        armature = bpy.data.objects.get(ARMATURE_NAME)
-        if not armature or armature.type != 'ARMATURE':
-            raise Exception(f"未找到骨架: {ARMATURE_NAME}")
-
-        # 验证骨骼存在性
-        bones = []
-        for name in BONE_NAMES:
-            bone = armature.pose.bones.get(name)
-            if not bone:
-                raise Exception(f"骨骼不存在: {name}")
-            bones.append(bone)
-
-        # 初始化跟踪数据
-        global_min_z = float('inf')
-        global_min_frame = None
-        global_min_bones = []
-
-        # 多级扫描流程
-        current_start = START_FRAME
-        current_end = END_FRAME
-
-        for phase, step in enumerate(SCAN_PHASES, 1):
-            # 生成当前相位扫描范围
-            scan_frames = []
-            frame = current_start
-            while frame <= current_end:
-                scan_frames.append(frame)
-                frame += step
-
-            # 确保包含端点
-            if scan_frames and scan_frames[-1] != current_end:
-                scan_frames.append(current_end)
-
-            print(f"\n=== 相位 {phase} (步长 {step}) ===")
-            print(f"扫描范围: {current_start}-{current_end}")
-            print(f"检测帧: {scan_frames}")
-
-            # 遍历当前相位的所有帧
-            for frame in scan_frames:
-                bpy.context.scene.frame_set(frame)
-                bpy.context.view_layer.update()
-
-                # 获取双骨骼位置数据
-                frame_data = []
-                for bone in bones:
-                    world_matrix = armature.matrix_world @ bone.matrix
-                    z_pos = world_matrix.translation.z
-                    frame_data.append(z_pos)
-
-                # 计算本帧最低值
-                current_min_z = min(frame_data)
-                current_min_bones = [BONE_NAMES[i] for i, z in enumerate(frame_data) if z == current_min_z]
-
-                # 更新全局记录
-                update_flag = False
-                if current_min_z < global_min_z:
-                    update_flag = True
-                elif current_min_z == global_min_z and frame < global_min_frame:
-                    update_flag = True  # 相同Z值时取更早的帧
-
-                if update_flag:
-                    global_min_z = current_min_z
-                    global_min_frame = frame
-                    global_min_bones = current_min_bones
-                    print(f"帧 {frame:3d}: 新最低 Z={global_min_z:.4f} ({', '.join(global_min_bones)})")
-
-            # 更新下一相位范围
-            if global_min_frame is not None:
-                new_start = max(START_FRAME, global_min_frame - step)
-                new_end = min(END_FRAME, global_min_frame + step)
-                current_start, current_end = new_start, new_end
-
-        # 最终精确扫描 (步长1)
-        if current_start < current_end:
-            print("\n=== 最终精确扫描 ===")
-            for frame in range(current_start, current_end + 1):
-                bpy.context.scene.frame_set(frame)
-                bpy.context.view_layer.update()
-
-                frame_data = []
-                for bone in bones:
-                    world_matrix = armature.matrix_world @ bone.matrix
-                    z_pos = world_matrix.translation.z
-                    frame_data.append(z_pos)
-                    print(f"帧 {frame}: {bone.name} Z={z_pos:.4f}")
-
-                current_min_z = min(frame_data)
-                current_min_bones = [BONE_NAMES[i] for i, z in enumerate(frame_data) if z == current_min_z]
-
-                if current_min_z < global_min_z or (current_min_z == global_min_z and frame < global_min_frame):
-                    global_min_z = current_min_z
-                    global_min_frame = frame
-                    global_min_bones = current_min_bones
-                    print(f"精确扫描帧 {frame}: Z={global_min_z:.4f}")
-
-        # 输出结果
-        if global_min_frame:
-            print(f"\n===== 最终结果 =====")
-            print(f"最低位置帧 : {global_min_frame}")
-            print(f"Z轴坐标     : {global_min_z:.6f}")
-            print(f"涉及骨骼    : {', '.join(global_min_bones)}")
-            bpy.context.scene.frame_set(global_min_frame)  # 跳转到关键帧
-        else:
-            print("未找到有效数据")
-
-        root.matrix.translation.z = global_min_z  # 设置root的Z轴位置
-
-        # 烘培动画
-        bpy.ops.pose.select_all(action='DESELECT')  # 取消选择所有骨骼
-
-        # 检查所有的骨骼，如果有名称为"BAC_ROT_COPY"的骨骼约束，则选中
-        armature = arm
-        for bone in armature.pose.bones:
-            for constraint in bone.constraints:
-                if constraint.name == "BAC_ROT_COPY":
-                    bone.select = True
-                    break
-
-        bpy.ops.nla.bake(frame_start=int(start_frame),
-                         frame_end=int(end_frame),
-                         visual_keying=True,
-                         bake_types={'POSE'},
-                         step=mmr.frame_step,
-                         )
-        # 清空root变换
-        root.location = (0, 0, 0)
-        root.rotation_quaternion = (1, 0, 0, 0)
-        root.rotation_euler = (0, 0, 0)
-        root.scale = (1, 1, 1)
-
-        # 删除列表中的约束
-        del_constraints = ['BAC_ROT_COPY', 'BAC_ROT_ROLL', 'BAC_LOC_COPY', 'BAC_IK']
-        for bone in armature.pose.bones:
-            for constraint in bone.constraints:
-                if constraint.name in del_constraints:
-                    bone.constraints.remove(constraint)
-
-        # 获取烘焙后的动作
-        if armature.animation_data:
-            baked_action = armature.animation_data.action
-            if baked_action:
-                baked_action.name = fbx_name  # 重命名动作
-                # 取消关联动作
-                armature.animation_data.action = None
-                print("已烘焙动作:", baked_action.name)
-
-        area_type = context.area.type  # 保存当前区域类型
-
-        # 临时切换到非线性动画
-        context.area.type = 'NLA_EDITOR'
-        # 新建一个NLA轨道
-        nla_track = context.object.animation_data.nla_tracks.new()
-        nla_track.name = baked_action.name  # 重命名轨道
-        # 在NLA轨道上添加动作
-        nla_strip = nla_track.strips.new(nla_track.name, int(start_frame), baked_action)
-        nla_strip.extrapolation = 'NOTHING'
-        nla_strip.blend_type = 'REPLACE'
-
-        # 恢复原来ui界面
-        context.area.type = area_type
+        bake_retarget_clip(context, arm, fbx_name, start_frame, end_frame, mmr.frame_step,
+                           direct_bake=mmr.direct_bake)
 
         bpy.data.objects.remove(fbx_arm)  # 删除
 
-        # 恢复'torso_root'的变换
-        torso_root.location = torso_root_copy["location"]
-        torso_root.rotation_quaternion = torso_root_copy["rotation_quaternion"]
-        torso_root.rotation_euler = torso_root_copy["rotation_euler"]
-        torso_root.scale = torso_root_copy["scale"]
-        # 恢复'root'的变换
-        root.location = root_copy["location"]
-        root.rotation_quaternion = root_copy["rotation_quaternion"]
-        root.rotation_euler = root_copy["rotation_euler"]
-        root.scale = root_copy["scale"]
-
-        # 恢复arm的变换
-        arm.matrix_world = arm_matrix_world.copy()
-
-        bpy.context.scene.mmr_kumopult_bac_owner = None
-
-        # 恢复开始帧
-        bpy.context.scene.frame_start = int(start_frame1)
-        # 恢复结束帧
-        bpy.context.scene.frame_end = int(end_frame1)
-        # 恢复当前帧
-        bpy.context.scene.frame_current = int(current_frame1)
+        restore_retarget_state(context, arm, state)
 
         return {'FINISHED'}
 
@@ -394,48 +866,8 @@ class MMR_Import_VMD(bpy.types.Operator):
 
     def execute(self, context):
 
-        def Size_settings(A, B):
-            obj_a = A
-            obj_b = B
-
-            bpy.ops.object.mode_set(mode='OBJECT')  # 进入物体模式
-
-            if obj_a and obj_b:
-                # 获取目标Z轴尺寸和当前Z轴尺寸
-                target_z = obj_b.dimensions.z
-                current_z = obj_a.dimensions.z
-
-                # 避免除以零错误
-                if current_z == 0:
-                    print("Error: 物体A的Z轴尺寸为0，无法缩放")
-                    return
-
-                if target_z == current_z:
-                    print('尺寸相同，无法缩放')
-                    return
-
-                # 直接计算缩放因子
-                scale_factor = target_z / current_z
-
-                # 应用缩放因子到所有轴向（保持比例）
-                obj_a.scale *= scale_factor
-
-                # 更新视图层以确保尺寸计算准确
-                bpy.context.view_layer.update()
-
-                # 应用缩放变换
-                bpy.ops.object.select_all(action='DESELECT')
-                obj_a.select_set(True)
-                bpy.context.view_layer.objects.active = obj_a
-                bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-
         mmr = context.object.mmr
 
-        # 获取当前运行的Py文件的路径
-        current_file_path = __file__
-        # 获取当前Py文件所在的文件夹路径
-        new_path = os.path.dirname(current_file_path)
-
         # 获取当前活动对象
         arm = bpy.context.active_object
         # 检查是否为骨架
@@ -445,418 +877,81 @@ class MMR_Import_VMD(bpy.types.Operator):
 
         bpy.ops.object.mode_set(mode='OBJECT')  # 进入物体模式
 
-        blend_file_path = os.path.join(new_path, 'MMR_Leb.blend')
-
-        # 记住开始帧
-        start_frame1 = bpy.context.scene.frame_start
-        # 记住结束帧
-        end_frame1 = bpy.context.scene.frame_end
-        # 记住当前帧
-        current_frame1 = bpy.context.scene.frame_current
-
-        # 设置追加参数
-        filepath = os.path.join(blend_file_path, "Collection", "MMR_leg_VMD")
-        directory = os.path.join(blend_file_path, "Collection")
-        filename = "MMR_leg_VMD"
-
-        # 执行追加操作
-        if bpy.data.objects.get('MMR_leg_VMD_arm') is None:
-            bpy.ops.wm.append(
-                filepath=filepath,
-                directory=directory,
-                filename=filename,
-            )
-
-        fbx_arm = bpy.data.objects['MMR_leg_VMD_arm']
-
-        bpy.context.scene.tool_settings.use_keyframe_insert_auto = False  # 禁用自动插帧
-
-        # 记住arm的变换
-        arm_matrix_world = arm.matrix_world.copy()
-
-        # 获取'torso_root'骨骼变换
-        torso_root = arm.pose.bones['torso_root']
-        # 复制'torso_root'的变换信息
-        torso_root_copy = {
-            "location": torso_root.location.copy(),
-            "rotation_quaternion": torso_root.rotation_quaternion.copy(),
-            "rotation_euler": torso_root.rotation_euler.copy(),
-            "scale": torso_root.scale.copy()
-        }
-
-        # 获取'root'骨骼变换
-        root = arm.pose.bones['root']
-        # 复制'root'的变换信息
-        root_copy = {
-            "location": root.location.copy(),
-            "rotation_quaternion": root.rotation_quaternion.copy(),
-            "rotation_euler": root.rotation_euler.copy(),
-            "scale": root.scale.copy()
-        }
-
-        # 清空变换
-        torso_root.location = (0, 0, 0)
-        torso_root.rotation_quaternion = (1, 0, 0, 0)
-        torso_root.rotation_euler = (0, 0, 0)
-        torso_root.scale = (1, 1, 1)
-
-        root.location = (0, 0, 0)
-        root.rotation_quaternion = (1, 0, 0, 0)
-        root.rotation_euler = (0, 0, 0)
-        root.scale = (1, 1, 1)
-
-        # 清空arm的旋转
-        arm.rotation_euler = (0, 0, 0)
-        arm.rotation_quaternion = (1, 0, 0, 0)
-
-        bpy.ops.object.mode_set(mode='POSE')  # 进入姿态模式
-
-        # 清空arm骨架变换
-        bpy.context.view_layer.objects.active = arm
-        arm.select_set(True)
-        bpy.ops.pose.select_all(action='SELECT')
-        bpy.ops.pose.transforms_clear()
-
-        # 缩放
-        Size_settings(fbx_arm,arm)
-
-        bpy.ops.object.mode_set(mode='POSE')
-
-        foot_bones = {'foot_fk.L': '足首.L', 'foot_fk.R': '足首.R', 'toe.L': '足先EX.L', 'toe.R': '足先EX.R'}
+        state = backup_retarget_state(context, arm)
 
-        for key, value in foot_bones.items():
-            print(f"键名: {key}, 值: {value}")
-            bpy.context.view_layer.update()  # 更新视图层
-            # 获取骨骼
-            bone_a = fbx_arm.pose.bones.get(value)
-            bone_b = arm.pose.bones.get(key)
+        fbx_arm = load_vmd_source(context, arm)
 
-            if bone_a and bone_b:
+        set_ik_fk(arm)
 
-                bone_b_location = bone_a.location.copy()  # 复制位置
-                bone_b_scale = bone_a.scale.copy()  # 复制缩放
+        # 获取VMD文件名称
+        fbx_name = os.path.splitext(os.path.basename(self.filepath))[0]
 
-                bone_a.matrix = bone_b.matrix.copy()
-
-                bone_a.location = bone_b_location  # 恢复位置
-                bone_a.scale = bone_b_scale  # 恢复缩放
-                bpy.ops.pose.armature_apply(selected=False)
-
-        bpy.context.view_layer.objects.active = arm
-        arm.select_set(True)
-
-        ik_fk = ["upper_arm_parent.L", "upper_arm_parent.R", "thigh_parent.R","thigh_parent.L" ]
-
-        for i in ik_fk:
-            arm.pose.bones[i]["IK_FK"] = 1  # 设置IK_FK属性为1
-
-        # 編輯模式
-        bpy.ops.object.mode_set(mode='EDIT')
-
-        # 获取'torso'骨骼父级
-        torso_parent_copy = arm.data.edit_bones['torso'].parent
-        if torso_parent_copy is None:
-            print("'torso'骨骼没有父级")
-        else:
-            torso_parent_copy = torso_parent_copy.name  # 获取父级的名称
-
-        # 获取'root'骨骼父级
-        root_parent_copy = arm.data.edit_bones['root'].parent
-        if root_parent_copy is None:
-            print("'root'骨骼没有父级")
-        else:
-            root_parent_copy = root_parent_copy.name  # 获取父级的名称
-
-        # 获取FBX文件名称
-        fbx_name = os.path.basename(self.filepath)
-        # 移除扩展名
-        fbx_name = os.path.splitext(fbx_name)[0]
-
-        bpy.context.view_layer.objects.active = fbx_arm  # 激活目标对象
-        fbx_arm.select_set(True)
-
-        # 导入VMD文件
-        file_path = str(self.filepath)
-        file_name = os.path.basename(file_path)
-        new_path1 = os.path.dirname(file_path)
-
-        bpy.ops.mmd_tools.import_vmd(filepath=file_path,
-                                         files=[{"name": file_name, "name": file_name}],
-                                         directory=new_path1)
-
-        if mmr.IK_import_bool:
-            subtarget = ['つま先ＩＫ.L', 'つま先ＩＫ.R', '足ＩＫ.R', '足ＩＫ.L']
-            # 遍历骨骼
-            for bone in fbx_arm.pose.bones:
-                # 遍历骨骼约束
-                for constraint in bone.constraints:
-                    # 类型是否为IK
-                    if constraint.type == 'IK':
-                        for s in subtarget:
-                            if constraint.subtarget == s:
-                                # 设置影响值为0
-                                constraint.influence = 1.0
-                                print(f"已将骨骼 '{bone.name}' 的IK约束影响值设置为1.0")
+        import_vmd_motion(context, fbx_arm, self.filepath, mmr.IK_import_bool)
 
         # fbx_arm 移动到 arm 的位置
         fbx_arm.matrix_world.translation = arm.matrix_world.translation
 
         # fbx_arm 的骨骼动画帧范围
-        start_frame = fbx_arm.animation_data.action.frame_range[0]
-        end_frame = fbx_arm.animation_data.action.frame_range[1]
-
-        print('帧范围：',start_frame, '///', end_frame)
+        start_frame, end_frame = get_action_frame_range(fbx_arm)
 
-        # 取消选择所有物体
-        for obj in bpy.context.selected_objects:
-            obj.select_set(False)
+        setup_bone_mapping(context, arm, fbx_arm, get_vmd_preset_path())
 
-        # 激活 arm
-        bpy.context.view_layer.objects.active = arm
-        arm.select_set(True)
+        if mmr.Manually_adjust_VMD_movements:
+            bpy.ops.object.mode_set(mode='POSE')
+            return {"FINISHED"}
 
-        bpy.context.scene.mmr_kumopult_bac_owner = arm  # 选择目标骨架
-        arm.data.mmr_kumopult_bac.selected_target = fbx_arm  # 选择要复制的骨架
+        bpy.ops.object.mode_set(mode='POSE')  # 进入姿态模式
 
-        target_script = os.path.join(new_path, 'MMR_OP_Presets', 'MMR_VMD.py')  # 目标脚本路径
+        bake_retarget_clip(context, arm, fbx_name, start_frame, end_frame, mmr.frame_step,
+                           direct_bake=mmr.direct_bake)
 
-        bpy.ops.script.python_file_run(filepath=target_script)  # 运行脚本
+        remove_vmd_source(fbx_arm)
 
-        if mmr.Manually_adjust_VMD_movements:
-            bpy.ops.object.mode_set(mode='POSE')
-            return {"FINISHED"}
+        restore_retarget_state(context, arm, state)
 
-        # 清空骨骼父级
-        arm.data.edit_bones['torso'].parent = None
-        arm.data.edit_bones['root'].parent = None
-
-        bpy.ops.object.mode_set(mode='EDIT')  # 进入编辑模式
-        # 设置骨骼父级
-        arm.data.edit_bones['root'].parent = arm.data.edit_bones.get('torso')
-        # 不要继承父级的变换
-        arm.data.edit_bones['root'].use_inherit_rotation = False
-        arm.data.edit_bones['root'].inherit_scale = 'NONE'
-
-        bpy.ops.object.mode_set(mode="POSE")  # 进入姿态模式
-        # 记住root骨骼的世界变换
-        root_world_matrix_copy = arm.pose.bones['root'].matrix.copy()
-
-        bpy.ops.object.mode_set(mode="EDIT")  # 进入编辑模式
-        # 恢复root骨骼的父级
-        if root_parent_copy is None:
-            arm.data.edit_bones['root'].parent = None
-        else:
-            arm.data.edit_bones['root'].parent = arm.data.edit_bones.get(root_parent_copy)
-        # 恢复torso骨骼的父级
-        if torso_parent_copy is None:
-            arm.data.edit_bones['torso'].parent = None
-        else:
-            arm.data.edit_bones['torso'].parent = arm.data.edit_bones.get(torso_parent_copy)
-
-        bpy.ops.object.mode_set(mode="POSE")  # 进入姿态模式
-        arm.pose.bones['root'].matrix = root_world_matrix_copy  # 恢复root骨骼的世界变换
-
-        # 配置参数
-        ARMATURE_NAME = arm.name  # 骨架名称
-        BONE_NAMES = [ 'head', 'torso', 'chest', "ORG-heel.02.R", "ORG-heel.02.L",'ORG-hand.R', 'ORG-hand.L',
-                      'ORG-forearm.R','ORG-forearm.L','ORG-shin.R','ORG-shin.L','ORG-toe.R','ORG-toe.L']  # 需要监控的骨骼名称
-        START_FRAME = int(start_frame)  # 起始帧
-        END_FRAME = int(end_frame)  # 结束帧
-        SCAN_PHASES = [25, 10, 5, 2, 1]  # 多级扫描相位
-
-        # 获取骨架对象
-        armature = bpy.data.objects.get(ARMATURE_NAME)
-        if not armature or armature.type != 'ARMATURE':
-            raise Exception(f"未找到骨架: {ARMATURE_NAME}")
-
-        # 验证骨骼存在性
-        bones = []
-        for name in BONE_NAMES:
-            bone = armature.pose.bones.get(name)
-            if not bone:
-                raise Exception(f"骨骼不存在: {name}")
-            bones.append(bone)
-
-        # 初始化跟踪数据
-        global_min_z = float('inf')
-        global_min_frame = None
-        global_min_bones = []
-
-        # 多级扫描流程
-        current_start = START_FRAME
-        current_end = END_FRAME
-
-        for phase, step in enumerate(SCAN_PHASES, 1):
-            # 生成当前相位扫描范围
-            scan_frames = []
-            frame = current_start
-            while frame <= current_end:
-                scan_frames.append(frame)
-                frame += step
-
-            # 确保包含端点
-            if scan_frames and scan_frames[-1] != current_end:
-                scan_frames.append(current_end)
-
-            print(f"\n=== 相位 {phase} (步长 {step}) ===")
-            print(f"扫描范围: {current_start}-{current_end}")
-            print(f"检测帧: {scan_frames}")
-
-            # 遍历当前相位的所有帧
-            for frame in scan_frames:
-                bpy.context.scene.frame_set(frame)
-                bpy.context.view_layer.update()
-
-                # 获取双骨骼位置数据
-                frame_data = []
-                for bone in bones:
-                    world_matrix = armature.matrix_world @ bone.matrix
-                    z_pos = world_matrix.translation.z
-                    frame_data.append(z_pos)
-
-                # 计算本帧最低值
-                current_min_z = min(frame_data)
-                current_min_bones = [BONE_NAMES[i] for i, z in enumerate(frame_data) if z == current_min_z]
-
-                # 更新全局记录
-                update_flag = False
-                if current_min_z < global_min_z:
-                    update_flag = True
-                elif current_min_z == global_min_z and frame < global_min_frame:
-                    update_flag = True  # 相同Z值时取更早的帧
-
-                if update_flag:
-                    global_min_z = current_min_z
-                    global_min_frame = frame
-                    global_min_bones = current_min_bones
-                    print(f"帧 {frame:3d}: 新最低 Z={global_min_z:.4f} ({', '.join(global_min_bones)})")
-
-            # 更新下一相位范围
-            if global_min_frame is not None:
-                new_start = max(START_FRAME, global_min_frame - step)
-                new_end = min(END_FRAME, global_min_frame + step)
-                current_start, current_end = new_start, new_end
-
-        # 最终精确扫描 (步长1)
-        if current_start < current_end:
-            print("\n=== 最终精确扫描 ===")
-            for frame in range(current_start, current_end + 1):
-                bpy.context.scene.frame_set(frame)
-                bpy.context.view_layer.update()
-
-                frame_data = []
-                for bone in bones:
-                    world_matrix = armature.matrix_world @ bone.matrix
-                    z_pos = world_matrix.translation.z
-                    frame_data.append(z_pos)
-                    print(f"帧 {frame}: {bone.name} Z={z_pos:.4f}")
-
-                current_min_z = min(frame_data)
-                current_min_bones = [BONE_NAMES[i] for i, z in enumerate(frame_data) if z == current_min_z]
-
-                if current_min_z < global_min_z or (current_min_z == global_min_z and frame < global_min_frame):
-                    global_min_z = current_min_z
-                    global_min_frame = frame
-                    global_min_bones = current_min_bones
-                    print(f"精确扫描帧 {frame}: Z={global_min_z:.4f}")
-
-        # 输出结果
-        if global_min_frame:
-            print(f"\n===== 最终结果 =====")
-            print(f"最低位置帧 : {global_min_frame}")
-            print(f"Z轴坐标     : {global_min_z:.6f}")
-            print(f"涉及骨骼    : {', '.join(global_min_bones)}")
-            bpy.context.scene.frame_set(global_min_frame)  # 跳转到关键帧
-        else:
-            print("未找到有效数据")
+        return {'FINISHED'}
 
-        root.matrix.translation.z = global_min_z  # 设置root的Z轴位置
+    def invoke(self, context, event):
+        # 弹出文件选择对话框
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
 
-        # 烘培动画
-        bpy.ops.pose.select_all(action='DESELECT')  # 取消选择所有骨骼
+class MMR_Batch_Retarget(bpy.types.Operator):
+    """ Batch retarget FBX/VMD actions """
+    bl_idname = 'object.mmr_batch_retarget'
+    bl_label = 'Batch retarget actions'
+    bl_options = {'REGISTER', 'UNDO'}  # 启用撤销功能
 
-        # 检查所有的骨骼，如果有名称为"BAC_ROT_COPY"的骨骼约束，则选中
-        armature = arm
-        for bone in armature.pose.bones:
-            for constraint in bone.constraints:
-                if constraint.name == "BAC_ROT_COPY":
-                    bone.select = True
-                    break
+    # 动作文件夹或通配符路径
+    source_path: bpy.props.StringProperty(
+        name="Source",
+        description="动作文件夹或通配符路径（例如 D:/mocap/*.fbx）",
+        subtype='FILE_PATH'
+    )
+    directory: bpy.props.StringProperty(subtype='DIR_PATH', options={'HIDDEN'})
 
-        bpy.ops.nla.bake(frame_start=int(start_frame),
-                         frame_end=int(end_frame),
-                         visual_keying=True,
-                         bake_types={'POSE'},
-                         step=mmr.frame_step,
-                         )
+    @classmethod
+    def poll(cls, context):
+        obj = context.view_layer.objects.active
+        return obj is not None and obj.type == 'ARMATURE'
 
-        # 清空root变换
-        root.location = (0, 0, 0)
-        root.rotation_quaternion = (1, 0, 0, 0)
-        root.rotation_euler = (0, 0, 0)
-        root.scale = (1, 1, 1)
+    def execute(self, context):
+        arm = context.view_layer.objects.active
 
-        # 删除列表中的约束
-        del_constraints = ['BAC_ROT_COPY', 'BAC_ROT_ROLL', 'BAC_LOC_COPY', 'BAC_IK']
-        for bone in armature.pose.bones:
-            for constraint in bone.constraints:
-                if constraint.name in del_constraints:
-                    bone.constraints.remove(constraint)
-
-        # 获取烘焙后的动作
-        if armature.animation_data:
-            baked_action = armature.animation_data.action
-            if baked_action:
-                baked_action.name = fbx_name  # 重命名动作
-                # 取消关联动作
-                armature.animation_data.action = None
-                print("已烘焙动作:", baked_action.name)
-
-        area_type = context.area.type  # 保存当前区域类型
-
-        # 临时切换到非线性动画
-        context.area.type = 'NLA_EDITOR'
-        # 新建一个NLA轨道
-        nla_track = context.object.animation_data.nla_tracks.new()
-        nla_track.name = baked_action.name  # 重命名轨道
-        # 在NLA轨道上添加动作
-        nla_strip = nla_track.strips.new(nla_track.name, int(start_frame), baked_action)
-        nla_strip.extrapolation = 'NOTHING'
-        nla_strip.blend_type = 'REPLACE'
-
-        # 恢复原来ui界面
-        context.area.type = area_type
+        files = collect_motion_files(self.source_path or self.directory)
+        if not files:
+            self.report({'ERROR'}, '没有找到FBX/VMD动作文件')
+            return {'CANCELLED'}
 
-        bpy.data.objects.remove(fbx_arm)  # 删除
-        bpy.data.objects.remove(bpy.data.objects.get("MMR_leg_VMD"))  # 删除
-        bpy.data.collections.remove(bpy.data.collections.get("MMR_leg_VMD"))  # 删除集合
-
-        # 恢复'torso_root'的变换
-        torso_root.location = torso_root_copy["location"]
-        torso_root.rotation_quaternion = torso_root_copy["rotation_quaternion"]
-        torso_root.rotation_euler = torso_root_copy["rotation_euler"]
-        torso_root.scale = torso_root_copy["scale"]
-        # 恢复'root'的变换
-        root.location = root_copy["location"]
-        root.rotation_quaternion = root_copy["rotation_quaternion"]
-        root.rotation_euler = root_copy["rotation_euler"]
-        root.scale = root_copy["scale"]
-
-        # 恢复arm的变换
-        arm.matrix_world = arm_matrix_world.copy()
-
-        bpy.context.scene.mmr_kumopult_bac_owner = None  # 取消选择目标骨架
-
-        # 恢复开始帧
-        bpy.context.scene.frame_start = int(start_frame1)
-        # 恢复结束帧
-        bpy.context.scene.frame_end = int(end_frame1)
-        # 恢复当前帧
-        bpy.context.scene.frame_current = int(current_frame1)
+        results, failures = batch_retarget(context, arm, files, direct_bake=arm.mmr.direct_bake)
 
+        if failures:
+            self.report({'WARNING'}, f"批量重定向完成: 成功 {len(results)} 个, 失败 {len(failures)} 个")
+        else:
+            self.report({'INFO'}, f"批量重定向完成: 成功 {len(results)} 个")
         return {'FINISHED'}
 
     def invoke(self, context, event):
-        # 弹出文件选择对话框
+        # 弹出文件夹选择对话框
         context.window_manager.fileselect_add(self)
-        return {'RUNNING_MODAL'}
\ No newline at end of file
+        return {'RUNNING_MODAL'}
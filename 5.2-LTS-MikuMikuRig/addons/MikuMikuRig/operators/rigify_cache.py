@@ -0,0 +1,333 @@
+"""Rigify生成缓存
+
+Rigify生成是生成控制器中最慢的一步。生成结果只取决于对齐后的元骨骼静止姿态与Rigify参数，
+因此以两者的哈希作为键，生成后保存一份不链接到场景的原始骨架；
+之后遇到相同的键时直接复制该骨架（obj.copy() 与 data.copy()），不再调用 rigify_generate。
+与MMD骨架之间的约束在生成之后绑定，因此复用的骨架同样适用于新的MMD骨架。
+控件物体（custom_shape）同样由原始骨架持有一份副本，每次复用时为新骨架复制一份，删除任何一个模型都不影响其他模型。
+Rigify界面脚本（rig_ui）也保存一份副本，复用时原脚本已被删除则由副本重建，保证新骨架有界面面板。
+原始骨架、控件与界面脚本副本设置了伪用户，保存文件或清理孤立数据后缓存仍然有效。
+生成键包含Blender与Rigify的版本，升级后不会复用旧版本的结果。
+原始骨架最多保留 RIGIFY_CACHE_LIMIT 个，超出时删除最久未使用的。
+"""
+import hashlib
+import json
+import time
+
+import addon_utils
+import bpy
+import numpy as np
+
+# 原始骨架与其控件上记录的生成键
+RIGIFY_CACHE_KEY = "mmr_rigify_cache"
+
+# 原始骨架最近一次使用的时间
+RIGIFY_CACHE_TIME_KEY = "mmr_rigify_cache_time"
+
+# 控件名称中骨架名称之后的部分（例如 WGT-RIG-xxx_root 中的 _root）
+WIDGET_SUFFIX_KEY = "mmr_widget_suffix"
+
+# 最多保留的原始骨架数量
+RIGIFY_CACHE_LIMIT = 4
+
+# 哈希静止姿态时保留的小数位数
+REST_POSE_DECIMALS = 5
+
+# 不参与哈希的元骨骼数据属性（生成目标与界面脚本）
+IGNORED_METARIG_PROPS = {'rigify_target_rig', 'rigify_rig_ui'}
+
+
+def rna_values(struct, prefix='', depth=0):
+    """将RNA属性转换为可序列化的值（数据块只记录名称）
+
+    Args:
+        struct: RNA结构
+        prefix: 只记录以此开头的属性
+        depth: 嵌套深度
+    """
+    result = {}
+    for prop in struct.bl_rna.properties:
+        name = prop.identifier
+        if name == 'rna_type' or name in IGNORED_METARIG_PROPS or not name.startswith(prefix):
+            continue
+        value = getattr(struct, name, None)
+        if prop.type == 'POINTER':
+            if isinstance(value, bpy.types.ID):
+                value = value.name
+            elif value is not None and depth < 2:
+                value = rna_values(value, depth=depth + 1)
+            else:
+                value = None
+        elif prop.type == 'COLLECTION':
+            value = [rna_values(item, depth=depth + 1) for item in value] if depth < 2 else len(value)
+        elif getattr(prop, 'is_array', False):
+            value = [round(v, REST_POSE_DECIMALS) if isinstance(v, float) else v for v in value]
+        elif prop.type == 'ENUM' and prop.is_enum_flag:
+            value = sorted(value)
+        elif isinstance(value, float):
+            value = round(value, REST_POSE_DECIMALS)
+        result[name] = value
+    return result
+
+
+def rigify_version():
+    """Rigify插件的版本，找不到时返回None"""
+    for module in addon_utils.modules(refresh=False):
+        if module.__name__.rsplit('.', 1)[-1] == 'rigify':
+            return tuple(addon_utils.module_bl_info(module).get('version', ()))
+    return None
+
+
+def metarig_signature(metarig):
+    """元骨骼静止姿态、Rigify参数以及Blender与Rigify版本的哈希
+
+    缓存的骨架随文件保存，升级Blender或Rigify后不会复用旧版本生成的结果
+
+    Args:
+        metarig: 对齐后的元骨骼
+
+    Returns:
+        十六进制哈希字符串
+    """
+    bones = metarig.data.bones
+    count = len(bones)
+    matrices = np.empty(count * 16, dtype=np.float32)
+    bones.foreach_get('matrix_local', matrices)
+    lengths = np.empty(count, dtype=np.float32)
+    bones.foreach_get('length', lengths)
+
+    md5 = hashlib.md5()
+    md5.update(np.round(matrices, REST_POSE_DECIMALS).tobytes())
+    md5.update(np.round(lengths, REST_POSE_DECIMALS).tobytes())
+
+    params = {
+        'versions': (tuple(bpy.app.version), rigify_version()),
+        'bones': [(b.name, b.parent.name if b.parent else '', b.use_connect,
+                   [c.name for c in b.collections]) for b in bones],
+        'rigify': {pb.name: (pb.rigify_type, rna_values(pb.rigify_parameters))
+                   for pb in metarig.pose.bones},
+        'collections': [(c.name, rna_values(c, 'rigify')) for c in metarig.data.collections_all],
+        'data': rna_values(metarig.data, 'rigify'),
+    }
+    md5.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    return md5.hexdigest()
+
+
+def find_cached_rig(key):
+    for obj in bpy.data.objects:
+        if obj.type == 'ARMATURE' and obj.get(RIGIFY_CACHE_KEY) == key:
+            return obj
+    return None
+
+
+def find_cached_rig_ui(key):
+    for text in bpy.data.texts:
+        if text.get(RIGIFY_CACHE_KEY) == key:
+            return text
+    return None
+
+
+def remove_cached_rigs(keys):
+    """删除原始骨架及其控件与界面脚本副本"""
+    ids = set()
+    for obj in bpy.data.objects:
+        if obj.get(RIGIFY_CACHE_KEY) in keys:
+            ids.add(obj)
+            if obj.data is not None and obj.data.users == 1:
+                ids.add(obj.data)
+    ids.update(text for text in bpy.data.texts if text.get(RIGIFY_CACHE_KEY) in keys)
+    bpy.data.batch_remove(ids)
+
+
+def prune_cached_rigs(limit=RIGIFY_CACHE_LIMIT):
+    """只保留最近使用的 limit 个原始骨架"""
+    masters = [obj for obj in bpy.data.objects if obj.type == 'ARMATURE' and RIGIFY_CACHE_KEY in obj]
+    masters.sort(key=lambda obj: obj.get(RIGIFY_CACHE_TIME_KEY, 0.0), reverse=True)
+    stale = {obj[RIGIFY_CACHE_KEY] for obj in masters[limit:]}
+    if stale:
+        remove_cached_rigs(stale)
+        print(f"删除{len(stale)}个Rigify生成缓存")
+
+
+def remap_self_references(obj, mapping):
+    """将约束目标与驱动器变量中引用的旧骨架替换为新骨架"""
+    constraints = list(obj.constraints)
+    for pose_bone in obj.pose.bones:
+        constraints.extend(pose_bone.constraints)
+    for constraint in constraints:
+        target = getattr(constraint, 'target', None)
+        if target in mapping:
+            constraint.target = mapping[target]
+
+    for anim_data in (obj.animation_data, obj.data.animation_data):
+        if not anim_data:
+            continue
+        for driver_fcurve in anim_data.drivers:
+            for var in driver_fcurve.driver.variables:
+                for target in var.targets:
+                    if target.id in mapping:
+                        target.id = mapping[target.id]
+
+
+def copy_rig(rig):
+    """复制骨架及其数据，并修正指向自身的引用"""
+    new_rig = rig.copy()
+    new_rig.data = rig.data.copy()
+    remap_self_references(new_rig, {rig: new_rig, rig.data: new_rig.data})
+    return new_rig
+
+
+def copy_widgets(rig):
+    """复制骨架使用的所有控件物体，并将 custom_shape 改为副本
+
+    Returns:
+        {原控件: 副本}
+    """
+    mapping = {}
+    for pose_bone in rig.pose.bones:
+        widget = pose_bone.custom_shape
+        if widget is None:
+            continue
+        if widget not in mapping:
+            new_widget = widget.copy()
+            if widget.data is not None:
+                new_widget.data = widget.data.copy()
+            mapping[widget] = new_widget
+        pose_bone.custom_shape = mapping[widget]
+    return mapping
+
+
+def store_generated_rig(metarig, rig, key):
+    """保存刚生成的骨架、控件与界面脚本作为原始骨架（不链接到场景，设置伪用户）"""
+    remove_cached_rigs({key})
+    master = copy_rig(rig)
+    master[RIGIFY_CACHE_KEY] = key
+    master[RIGIFY_CACHE_TIME_KEY] = time.time()
+    master.name = f"RIG-cache-{key[:8]}"
+    master.use_fake_user = True
+
+    prefix = "WGT-" + rig.name
+    for widget, new_widget in copy_widgets(master).items():
+        new_widget[RIGIFY_CACHE_KEY] = key
+        new_widget[WIDGET_SUFFIX_KEY] = widget.name[len(prefix):] if widget.name.startswith(prefix) else '_' + widget.name
+        new_widget.name = f"WGT-cache-{key[:8]}{new_widget[WIDGET_SUFFIX_KEY]}"
+        new_widget.use_fake_user = True
+
+    script = metarig.data.rigify_rig_ui
+    if script is not None:
+        cached_script = script.copy()
+        cached_script[RIGIFY_CACHE_KEY] = key
+        cached_script.name = f"rig_ui-cache-{key[:8]}.py"
+        cached_script.use_module = False  # 副本不在打开文件时注册
+        cached_script.use_fake_user = True
+
+    prune_cached_rigs()
+    return master
+
+
+def link_widgets(context, metarig, rig, widgets):
+    """将控件副本链接到元骨骼的控件集合，没有时新建（与Rigify生成时相同，集合隐藏）"""
+    collection = metarig.data.rigify_widgets_collection
+    if collection is None:
+        collection = bpy.data.collections.new("WGTS_" + rig.name)
+        parent = metarig.users_collection[0] if metarig.users_collection else context.scene.collection
+        parent.children.link(collection)
+        collection.hide_viewport = True
+        collection.hide_render = True
+    for widget in widgets:
+        for prop in (RIGIFY_CACHE_KEY, RIGIFY_CACHE_TIME_KEY, WIDGET_SUFFIX_KEY):
+            if prop in widget:
+                del widget[prop]
+        widget.use_fake_user = False
+        collection.objects.link(widget)
+    metarig.data.rigify_widgets_collection = collection
+
+
+def reuse_cached_rig(context, metarig, master):
+    """复制原始骨架，与Rigify生成后的状态相同：链接到元骨骼所在的集合并设为活动物体"""
+    master[RIGIFY_CACHE_TIME_KEY] = time.time()
+    rig = copy_rig(master)
+    for prop in (RIGIFY_CACHE_KEY, RIGIFY_CACHE_TIME_KEY):
+        del rig[prop]
+    rig.use_fake_user = False
+    rig.name = "RIG-" + metarig.name
+    collections = metarig.users_collection or [context.scene.collection]
+    for collection in collections:
+        collection.objects.link(rig)
+    rig.matrix_world = metarig.matrix_world
+
+    # 每个模型使用自己的控件
+    widgets = copy_widgets(rig)
+    for widget, new_widget in widgets.items():
+        new_widget.name = f"WGT-{rig.name}{widget.get(WIDGET_SUFFIX_KEY, '_' + widget.name)}"
+    link_widgets(context, metarig, rig, widgets.values())
+
+    if context.object and context.object.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    context.view_layer.objects.active = rig
+    rig.select_set(True)
+    metarig.data.rigify_target_rig = rig
+    relink_rig_ui(metarig, rig, master[RIGIFY_CACHE_KEY])
+    return rig
+
+
+def relink_rig_ui(metarig, rig, key):
+    """为复用的骨架关联Rigify界面脚本
+
+    复用的骨架与原始骨架的 rig_id 相同，仍存在的界面脚本可以直接使用；已被删除时由缓存的副本重建并运行
+
+    Returns:
+        界面脚本，没有缓存副本时返回None
+    """
+    marker = f'rig_id = "{rig.data.get("rig_id")}"'
+    script = None
+    for text in bpy.data.texts:
+        if RIGIFY_CACHE_KEY not in text and marker in text.as_string():
+            script = text
+            break
+
+    if script is None:
+        cached_script = find_cached_rig_ui(key)
+        if cached_script is None:
+            print(f"Rigify生成缓存 {key[:8]} 没有界面脚本")
+            return None
+        script = cached_script.copy()
+        del script[RIGIFY_CACHE_KEY]
+        script.name = "rig_ui.py"
+        script.use_fake_user = False
+        script.use_module = True
+        # 与Rigify生成时相同，立即运行脚本注册界面
+        exec(script.as_string(), {})
+
+    metarig.data.rigify_rig_ui = script
+    for holder in (rig, rig.data):
+        if 'rig_ui' in holder:
+            holder['rig_ui'] = script
+    return script
+
+
+def generate_rigify_rig(context, metarig):
+    """生成控制器骨架，静止姿态与参数未改变时复用之前生成的结果
+
+    Args:
+        context: 上下文
+        metarig: 对齐后的元骨骼（活动物体）
+
+    Returns:
+        生成的控制器骨架
+    """
+    start_time = time.time()
+    key = metarig_signature(metarig)
+    master = find_cached_rig(key)
+    if master is not None:
+        rig = reuse_cached_rig(context, metarig, master)
+        print(f"复用Rigify生成结果 {key[:8]}: {time.time() - start_time:.3f}s")
+        return rig
+
+    bpy.ops.pose.rigify_generate()
+    rig = context.view_layer.objects.active
+    store_generated_rig(metarig, rig, key)
+    print(f"Rigify生成 {key[:8]}: {time.time() - start_time:.3f}s")
+    return rig
@@ -0,0 +1,225 @@
+"""模板库
+
+缓存插件自带 .blend 文件中的模板（元骨骼、VMD源骨架、表情骨架等）。
+每个模板在一次会话中只从磁盘读取一次，保存为不链接到任何场景的原始副本，
+之后通过 obj.copy() 与 data.copy() 复制，不再重复调用 bpy.ops.wm.append。
+.blend 文件的修改时间改变、原始副本被删除（清理孤立数据、打开其他文件）时重新读取。
+"""
+import os
+import re
+import time
+
+import bpy
+
+# 原始副本上记录的模板键与原始名称
+TEMPLATE_KEY = "mmr_template"
+TEMPLATE_NAME_KEY = "mmr_template_name"
+
+# 原始副本的名称后缀，避免与复制出的物体重名
+MASTER_SUFFIX = ".mmr_template"
+
+# 模板缓存 {模板键: {'mtime', 'master', 'load_time', 'loads', 'copies', 'copy_time'}}
+_templates = {}
+
+
+def template_path(filename):
+    """插件自带的 .blend 文件路径"""
+    return os.path.join(os.path.dirname(__file__), filename)
+
+
+def template_key(blend_path, id_type, name):
+    return f"{os.path.normpath(blend_path)}|{id_type}|{name}"
+
+
+def original_name(name, library_names):
+    """读取时与现有数据重名会被加上 .001 后缀，还原为库中的名称"""
+    match = re.match(r'^(.*)\.\d{3}$', name)
+    if match and name not in library_names and match.group(1) in library_names:
+        return match.group(1)
+    return name
+
+
+def master_ids(master, id_type):
+    """原始副本及其包含的所有数据块"""
+    if id_type == 'collections':
+        return [master] + list(master.children_recursive) + list(master.all_objects)
+    return [master]
+
+
+def find_master(id_type, master_name, key):
+    master = getattr(bpy.data, id_type).get(master_name)
+    if master is not None and master.get(TEMPLATE_KEY) == key:
+        return master
+    return None
+
+
+def remove_master(master, id_type):
+    """删除过期的原始副本及其物体数据"""
+    ids = set(master_ids(master, id_type))
+    for id_data in list(ids):
+        if isinstance(id_data, bpy.types.Object) and id_data.data is not None and id_data.data.users == 1:
+            ids.add(id_data.data)
+    bpy.data.batch_remove(ids)
+
+
+def get_template_master(blend_path, id_type, name):
+    """获取模板的原始副本，未缓存或 .blend 文件改变时从磁盘读取
+
+    Args:
+        blend_path: .blend 文件路径
+        id_type: 'objects' 或 'collections'
+        name: 模板名称
+
+    Returns:
+        原始副本，文件中没有该模板时返回None
+    """
+    key = template_key(blend_path, id_type, name)
+    mtime = os.path.getmtime(blend_path)
+    entry = _templates.get(key)
+    if entry is not None:
+        master = find_master(id_type, entry['master'], key)
+        if master is not None and entry['mtime'] == mtime:
+            return master
+        if master is not None:
+            print(f"模板文件已修改, 重新读取: {name}")
+            remove_master(master, id_type)
+
+    start_time = time.time()
+    with bpy.data.libraries.load(blend_path, link=False) as (data_from, data_to):
+        if name not in getattr(data_from, id_type):
+            print(f"模板 {name} 不存在于 {blend_path}")
+            return None
+        setattr(data_to, id_type, [name])
+        library_names = set(data_from.objects) | set(data_from.collections)
+    master = getattr(data_to, id_type)[0]
+
+    # 标记并重命名所有数据块，复制时还原名称
+    for id_data in master_ids(master, id_type):
+        id_data[TEMPLATE_NAME_KEY] = original_name(id_data.name, library_names)
+        id_data[TEMPLATE_KEY] = key
+        id_data.name = id_data[TEMPLATE_NAME_KEY] + MASTER_SUFFIX
+
+    if entry is None:
+        entry = _templates[key] = {'loads': 0, 'copies': 0, 'load_time': 0.0, 'copy_time': 0.0}
+    entry['mtime'] = mtime
+    entry['master'] = master.name
+    entry['loads'] += 1
+    entry['load_time'] += time.time() - start_time
+    print(f"读取模板 {name}: {time.time() - start_time:.3f}s")
+    return master
+
+
+def copy_template_id(id_data):
+    """复制原始副本中的一个数据块并还原名称"""
+    if isinstance(id_data, bpy.types.Object):
+        new_id = id_data.copy()
+        if id_data.data is not None:
+            new_id.data = id_data.data.copy()
+    else:
+        new_id = bpy.data.collections.new(id_data[TEMPLATE_NAME_KEY])
+    new_id.name = id_data[TEMPLATE_NAME_KEY]
+    for prop in (TEMPLATE_KEY, TEMPLATE_NAME_KEY):
+        if prop in new_id:
+            del new_id[prop]
+    return new_id
+
+
+def remap_object_references(obj, mapping):
+    """将父级、约束与修改器中引用的原始副本替换为复制出的物体"""
+    if obj.parent in mapping:
+        obj.parent = mapping[obj.parent]
+    constraints = list(obj.constraints)
+    if obj.pose:
+        for pose_bone in obj.pose.bones:
+            constraints.extend(pose_bone.constraints)
+    for constraint in constraints:
+        target = getattr(constraint, 'target', None)
+        if target in mapping:
+            constraint.target = mapping[target]
+    for modifier in obj.modifiers:
+        target = getattr(modifier, 'object', None)
+        if target in mapping:
+            modifier.object = mapping[target]
+
+
+def select_only(context, objects):
+    """与追加操作相同：取消选择其他物体并选中新物体"""
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+
+
+def record_copy(blend_path, id_type, name, start_time):
+    entry = _templates[template_key(blend_path, id_type, name)]
+    cost = time.time() - start_time
+    entry['copies'] += 1
+    entry['copy_time'] += cost
+    print(f"复制模板 {name}: {cost:.3f}s")
+
+
+def append_template_object(context, filename, name):
+    """追加模板物体，链接到活动集合并选中（相当于 bpy.ops.wm.append）
+
+    Args:
+        context: 上下文
+        filename: 插件目录下的 .blend 文件名
+        name: 物体名称
+
+    Returns:
+        新物体，模板不存在时返回None
+    """
+    blend_path = template_path(filename)
+    master = get_template_master(blend_path, 'objects', name)
+    if master is None:
+        return None
+    start_time = time.time()
+    obj = copy_template_id(master)
+    context.view_layer.active_layer_collection.collection.objects.link(obj)
+    select_only(context, [obj])
+    record_copy(blend_path, 'objects', name, start_time)
+    return obj
+
+
+def append_template_collection(context, filename, name):
+    """追加模板集合（包括其中的物体与子集合），链接到活动集合
+
+    Returns:
+        新集合，模板不存在时返回None
+    """
+    blend_path = template_path(filename)
+    master = get_template_master(blend_path, 'collections', name)
+    if master is None:
+        return None
+    start_time = time.time()
+
+    mapping = {}
+    for id_data in master_ids(master, 'collections'):
+        mapping[id_data] = copy_template_id(id_data)
+
+    # 按原始副本的结构链接
+    for master_coll in [master] + list(master.children_recursive):
+        new_coll = mapping[master_coll]
+        for child in master_coll.children:
+            new_coll.children.link(mapping[child])
+        for obj in master_coll.objects:
+            new_coll.objects.link(mapping[obj])
+    objects = [mapping[obj] for obj in master.all_objects]
+    for obj in objects:
+        remap_object_references(obj, mapping)
+
+    collection = mapping[master]
+    context.view_layer.active_layer_collection.collection.children.link(collection)
+    select_only(context, objects)
+    record_copy(blend_path, 'collections', name, start_time)
+    return collection
+
+
+def get_template_timings():
+    """模板的读取与复制耗时
+
+    Returns:
+        [(模板键, 读取次数, 读取耗时, 复制次数, 复制耗时)]
+    """
+    return [(key, entry['loads'], entry['load_time'], entry['copies'], entry['copy_time'])
+            for key, entry in _templates.items()]
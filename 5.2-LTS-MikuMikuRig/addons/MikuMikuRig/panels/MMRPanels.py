@@ -4,8 +4,8 @@ from numpy.f2py.capi_maps import depargs
 from addons.MikuMikuRig.operators.MMRpresets import mmrmakepresetsOperator, mmrdesignatedOperator, MMR_OT_ImportPresets, \
     MMR_OT_Designated
 from addons.MikuMikuRig.operators.Physics import Add_Damping_Tracking, Remove_Damping_Tracking, Assign_Rigidbody, \
-    Show_Rigidbody, Select_Collision_Group, Update_World, Select_By_Type, \
-    mmdrigidbody_to_mmrrigidbody, Remove_physics, Show_Joint, Select_Collision_Group_For_Joint, Select_By_Type_For_Joint
+    Show_Rigidbody, Select_Collision_Group, Update_World, Benchmark_Physics, Select_By_Type, \
+    mmdrigidbody_to_mmrrigidbody, Remove_physics, Update_physics, Show_Joint, Select_Collision_Group_For_Joint, Select_By_Type_For_Joint
 from addons.MikuMikuRig.operators.RIG import mmrexportvmdactionsOperator, MahyPdtOperator, \
     MMR_OT_Batch_Adjust_Shape_Key, MMR_OT_Insert_Keyframe, MMR_OT_Unselect_All_Key, \
     MMR_OT_Select_All_Key, MMR_OT_Select_Keyframe_Key, MMR_OT_Weight_Bone_Parent_Add, MMR_OT_Weight_Bone_Parent_Del, \
@@ -15,7 +15,10 @@ from addons.MikuMikuRig.operators.RIG import mmrexportvmdactionsOperator, MahyPd
 from addons.MikuMikuRig.operators.RIG import mmrrigOperator
 from addons.MikuMikuRig.operators.RIG import polartargetOperator
 from addons.MikuMikuRig.operators.mmd_rig_physics import MMD_RIG_PHYSICS_BUILD
-from addons.MikuMikuRig.operators.redirect import MMR_redirect, MMR_Import_VMD
+from addons.MikuMikuRig.operators.physics_cache import MMR_Bake_Physics_Cache, MMR_Free_Physics_Cache
+from addons.MikuMikuRig.operators.redirect import MMR_redirect, MMR_Import_VMD, MMR_Batch_Retarget
+from addons.MikuMikuRig.operators.parallel_retarget import MMR_Parallel_Retarget
+from addons.MikuMikuRig.operators.batch_rig import MMR_Batch_Rig
 from addons.MikuMikuRig.operators.reload import MMR_OT_OpenPresetFolder
 from common.i18n.i18n import i18n
 from ....common.types.framework import reg_order
@@ -270,6 +273,7 @@ class MMD_Rig_Opt(bpy.types.Panel):
                 # 增加按钮大小并添加图标
                 layout.scale_y = 1.2  # 这将使按钮的垂直尺寸加倍
                 layout.operator(mmrrigOperator.bl_idname, text="Build a controller",icon="OUTLINER_DATA_ARMATURE")
+                layout.operator(MMR_Batch_Rig.bl_idname, icon="FILE_FOLDER")
 
                 layout.operator(MahyPdtOperator.bl_idname, icon="MODIFIER")
 
@@ -390,6 +394,7 @@ class MMD_Rig_Opt(bpy.types.Panel):
                 row.operator(mmrmakepresetsOperator.bl_idname, text="Exit the designation")
         else:
             layout.label(text=i18n("Please choose a skeleton"), icon='ERROR')
+            layout.operator(MMR_Batch_Rig.bl_idname, icon="FILE_FOLDER")
 
 # 设置约束
 class Set_constraints(bpy.types.Panel):
@@ -437,6 +442,8 @@ class MMD_Rig_Opt_Polar(bpy.types.Panel):
         layout.prop(mmr, "frame_step", text=i18n('Bake Frame Step'))
         layout.operator(MMR_redirect.bl_idname, icon='OUTLINER_DATA_ARMATURE')
         layout.operator(MMR_Import_VMD.bl_idname, icon='OUTLINER_OB_ARMATURE')
+        layout.operator(MMR_Batch_Retarget.bl_idname, icon='FILE_FOLDER')
+        layout.operator(MMR_Parallel_Retarget.bl_idname, icon='SORTTIME')
         layout.operator(mmrexportvmdactionsOperator.bl_idname, text="Export VMD actions", icon='ANIM')
         layout.operator(MMR_OT_OpenPresetFolder.bl_idname, icon='FILE_FOLDER')
         layout.prop(mmr, "boolean", text=i18n("Extras"), toggle=True,icon="PREFERENCES")
@@ -444,6 +451,8 @@ class MMD_Rig_Opt_Polar(bpy.types.Panel):
             layout.prop(mmr, "Manually_adjust_FBX_movements", text=i18n("Manually adjust FBX movements"))
             layout.prop(mmr, "Manually_adjust_VMD_movements", text=i18n("Manually adjust VMD movements"))
             layout.prop(mmr, "IK_import_bool", text=i18n("Enable VMD IK import（Mandatory）"))
+            layout.prop(mmr, "direct_bake", text=i18n("Direct bake"))
+            layout.prop(mmr, "fbx_animation_only", text=i18n("FBX animation only"))
 
     @classmethod
     def poll(cls, context: bpy.types.Context):
@@ -562,12 +571,20 @@ class Physics_Panel(bpy.types.Panel):
             row.label(text="Rigid Body Physics:", icon="PHYSICS")
             row.operator(Update_World.bl_idname, text="Update World", icon="ERROR")
 
+            row = layout.row(align=True)
+            row.prop(context.scene.mmr, "non_collision_mode", expand=True)
+            row.operator(Benchmark_Physics.bl_idname, text="", icon="TIME")
+
             row = layout.row(align=True)
             if point_cache.is_baked is True:
                 row.operator("mmd_tools.ptcache_rigid_body_delete_bake", text="Delete Bake")
             else:
                 row.operator("mmd_tools.ptcache_rigid_body_bake", text="Bake")
 
+            row = layout.row(align=True)
+            row.operator(MMR_Bake_Physics_Cache.bl_idname, icon="FILE_CACHE")
+            row.operator(MMR_Free_Physics_Cache.bl_idname, text="", icon="TRASH")
+
         layout.use_property_split = False
 
         row = layout.row()
@@ -594,6 +611,7 @@ class Physics_Panel(bpy.types.Panel):
                 row.operator(MMD_RIG_PHYSICS_BUILD.bl_idname, text="Physics", icon="PHYSICS", depress=False)
             else:
                 row.operator(MMD_RIG_PHYSICS_BUILD.bl_idname, text="Physics", icon="PHYSICS", depress=True)
+                row.operator(MMD_RIG_PHYSICS_BUILD.bl_idname, text="", icon="FILE_REFRESH").incremental = True
 
         row.operator(Show_Rigidbody.bl_idname, text="Show Rigidbody", icon="RIGID_BODY")
         row.operator(Show_Joint.bl_idname, text="Show Joint", icon="RIGID_BODY_CONSTRAINT")
@@ -658,6 +676,8 @@ class Physics_Panel(bpy.types.Panel):
             row.operator(Assign_Rigidbody.bl_idname)
             # 解除物理
             row.operator(Remove_physics.bl_idname)
+            # 增量更新物理
+            row.operator(Update_physics.bl_idname, text="", icon="FILE_REFRESH")
             # MMD刚体转换MMR刚体
             layout.operator(mmdrigidbody_to_mmrrigidbody.bl_idname)
 
@@ -7,9 +7,21 @@ from addons.MikuMikuRig.config import __addon_name__
 # 哇哦~文件缓存系统得了mvp！
 file_cache = {
     ".json": {"mtime": 0, "files": [], "files_ic": []},
-    ".py": {"mtime": 0, "files": [], "files_ic": []}
+    ".py": {"mtime": 0, "files": [], "files_ic": []},
+    (".mmrmap", ".py"): {"mtime": 0, "files": [], "files_ic": []}
 }
 
+# msgbus 不会通知脚本中的修改，属性更新时同样交给形态键同步处理
+def update_key_obj(self, context):
+    from addons.MikuMikuRig.key_sync import schedule_sync, TASK_KEY_OBJ
+    schedule_sync(TASK_KEY_OBJ)
+
+
+def update_batch_adjust(self, context):
+    from addons.MikuMikuRig.key_sync import schedule_sync, TASK_BATCH_ADJUST
+    schedule_sync(TASK_BATCH_ADJUST)
+
+
 # 获取预设目录
 def get_presets_directory():
     new_path = os.path.dirname(os.path.dirname(__file__))
@@ -39,6 +51,9 @@ def get_file_list(extension):
             if os.path.isfile(file_path) and f.endswith(extension):
                 # 提取基础文件名和生成描述
                 base_name = os.path.splitext(f)[0]
+                # 同名的映射表与脚本预设只列出一次
+                if base_name in valid_files:
+                    continue
                 valid_files.append(base_name)
                 valid_files_ic.append(f"选择文件：{base_name}")
 
@@ -93,11 +108,11 @@ class MMR_property(bpy.types.PropertyGroup):
         items=make_presets_enum('.json'),
     )
 
-    # 重定向预设（.py）
+    # 重定向预设（.mmrmap映射表，兼容.py脚本）
     py_presets: EnumProperty(
         name="Retarget Presets",
         description="选择骨骼重定向预设配置",
-        items=make_presets_enum('.py'),
+        items=make_presets_enum(('.mmrmap', '.py')),
     )
     # 禁用手掌修正
     Disable_hand_fix: BoolProperty(
@@ -228,6 +243,7 @@ class MMR_property(bpy.types.PropertyGroup):
     key_obj: PointerProperty(
         type=bpy.types.Object,
         name="Key object",
+        update=update_key_obj,
     )
     # key idx
     key_idx: IntProperty(
@@ -384,7 +400,8 @@ class MMR_property(bpy.types.PropertyGroup):
         default=0.0,
         min=0.0,
         max=1.0,
-        description="批量调整形态"
+        description="批量调整形态",
+        update=update_batch_adjust,
     )
     # 是否注册处理器
     register_handler: BoolProperty(
@@ -422,6 +439,16 @@ class MMR_property(bpy.types.PropertyGroup):
         default=2,
         description="帧步长"
     )
+    # 直接烘焙映射动画（不经过约束求值）
+    direct_bake: BoolProperty(
+        default=True,
+        description="根据骨骼映射表直接计算并写入关键帧，无法直接计算时自动回退到可视化烘焙"
+    )
+    # FBX只导入骨架与动画
+    fbx_animation_only: BoolProperty(
+        default=True,
+        description="导入FBX动作时只保留骨架与动画，清理网格、材质与贴图"
+    )
     # mmd_tool额外选项
     mmd_tool_extras: BoolProperty(
         default=False,
@@ -507,6 +534,17 @@ class MMR_Scene_Property(bpy.types.PropertyGroup):
     mmd_rigid_panel_bool: bpy.props.BoolProperty(
         default=False,
     )
+    # 非碰撞的表示方式
+    non_collision_mode: bpy.props.EnumProperty(
+        name="Non-Collision Mode",
+        items=[
+            ("CONSTRAINT", "Constraint", "每对不碰撞的刚体创建一个约束空物体"),
+            ("COLLECTION", "Collision Collections",
+             "用刚体碰撞集合表示碰撞组，只为剩余冲突的刚体对创建约束空物体。"
+             "刚体不再与地面、道具等其他刚体碰撞，互相遮罩的刚体无论距离远近都不碰撞"),
+        ],
+        default="CONSTRAINT",
+    )
 
 class MMR_key_property(bpy.types.PropertyGroup):
     name: bpy.props.StringProperty(
@@ -1,4 +1,19 @@
+import re
+from contextlib import contextmanager
+from math import pi
+
 import bpy
+from bpy.app.handlers import persistent
+from mathutils import Euler
+
+# 映射表名称索引缓存 {映射状态指针: 索引数据}
+_mapping_index = {}
+
+# 骨骼映射生成的约束名称
+BAC_CONSTRAINTS = ['BAC_ROT_COPY', 'BAC_ROT_ROLL', 'BAC_LOC_COPY', 'BAC_IK']
+
+# 映射项属性回调的屏蔽计数，大于0时回调不再生成约束
+_suppress_updates = 0
 
 def get_state():
     if bpy.context.scene.mmr_kumopult_bac_owner is None:
@@ -10,4 +25,135 @@ def set_enable(con: bpy.types.Constraint, state):
     if bpy.app.version >= (3, 0, 0):
         con.enabled = state
     else:
-        con.mute = not state
\ No newline at end of file
+        con.mute = not state
+
+
+def calc_rotation_offset(target_matrix, owner_matrix, ortho=True):
+    # 目标骨骼到自身骨骼的旋转偏移（世界空间矩阵），无偏移时返回None
+    euler_offset = (target_matrix.inverted() @ owner_matrix).to_euler()
+    if ortho:
+        step = pi * 0.5
+        euler_offset[0] = round(euler_offset[0] / step) * step
+        euler_offset[1] = round(euler_offset[1] / step) * step
+        euler_offset[2] = round(euler_offset[2] / step) * step
+    if euler_offset == Euler((0, 0, 0)):
+        return None
+    return euler_offset
+
+
+@contextmanager
+def suppress_mapping_updates():
+    # 批量填写映射表时屏蔽属性回调
+    global _suppress_updates
+    _suppress_updates += 1
+    try:
+        yield
+    finally:
+        _suppress_updates -= 1
+
+
+def mapping_updates_suppressed():
+    return _suppress_updates > 0
+
+
+def mapping_item_index(mapping):
+    # 根据数据路径获取映射项在列表中的索引
+    match = re.search(r'\[(\d+)\]$', mapping.path_from_id())
+    return int(match.group(1)) if match else -1
+
+
+def prune_mapping_index():
+    # 删除已释放骨架的索引
+    alive = {arm.session_uid for arm in bpy.data.armatures}
+    for pointer, index in list(_mapping_index.items()):
+        if index['uid'] not in alive:
+            del _mapping_index[pointer]
+
+
+def build_mapping_index(state):
+    # 重建 骨骼名称→索引 的映射，同名时取第一项
+    prune_mapping_index()
+    index = {'dirty': False, 'uid': state.id_data.session_uid, 'names': {'owner': [], 'target': []}}
+    for key, names in index['names'].items():
+        names.extend(getattr(m, key) for m in state.mappings)
+        lookup = {}
+        for i, name in enumerate(names):
+            if name and name not in lookup:
+                lookup[name] = i
+        index[key] = lookup
+    _mapping_index[state.as_pointer()] = index
+    return index
+
+
+def get_mapping_index(state):
+    # 指针被其他骨架复用时 session_uid 不同，重建索引；其余情况信任增量维护的索引
+    index = _mapping_index.get(state.as_pointer())
+    if index is None or index['dirty'] or index['uid'] != state.id_data.session_uid \
+            or len(index['names']['owner']) != len(state.mappings):
+        return build_mapping_index(state)
+    return index
+
+
+@persistent
+def clear_mapping_index(*args):
+    # 撤销、重做与加载文件后映射列表可能整体改变，清空所有索引
+    _mapping_index.clear()
+
+
+def invalidate_mapping_index(state):
+    index = _mapping_index.get(state.as_pointer())
+    if index:
+        index['dirty'] = True
+
+
+def update_mapping_index(mapping, key):
+    # 映射项的骨骼名称改变时增量更新索引，无法增量更新时标记为失效
+    state = mapping.id_data.mmr_kumopult_bac
+    index = _mapping_index.get(state.as_pointer())
+    if index is None or index['dirty']:
+        return
+    names = index['names'][key]
+    i = mapping_item_index(mapping)
+    count = len(state.mappings)
+    if count == len(names) + 1 and i == count - 1:
+        # 新追加的映射项
+        for n in index['names'].values():
+            n.append('')
+    elif count != len(names) or i < 0:
+        index['dirty'] = True
+        return
+
+    old = names[i]
+    new = getattr(mapping, key)
+    names[i] = new
+    lookup = index[key]
+    if old and lookup.get(old) == i:
+        # 指向同名的下一项
+        try:
+            lookup[old] = names.index(old, i + 1)
+        except ValueError:
+            del lookup[old]
+    if new and (new not in lookup or lookup[new] > i):
+        lookup[new] = i
+
+
+def move_mapping_index(state, from_index, to_index):
+    # 映射项移动后增量更新索引
+    index = _mapping_index.get(state.as_pointer())
+    if index is None or index['dirty']:
+        return
+    if len(index['names']['owner']) != len(state.mappings):
+        index['dirty'] = True
+        return
+    lo, hi = min(from_index, to_index), max(from_index, to_index)
+    for key, names in index['names'].items():
+        names.insert(to_index, names.pop(from_index))
+        lookup = index[key]
+        # 只有移动范围内的项顺序改变；首次出现在范围之前的名称不受影响
+        seen = set()
+        for i in range(lo, hi + 1):
+            name = names[i]
+            if name and name not in seen:
+                seen.add(name)
+                if lookup.get(name, lo) >= lo:
+                    lookup[name] = i
@@ -1,17 +1,21 @@
 import ast
 import atexit
+import hashlib
+import json
 import os
 import re
 import shutil
+import socket
 import subprocess
 import sys
 import threading
 import time
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 
 from common.class_loader.module_installer import install_if_missing, install_fake_bpy
-from common.io.FileManagerClient import search_files, read_utf8, write_utf8, is_subdirectory, get_md5_folder, \
+from common.io.FileManagerClient import search_files, read_utf8, write_utf8, is_subdirectory, get_md5, \
     read_utf8_in_lines, write_utf8_in_lines
 from main import PROJECT_ROOT, BLENDER_ADDON_PATH, BLENDER_EXE_PATH, DEFAULT_RELEASE_DIR, TEST_RELEASE_DIR, IS_EXTENSION
 
@@ -36,6 +40,10 @@ _WHEELS_PATH = "wheels"
 _ADDON_TEMPLATE = "sample_addon"
 _ADDONS_FOLDER = "addons"
 _ADDON_ROOT = os.path.join(PROJECT_ROOT, _ADDONS_FOLDER)
+# 增量构建缓存 保存在发布目录中 记录源文件哈希、解析过的导入以及发布目录中每个文件的状态
+# Incremental build cache, stored in the release dir next to the release folder
+_BUILD_CACHE_FILE = ".{addon_name}_build_cache.json"
+_BUILD_CACHE_VERSION = 1
 
 # Install fake bpy module only when user have configured the blender executable path
 # 仅在用户配置了Blender可执行文件路径时安装fake bpy模块 避免在非Blender环境下安装fake bpy模块(如CICD流程中)
@@ -74,50 +82,239 @@ def get_init_file_path(addon_name):
 
 # The following code will be injected into the blender python environment to enable hot reload
 # https://devtalk.blender.org/t/plugin-hot-reload-by-cleaning-sys-modules/20040
+# 监视线程在更新插件后通过本地UDP端口发送改变的文件列表，Blender只重新加载改变的模块及依赖它们的模块，
+# 并只重新注册这些模块中的类。无法按模块更新时（根模块、注册函数或属性组改变，增加或删除模块）回退到禁用-清理-启用的完整重载。
+# The watcher sends the changed files to a local UDP port after updating the addon. Blender reloads only the changed
+# modules and their dependents and re-registers only their classes, falling back to a full reload when needed.
 start_up_command = """
 import bpy
 from bpy.app.handlers import persistent
+import importlib
+import inspect
+import json
 import os
+import queue
+import socket
 import sys
+import threading
+
+ADDON_NAME = "{addon_name}"
 existing_addon_md5 = ""
+update_queue = queue.Queue()
+listening = False
+fallback_elapsed = 0.0
 try:
-    bpy.ops.preferences.addon_enable(module="{addon_name}")
+    bpy.ops.preferences.addon_enable(module=ADDON_NAME)
 except Exception as e:
     print("Addon enable failed:", e)
 
+def read_addon_md5():
+    if not os.path.exists("{addon_signature}"):
+        return ""
+    with open("{addon_signature}", "r") as f:
+        return f.read()
+
+def listen_update_signal():
+    global listening
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", {signal_port}))
+    except OSError as e:
+        print("Update signal unavailable, fall back to polling:", e)
+        return
+    listening = True
+    while True:
+        data, _ = sock.recvfrom(65536)
+        try:
+            update_queue.put(json.loads(data.decode("utf-8")))
+        except ValueError:
+            pass
+
+def full_reload():
+    bpy.ops.preferences.addon_disable(module=ADDON_NAME)
+    all_modules = sys.modules
+    all_modules = dict(sorted(all_modules.items(),key= lambda x:x[0])) #sort them
+    for k,v in all_modules.items():
+        if k.startswith(ADDON_NAME):
+            del sys.modules[k]
+    bpy.ops.preferences.addon_enable(module=ADDON_NAME)
+
+def module_name_of(rel_path):
+    parts = rel_path[:-3].replace(os.sep, "/").split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join([ADDON_NAME] + parts)
+
+def module_dependencies(module, addon_modules):
+    # 模块中引用的其他插件模块（import的模块，或from ... import得到的函数与类所在的模块）
+    deps = set()
+    for value in list(vars(module).values()):
+        try:
+            name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+        except Exception:
+            continue
+        if not isinstance(name, str) or name not in addon_modules or name == module.__name__:
+            continue
+        if inspect.ismodule(value) and name.startswith(module.__name__ + "."):
+            continue  # 导入子模块时自动设置的属性
+        deps.add(name)
+    return deps
+
+def needs_full_reload(module):
+    if module.__name__ == ADDON_NAME or hasattr(module, "register") or hasattr(module, "unregister"):
+        return True
+    for value in vars(module).values():
+        if inspect.isclass(value) and value.__module__ == module.__name__ \\
+                and issubclass(value, (bpy.types.PropertyGroup, bpy.types.AddonPreferences)):
+            return True
+    return False
+
+def reload_changed_modules(changed_files):
+    addon_root = os.path.dirname(sys.modules[ADDON_NAME].__file__)
+    addon_modules = dict()
+    for name, module in list(sys.modules.items()):
+        if module is not None and (name == ADDON_NAME or name.startswith(ADDON_NAME + ".")):
+            addon_modules[name] = module
+    changed = set()
+    for rel_path in changed_files:
+        if not rel_path.endswith(".py"):
+            continue
+        name = module_name_of(rel_path)
+        if name not in addon_modules or not os.path.exists(os.path.join(addon_root, rel_path)):
+            print("Module added or removed:", name)
+            return False
+        changed.add(name)
+    if not changed:
+        print("No module changed, only assets updated")
+        return True
+
+    deps = dict()
+    for name, module in addon_modules.items():
+        deps[name] = module_dependencies(module, addon_modules)
+    # 改变的模块以及所有（间接）依赖它们的模块
+    affected = set(changed)
+    grown = True
+    while grown:
+        grown = False
+        for name, module_deps in deps.items():
+            if name not in affected and module_deps & affected:
+                affected.add(name)
+                grown = True
+    for name in affected:
+        if needs_full_reload(addon_modules[name]):
+            print("Module needs a full reload:", name)
+            return False
+
+    # 按依赖顺序排列 被依赖的模块先重新加载
+    order = []
+    remaining = set(affected)
+    while remaining:
+        ready = sorted(name for name in remaining if not (deps[name] & remaining))
+        if not ready:
+            ready = sorted(remaining)  # 循环导入
+        order.extend(ready)
+        remaining -= set(ready)
+
+    auto_load = addon_modules.get(ADDON_NAME + ".common.class_loader.auto_load")
+    if auto_load is None or auto_load.ordered_classes is None:
+        return False
+    old_classes = [cls for cls in auto_load.ordered_classes if cls.__module__ in affected]
+    old_framework_classes = [cls for cls in auto_load.frame_work_classes if cls.__module__ in affected]
+    for cls in reversed(old_classes):
+        if getattr(cls, "is_registered", False):
+            bpy.utils.unregister_class(cls)
+    for cls in old_framework_classes:
+        auto_load.unregister_framework_class(cls)
+
+    for name in order:
+        importlib.reload(addon_modules[name])
+
+    reloaded = [addon_modules[name] for name in order]
+    new_classes = [cls for cls in auto_load.get_ordered_classes_to_register(reloaded) if cls.__module__ in affected]
+    new_framework_classes = [cls for cls in auto_load.get_framework_classes(reloaded) if cls.__module__ in affected]
+    for cls in new_classes:
+        bpy.utils.register_class(cls)
+    for cls in new_framework_classes:
+        auto_load.register_framework_class(cls)
+    # 注销插件时使用新的类
+    auto_load.ordered_classes = [cls for cls in auto_load.ordered_classes if cls not in old_classes] + new_classes
+    auto_load.frame_work_classes = [cls for cls in auto_load.frame_work_classes
+                                    if cls not in old_framework_classes] + new_framework_classes
+    print("Reloaded modules:", ", ".join(order), "| re-registered classes:", len(new_classes))
+    return True
+
+def update_addon(changed_files):
+    print("Addon file changed, start to update the addon")
+    try:
+        if changed_files is None or not reload_changed_modules(changed_files):
+            full_reload()
+    except Exception as e:
+        print("Module reload failed, fall back to a full reload:", e)
+        try:
+            full_reload()
+        except Exception as e:
+            print("Addon update failed:", e)
+    print("Addon updated")
+
 def watch_update_tick():
-    global existing_addon_md5
-    if os.path.exists("{addon_signature}"):
-        with open("{addon_signature}", "r") as f:
-            addon_md5 = f.read()
+    global existing_addon_md5, fallback_elapsed
+    changed_files = set()
+    has_update = False
+    while not update_queue.empty():
+        message = update_queue.get()
+        has_update = True
+        if changed_files is not None and message.get("files") is not None:
+            changed_files.update(message["files"])
+        else:
+            changed_files = None
+    if has_update:
+        existing_addon_md5 = read_addon_md5()
+        update_addon(changed_files)
+        return 0.1
+    if listening:
+        return 0.1
+
+    # 无法接收更新信号时 每秒检查一次签名文件
+    fallback_elapsed += 0.1
+    if fallback_elapsed < 1.0:
+        return 0.1
+    fallback_elapsed = 0.0
+    addon_md5 = read_addon_md5()
+    if addon_md5:
         if existing_addon_md5 == "":
             existing_addon_md5 = addon_md5
         elif existing_addon_md5 != addon_md5:
-            print("Addon file changed, start to update the addon")
-            try:
-                bpy.ops.preferences.addon_disable(module="{addon_name}")
-                all_modules = sys.modules
-                all_modules = dict(sorted(all_modules.items(),key= lambda x:x[0])) #sort them
-                for k,v in all_modules.items():
-                    if k.startswith("{addon_name}"):
-                        del sys.modules[k]
-                bpy.ops.preferences.addon_enable(module="{addon_name}")
-            except Exception as e:
-                print("Addon update failed:", e)
             existing_addon_md5 = addon_md5
-            print("Addon updated")
-    return 1.0
+            update_addon(None)
+    return 0.1
 
 @persistent
 def register_watch_update_tick(dummy):
     print("Watching for addon update...")
-    bpy.app.timers.register(watch_update_tick)
+    if not bpy.app.timers.is_registered(watch_update_tick):
+        bpy.app.timers.register(watch_update_tick)
 
+threading.Thread(target=listen_update_signal, daemon=True).start()
 register_watch_update_tick(None)
 bpy.app.handlers.load_post.append(register_watch_update_tick)
 """
 
 
+def find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def send_update_signal(port, changed_files):
+    # 通知Blender插件已更新 并附带改变的文件列表
+    message = json.dumps({"files": changed_files}).encode("utf-8")
+    if len(message) > 60000:
+        message = json.dumps({"files": None}).encode("utf-8")
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.sendto(message, ("127.0.0.1", port))
+
+
 def start_test(init_file, addon_name, enable_watch=True):
     update_addon_for_test(init_file, addon_name)
     test_addon_path = os.path.normpath(os.path.join(BLENDER_ADDON_PATH, addon_name))
@@ -138,7 +335,8 @@ def start_test(init_file, addon_name, enable_watch=True):
 
     # start_watch_for_update(init_file, addon_name)
     stop_event = threading.Event()
-    thread = threading.Thread(target=start_watch_for_update, args=(init_file, addon_name, stop_event))
+    signal_port = find_free_port()
+    thread = threading.Thread(target=start_watch_for_update, args=(init_file, addon_name, stop_event, signal_port))
     thread.start()
 
     def exit_handler():
@@ -151,7 +349,8 @@ def start_test(init_file, addon_name, enable_watch=True):
 
     python_script = start_up_command.format(addon_name=addon_name,
                                             addon_signature=os.path.join(test_addon_path,
-                                                                         _addon_md5__signature).replace("\\", "/"))
+                                                                         _addon_md5__signature).replace("\\", "/"),
+                                            signal_port=signal_port)
 
     try:
         execute_blender_script([BLENDER_EXE_PATH, "--python-use-system-env", "--python-expr", python_script],
@@ -193,7 +392,11 @@ def release_addon(target_init_file, addon_name,
                   need_zip=True,
                   is_extension=IS_EXTENSION,
                   with_timestamp=False,
-                  with_version=False):
+                  with_version=False,
+                  incremental=False):
+    build_start = time.perf_counter()
+    timings = {}
+    stats = Counter()
     # if release dir is under PROJECT_ROOT, it's not allowed
     if is_subdirectory(release_dir, PROJECT_ROOT):
         # 不要将插件发布目录设置在当前项目内
@@ -214,86 +417,63 @@ def release_addon(target_init_file, addon_name,
     if not os.path.isdir(release_dir):
         Path(release_dir).mkdir(parents=True, exist_ok=True)
 
-    # remove the folder if already exists
+    # 增量构建复用上一次的发布目录和构建缓存 只重新处理改变的文件；完整构建总是从空目录开始
+    # Incremental builds reuse the previous release folder and build cache, full builds always start from scratch
+    cache_file = get_build_cache_path(release_dir, addon_name)
+    cache = load_build_cache(cache_file) if incremental else new_build_cache()
     release_folder = os.path.join(release_dir, addon_name)
-    if os.path.exists(release_folder):
+    if os.path.exists(release_folder) and not incremental:
         shutil.rmtree(release_folder)
-    os.mkdir(release_folder)
-
-    bootstrap_init_file = generate_bootstrap_init_file(addon_name, get_addon_info(target_init_file))
-    write_utf8(os.path.join(release_folder, "__init__.py"), bootstrap_init_file)
-
-    # shutil.copyfile(target_init_file, os.path.join(release_folder, "__init__.py"))
-    # 将target_init_file同级的其他非py文件复制到发布目录 如 toml xml等可能跟插件有关的配置文件
-    for file in os.listdir(os.path.dirname(target_init_file)):
-        file_path = os.path.join(os.path.dirname(target_init_file), file)
-        if os.path.isdir(file_path) or file.endswith(".py"):
-            continue
-        shutil.copy(file_path, release_folder)
-
-    # 将插件文件夹复制到发布目录
-    shutil.copytree(os.path.join(_ADDON_ROOT, addon_name), os.path.join(release_folder, _ADDONS_FOLDER, addon_name))
-    shutil.copyfile(os.path.join(_ADDON_ROOT, "__init__.py"),
-                    os.path.join(release_folder, _ADDONS_FOLDER, "__init__.py"))
+    os.makedirs(release_folder, exist_ok=True)
 
-    all_py_files = search_files(os.path.join(_ADDON_ROOT, addon_name), {".py"})
-    # 对插件文件夹中的每一个py文件进行分析，找到每个py文件中依赖的其他py文件
-    visited_py_files = set()
-    for py_file in all_py_files:
-        visited_py_files.add(os.path.abspath(py_file))
-    # 注意不要漏掉__init__.py文件
-    visited_py_files.add(os.path.abspath(os.path.join(_ADDON_ROOT, "__init__.py")))
-
-    dependencies = find_all_dependencies(list(visited_py_files), PROJECT_ROOT)
-    for dependency in dependencies:
-        dependency = os.path.abspath(dependency)
-        if dependency in visited_py_files:
-            continue
-        visited_py_files.add(dependency)
-        target_path = os.path.join(release_folder, os.path.relpath(dependency, PROJECT_ROOT))
-        if not os.path.exists(os.path.dirname(target_path)):
-            os.makedirs(os.path.dirname(target_path))
-        shutil.copy(dependency, os.path.join(release_folder, os.path.relpath(dependency, PROJECT_ROOT)))
+    addon_config_file = os.path.join(_ADDON_ROOT, addon_name, _ADDON_MANIFEST_FILE)
+    addon_config = {}
+    if os.path.exists(addon_config_file) and is_extension:
+        addon_config = read_ext_config(addon_config_file)
 
-    remove_pyc_files(release_folder)
+    phase_start = time.perf_counter()
+    # include wheel files when need to be zipped
+    wheel_files = addon_config.get("wheels", []) if need_zip else []
+    outputs = collect_release_outputs(target_init_file, addon_name, wheel_files, cache, stats)
+    generated = {"__init__.py": generate_bootstrap_init_file(addon_name, get_addon_info(target_init_file))}
+    timings["scan"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
+    # 发布目录中py文件的集合改变时 导入转换的结果可能改变 需要重新处理所有py文件
+    py_paths = sorted(rel_path for rel_path in list(outputs) + list(generated) if rel_path.endswith(".py"))
+    modules_key = hashlib.md5(repr((addon_name, is_extension, py_paths)).encode("utf-8")).hexdigest()
+    rebuilt = sync_release_folder(release_folder, outputs, generated, modules_key, cache, stats)
     removed_path = 1
     while removed_path > 0:
         removed_path = remove_empty_folders(release_folder)
+    timings["copy"] = time.perf_counter() - phase_start
 
+    phase_start = time.perf_counter()
+    rebuilt_py_files = [os.path.join(release_folder, rel_path) for rel_path, _, _ in rebuilt if rel_path.endswith(".py")]
     # 必须先将绝对导入转换为相对导入，否则enhance_import_for_py_files一步会改变绝对导入的路径导致出错
     # convert absolute import to relative import if it's an extension
     if is_extension:
-        for py_file in search_files(release_folder, {".py"}):
+        for py_file in rebuilt_py_files:
             convert_absolute_to_relative(py_file, release_folder)
 
     # 更新打包后的绝对导入路径：由于打包后文件夹的层级关系发生了变化，需要更新打包后的绝对导入路径
-    enhance_import_for_py_files(release_folder)
+    if rebuilt_py_files:
+        all_py_modules = find_all_py_modules(release_folder)
+        for py_file in rebuilt_py_files:
+            enhance_import_for_py_file(py_file, addon_name, all_py_modules)
 
     # enhance relative import for root __init__.py
     # enhance_relative_import_for_init_py(os.path.join(release_folder, "__init__.py"),
     #                                     _ADDONS_FOLDER, addon_name)
 
-    # include wheel files when need to be zipped
-    addon_config_file = os.path.join(_ADDON_ROOT, addon_name, _ADDON_MANIFEST_FILE)
-    addon_config = {}
-    if os.path.exists(addon_config_file) and is_extension:
-        addon_config = read_ext_config(addon_config_file)
-    if need_zip:
-        # package whl files into extension
-        if "wheels" in addon_config:
-            wheel_files = addon_config["wheels"]
-            if len(wheel_files) > 0:
-                wheel_folder = os.path.join(release_folder, _WHEELS_PATH)
-                os.mkdir(wheel_folder)
-                for wheel_file in wheel_files:
-                    # You much put the .whl file directly under the wheels folder, not in a subfolder
-                    # 你必须将.whl文件直接放在wheels文件夹下，而不是在子文件夹中
-                    assert wheel_file.startswith("./wheels/") and wheel_file.count("/") == 2
-                    wheel_source = os.path.join(PROJECT_ROOT, wheel_file)
-                    if not os.path.exists(wheel_source):
-                        raise ValueError("Wheel file not found:", wheel_source,
-                                         ". Please download the required wheel file to the wheels folder.")
-                    shutil.copy(wheel_source, wheel_folder)
+    for rel_path, key, source_hash in rebuilt:
+        target_path = os.path.join(release_folder, rel_path)
+        output_hash = get_md5(target_path) if rel_path.endswith(".py") else source_hash
+        cache["outputs"][rel_path] = {"key": key, "hash": output_hash, **get_file_stat(target_path)}
+    timings["imports"] = time.perf_counter() - phase_start
+
+    if incremental:
+        save_build_cache(cache_file, cache)
 
     real_addon_name = "{addon_name}".format(addon_name=release_folder)
     if is_extension:
@@ -319,12 +499,193 @@ def release_addon(target_init_file, addon_name,
     released_addon_path = os.path.abspath(os.path.join(release_dir, real_addon_name) + ".zip")
     # zip the addon
     if need_zip:
+        phase_start = time.perf_counter()
         zip_folder(release_folder, real_addon_name, is_extension)
+        timings["zip"] = time.perf_counter() - phase_start
         print("Add on released:", released_addon_path)
 
+    print_build_report("Build finished", time.perf_counter() - build_start, timings, stats)
     return released_addon_path
 
 
+def get_build_cache_path(release_dir, addon_name):
+    return os.path.join(release_dir, _BUILD_CACHE_FILE.format(addon_name=addon_name))
+
+
+def new_build_cache():
+    # sources: 源文件绝对路径 -> {hash, mtime, size, imports}
+    # outputs: 发布目录中的相对路径 -> {key, hash, mtime, size}
+    # deployed: 测试插件目录中的相对路径 -> {hash, mtime, size}
+    return {"version": _BUILD_CACHE_VERSION, "sources": {}, "outputs": {}, "deployed": {}}
+
+
+def load_build_cache(cache_file):
+    if not os.path.isfile(cache_file):
+        return new_build_cache()
+    try:
+        cache = json.loads(read_utf8(cache_file))
+    except (ValueError, OSError):
+        return new_build_cache()
+    if not isinstance(cache, dict) or cache.get("version") != _BUILD_CACHE_VERSION:
+        return new_build_cache()
+    return cache
+
+
+def save_build_cache(cache_file, cache):
+    write_utf8(cache_file, json.dumps(cache))
+
+
+def get_file_stat(file_path):
+    stat = os.stat(file_path)
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def is_unchanged_file(file_path, record):
+    try:
+        return get_file_stat(file_path) == {"mtime": record["mtime"], "size": record["size"]}
+    except OSError:
+        return False
+
+
+def get_source_record(cache, file_path, stats=None):
+    """
+    Get the cached record of a source file. The file is only read and re-hashed when its mtime or size changed,
+    so unchanged binaries such as .blend assets are never read again.
+    源文件的修改时间和大小未改变时直接使用缓存的哈希，内容未改变时保留已解析的导入
+    """
+    file_path = os.path.abspath(file_path)
+    file_stat = get_file_stat(file_path)
+    record = cache["sources"].get(file_path)
+    if record is not None and record["mtime"] == file_stat["mtime"] and record["size"] == file_stat["size"]:
+        return record
+    file_hash = get_md5(file_path)
+    if stats is not None:
+        stats["hashed"] += 1
+    if record is None or record["hash"] != file_hash:
+        record = {"hash": file_hash}
+    record.update(file_stat)
+    cache["sources"][file_path] = record
+    return record
+
+
+def find_imported_modules_cached(file_path, cache, stats=None):
+    record = get_source_record(cache, file_path, stats)
+    if "imports" not in record:
+        record["imports"] = sorted(find_imported_modules(file_path))
+        if stats is not None:
+            stats["parsed"] += 1
+    return set(record["imports"])
+
+
+def collect_release_outputs(target_init_file, addon_name, wheel_files, cache, stats):
+    """
+    Collect every file of the release folder.
+
+    Returns:
+        dict: relative path in the release folder -> source file path
+    """
+    outputs = {}
+    addon_dir = os.path.join(_ADDON_ROOT, addon_name)
+
+    # 将target_init_file同级的其他非py文件复制到发布目录 如 toml xml等可能跟插件有关的配置文件
+    init_dir = os.path.dirname(target_init_file)
+    for file in os.listdir(init_dir):
+        file_path = os.path.join(init_dir, file)
+        if os.path.isdir(file_path) or file.endswith(".py"):
+            continue
+        outputs[file] = file_path
+
+    # 插件文件夹 pyc文件是自动生成的 不需要发布
+    for root, dirnames, filenames in os.walk(addon_dir):
+        dirnames[:] = [dirname for dirname in dirnames if dirname != "__pycache__"]
+        for filename in filenames:
+            if filename.endswith(".pyc"):
+                continue
+            file_path = os.path.join(root, filename)
+            outputs[os.path.join(_ADDONS_FOLDER, os.path.relpath(file_path, _ADDON_ROOT))] = file_path
+    addons_init_file = os.path.join(_ADDON_ROOT, "__init__.py")
+    outputs[os.path.join(_ADDONS_FOLDER, "__init__.py")] = addons_init_file
+
+    # 对插件文件夹中的每一个py文件进行分析，找到每个py文件中依赖的其他py文件
+    # 注意不要漏掉__init__.py文件
+    visited_py_files = {os.path.abspath(file_path) for file_path in outputs.values()
+                        if file_path.endswith(".py") and is_subdirectory(file_path, addon_dir)}
+    visited_py_files.add(os.path.abspath(addons_init_file))
+    dependencies = find_all_dependencies(list(visited_py_files), PROJECT_ROOT, cache, stats)
+    for dependency in dependencies:
+        dependency = os.path.abspath(dependency)
+        if dependency in visited_py_files:
+            continue
+        outputs[os.path.relpath(dependency, PROJECT_ROOT)] = dependency
+
+    # package whl files into extension
+    for wheel_file in wheel_files:
+        # You much put the .whl file directly under the wheels folder, not in a subfolder
+        # 你必须将.whl文件直接放在wheels文件夹下，而不是在子文件夹中
+        assert wheel_file.startswith("./wheels/") and wheel_file.count("/") == 2
+        wheel_source = os.path.join(PROJECT_ROOT, wheel_file)
+        if not os.path.exists(wheel_source):
+            raise ValueError("Wheel file not found:", wheel_source,
+                             ". Please download the required wheel file to the wheels folder.")
+        outputs[os.path.join(_WHEELS_PATH, os.path.basename(wheel_file))] = wheel_source
+
+    return {os.path.normpath(rel_path): file_path for rel_path, file_path in outputs.items()}
+
+
+def sync_release_folder(release_folder, outputs, generated, modules_key, cache, stats):
+    """
+    Copy new or changed files into the release folder and remove files left by the previous build.
+
+    Args:
+        release_folder: the release folder
+        outputs: relative path -> source file path
+        generated: relative path -> generated file content
+        modules_key: key of the py file set, py files are processed again when it changes
+
+    Returns:
+        list: (relative path, key, source hash) of every rebuilt file
+    """
+    records = cache["outputs"]
+    expected = set(outputs) | set(generated)
+    for root, dirnames, filenames in os.walk(release_folder):
+        for filename in filenames:
+            file_path = os.path.join(root, filename)
+            rel_path = os.path.relpath(file_path, release_folder)
+            if rel_path not in expected:
+                os.remove(file_path)
+                stats["removed"] += 1
+    for rel_path in list(records):
+        if rel_path not in expected:
+            del records[rel_path]
+
+    rebuilt = []
+    for rel_path in sorted(expected):
+        if rel_path in generated:
+            source_hash = hashlib.md5(generated[rel_path].encode("utf-8")).hexdigest()
+        else:
+            source_hash = get_source_record(cache, outputs[rel_path], stats)["hash"]
+        key = f"{source_hash}:{modules_key}" if rel_path.endswith(".py") else source_hash
+        target_path = os.path.join(release_folder, rel_path)
+        record = records.get(rel_path)
+        if record is not None and record["key"] == key and is_unchanged_file(target_path, record):
+            stats["unchanged"] += 1
+            continue
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        if rel_path in generated:
+            write_utf8(target_path, generated[rel_path])
+        else:
+            shutil.copyfile(outputs[rel_path], target_path)
+        rebuilt.append((rel_path, key, source_hash))
+        stats["rebuilt"] += 1
+    return rebuilt
+
+
+def print_build_report(title, total_time, timings, stats):
+    phases = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items())
+    print(f"{title} in {total_time:.3f}s ({phases}): {stats['rebuilt']} rebuilt, {stats['unchanged']} unchanged, "
+          f"{stats['removed']} removed, {stats['hashed']} hashed, {stats['parsed']} parsed")
+
+
 def get_addon_info(filename: str):
     file_content = read_utf8(filename)
     try:
@@ -470,7 +831,7 @@ def resolve_module_path(module_name, base_path, project_root):
             return []
 
 
-def find_all_dependencies(file_paths: list, project_root: str):
+def find_all_dependencies(file_paths: list, project_root: str, cache=None, stats=None):
     dependencies = set()
     to_process = file_paths.copy()
     processed = set()
@@ -484,7 +845,11 @@ def find_all_dependencies(file_paths: list, project_root: str):
         dependencies.add(current_file)
 
         try:
-            imported_modules = find_imported_modules(current_file)
+            if cache is not None:
+                # 只重新解析内容改变的文件
+                imported_modules = find_imported_modules_cached(current_file, cache, stats)
+            else:
+                imported_modules = find_imported_modules(current_file)
         except SyntaxError as e:
             raise SyntaxError(f"Syntax error in file {current_file}: {e}")
 
@@ -525,16 +890,20 @@ def enhance_import_for_py_files(addon_dir: str):
     all_py_modules = find_all_py_modules(addon_dir)
     all_py_file = search_files(addon_dir, {".py"})
     for py_file in all_py_file:
-        hasUpdated = False
-        content = read_utf8(py_file)
-        for module_path in _import_module_pattern.finditer(content):
-            original_module_path = module_path.groups()[0]
-            if original_module_path in all_py_modules:
-                hasUpdated = True
-                content = content.replace("from " + original_module_path + " import",
-                                          "from " + namespace + "." + original_module_path + " import")
-        if hasUpdated:
-            write_utf8(py_file, content)
+        enhance_import_for_py_file(py_file, namespace, all_py_modules)
+
+
+def enhance_import_for_py_file(py_file: str, namespace: str, all_py_modules: set):
+    hasUpdated = False
+    content = read_utf8(py_file)
+    for module_path in _import_module_pattern.finditer(content):
+        original_module_path = module_path.groups()[0]
+        if original_module_path in all_py_modules:
+            hasUpdated = True
+            content = content.replace("from " + original_module_path + " import",
+                                      "from " + namespace + "." + original_module_path + " import")
+    if hasUpdated:
+        write_utf8(py_file, content)
 
 
 def convert_absolute_to_relative(file_path: str, project_root: str):
@@ -620,7 +989,7 @@ def find_all_py_modules(root_dir: str) -> set:
     return all_py_modules
 
 
-def start_watch_for_update(init_file, addon_name, stop_event: threading.Event):
+def start_watch_for_update(init_file, addon_name, stop_event: threading.Event, signal_port=None):
     install_if_missing("watchdog")
     from watchdog.events import FileSystemEventHandler
     from watchdog.observers import Observer
@@ -628,15 +997,15 @@ def start_watch_for_update(init_file, addon_name, stop_event: threading.Event):
     class FileUpdateHandler(FileSystemEventHandler):
         def __init__(self):
             super(FileUpdateHandler, self).__init__()
-            self.has_update = False
+            self.update_event = threading.Event()
 
         def on_any_event(self, event):
             source_path = event.src_path
             if source_path.endswith(".py"):
-                self.has_update = True
+                self.update_event.set()
 
         def clear_update(self):
-            self.has_update = False
+            self.update_event.clear()
 
     path = PROJECT_ROOT
     event_handler = FileUpdateHandler()
@@ -646,16 +1015,23 @@ def start_watch_for_update(init_file, addon_name, stop_event: threading.Event):
 
     try:
         while not stop_event.is_set():
-            time.sleep(1)
-            if event_handler.has_update:
-                try:
-                    update_addon_for_test(init_file, addon_name)
-                    event_handler.clear_update()
-                except Exception as e:
-                    print(e)
-                    print(
-                        "Addon updated failed: Please make sure no other process is"
-                        " using the addon folder. You might need to restart the test to update the addon in Blender.")
+            # 等待文件改变的事件 超时只用于检查是否停止监视
+            if not event_handler.update_event.wait(timeout=0.5):
+                continue
+            # 合并编辑器保存时连续产生的多个事件
+            time.sleep(0.1)
+            event_handler.clear_update()
+            try:
+                changed_files = update_addon_for_test(init_file, addon_name)
+                if changed_files and signal_port is not None:
+                    send_update_signal(signal_port, changed_files)
+            except Exception as e:
+                print(e)
+                print(
+                    "Addon updated failed: Please make sure no other process is"
+                    " using the addon folder. You might need to restart the test to update the addon in Blender.")
+                event_handler.update_event.set()
+                time.sleep(1)
         print("Stop watching for update...")
 
     except KeyboardInterrupt:
@@ -670,14 +1046,68 @@ def update_addon_for_test(init_file, addon_name):
             "Could not find Blender addon installation path. Please check the configuration in main.py or config.ini")
     addon_path = release_addon(init_file, addon_name, with_timestamp=False,
                                is_extension=IS_EXTENSION,
-                               release_dir=TEST_RELEASE_DIR, need_zip=False)
+                               release_dir=TEST_RELEASE_DIR, need_zip=False, incremental=True)
     executable_path = os.path.join(os.path.dirname(addon_path), addon_name)
 
+    deploy_start = time.perf_counter()
     test_addon_path = os.path.join(BLENDER_ADDON_PATH, addon_name)
-    if os.path.exists(test_addon_path):
-        shutil.rmtree(test_addon_path)
-    shutil.copytree(executable_path, test_addon_path)
+    cache_file = get_build_cache_path(TEST_RELEASE_DIR, addon_name)
+    cache = load_build_cache(cache_file)
+    changed_files = deploy_release_folder(executable_path, test_addon_path, cache)
+    save_build_cache(cache_file, cache)
 
     # write an MD5 to the addon folder to inform the addon content has been changed
-    addon_md5 = get_md5_folder(executable_path)
-    write_utf8(os.path.join(test_addon_path, _addon_md5__signature), addon_md5)
+    # 签名由构建缓存中每个文件的哈希计算 不再重新读取整个插件目录
+    addon_md5 = get_release_signature(cache)
+    signature_file = os.path.join(test_addon_path, _addon_md5__signature)
+    if changed_files or not os.path.isfile(signature_file):
+        write_utf8(signature_file, addon_md5)
+    print(f"Deployed {len(changed_files)} changed files in {time.perf_counter() - deploy_start:.3f}s")
+    return changed_files
+
+
+def deploy_release_folder(release_folder, deploy_folder, cache):
+    """
+    Copy the files changed since the last deployment from the release folder to the blender addon folder.
+
+    Returns:
+        list: relative paths of copied or removed files
+    """
+    outputs = cache["outputs"]
+    deployed = cache["deployed"]
+    if not os.path.isdir(deploy_folder):
+        deployed.clear()
+    changed_files = []
+
+    for root, dirnames, filenames in os.walk(deploy_folder):
+        # pyc files are generated by blender
+        dirnames[:] = [dirname for dirname in dirnames if dirname != "__pycache__"]
+        for filename in filenames:
+            file_path = os.path.join(root, filename)
+            rel_path = os.path.relpath(file_path, deploy_folder)
+            if rel_path not in outputs and rel_path != _addon_md5__signature:
+                os.remove(file_path)
+                deployed.pop(rel_path, None)
+                changed_files.append(rel_path)
+
+    for rel_path, record in outputs.items():
+        target_path = os.path.join(deploy_folder, rel_path)
+        deployed_record = deployed.get(rel_path)
+        if deployed_record is not None and deployed_record["hash"] == record["hash"] \
+                and is_unchanged_file(target_path, deployed_record):
+            continue
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        shutil.copyfile(os.path.join(release_folder, rel_path), target_path)
+        deployed[rel_path] = {"hash": record["hash"], **get_file_stat(target_path)}
+        changed_files.append(rel_path)
+
+    removed_path = 1
+    while removed_path > 0:
+        removed_path = remove_empty_folders(deploy_folder)
+    return changed_files
+
+
+def get_release_signature(cache):
+    outputs = cache["outputs"]
+    content = "\n".join(f"{rel_path}:{outputs[rel_path]['hash']}" for rel_path in sorted(outputs))
+    return hashlib.md5(content.encode("utf-8")).hexdigest()